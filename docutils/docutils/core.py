@@ -16,15 +16,15 @@
 __docformat__ = 'reStructuredText'
 
 import locale
-import pprint
 import os
 import sys
 import warnings
 
 from docutils import (__version__, __version_details__, SettingsSpec,
-                      io, utils, readers, writers)
+                      io, utils, readers, transforms, writers)
 from docutils.frontend import OptionParser
 from docutils.readers import doctree
+from docutils.utils import timing
 
 
 class Publisher:
@@ -75,6 +75,11 @@ def __init__(self, reader=None, parser=None, writer=None,
         self.destination_class = destination_class
         """The class for dynamically created destination objects."""
 
+        self.timing = None
+        """A `docutils.utils.timing.TimingReport` instance or None.
+        Set by `self.publish()` if the timing_report setting is specified.
+        """
+
         self.settings = settings
         """An object containing Docutils settings as instance attributes.
         Set by `self.process_command_line()` or `self.get_settings()`."""
@@ -208,6 +213,70 @@ def set_destination(self, destination=None, destination_path=None):
             encoding=self.settings.output_encoding,
             error_handler=self.settings.output_encoding_error_handler)
 
+    def read(self):
+        """
+        Run `self.reader` and return the document tree.
+
+        If the doctree_cache_dir setting is specified, use a cached
+        document tree for unchanged input and store new ones.
+        """
+        cache_dir = getattr(self.settings, 'doctree_cache_dir', None)
+        if (not cache_dir or self.settings.debug
+            or isinstance(self.source, io.DocTreeInput)):
+            return self.reader.read(self.source, self.parser, self.settings)
+        from docutils.utils import doctree_cache
+        cache = doctree_cache.DoctreeCache.get(
+                    cache_dir, getattr(self.settings, 'doctree_cache_size',
+                                       100))
+        with timing.phase(self.settings, 'read'):
+            text = self.source.read()
+        source_path = self.source.source_path
+        key = cache.key(text, source_path, self.settings,
+                        (self.reader, self.parser or self.reader.parser))
+        entry = cache.load(key)
+        if entry is not None:
+            document = entry['document']
+            document.settings = self.settings
+            document.reporter = utils.new_reporter(document.get('source', ''),
+                                                   self.settings)
+            document.reporter.max_level = entry['max_level']
+            if self.timing is not None:
+                document.reporter.attach_observer(self.timing.system_message)
+            document.transformer = transforms.Transformer(document)
+            document.transformer.transforms = entry['transforms']
+            document.transformer.serialno = entry['serialno']
+            self.settings.record_dependencies.add(*entry['dependencies'])
+            self.reader.source = self.source
+            self.reader.settings = self.settings
+            self.reader.input = text
+            self.reader.document = document
+            return document
+        # Parse from the already read text and record the dependencies:
+        source = io.StringInput(text, source_path, encoding='unicode')
+        record_dependencies = self.settings.record_dependencies
+        self.settings.record_dependencies = utils.DependencyList()
+        try:
+            document = self.reader.read(source, self.parser, self.settings)
+        finally:
+            dependencies = self.settings.record_dependencies.list
+            self.settings.record_dependencies = record_dependencies
+            record_dependencies.add(*dependencies)
+        self.reader.source = self.source
+        # Do not cache documents if there were reported system messages
+        # (they would be missing in later runs):
+        if document.reporter.max_level < self.settings.report_level:
+            transformer = document.transformer
+            document.settings = None
+            try:
+                cache.store(key, {'document': document,
+                                  'transforms': transformer.transforms,
+                                  'serialno': transformer.serialno,
+                                  'max_level': document.reporter.max_level,
+                                  'dependencies': dependencies})
+            finally:
+                document.settings = self.settings
+        return document
+
     def apply_transforms(self):
         self.document.transformer.populate_from_components(
             (self.source, self.reader, self.reader.parser, self.writer,
@@ -230,11 +299,22 @@ def publish(self, argv=None, usage=None, description=None,
                     **(settings_overrides or {}))
             self.set_io()
             self.prompt()
-            self.document = self.reader.read(self.source, self.parser,
-                                             self.settings)
-            self.apply_transforms()
+            timing_report = getattr(self.settings, 'timing_report', None)
+            if timing_report and self.timing is None:
+                self.timing = timing.TimingReport()
+            self.settings._timing = self.timing
+            self.document = self.read()
+            if self.timing:
+                self.timing.count_nodes('parse', self.document)
+            with timing.phase(self.settings, 'transform'):
+                self.apply_transforms()
+            if self.timing:
+                self.timing.count_nodes('transform', self.document)
             output = self.writer.write(self.document, self.destination)
-            self.writer.assemble_parts()
+            with timing.phase(self.settings, 'assemble parts'):
+                self.writer.assemble_parts()
+            if timing_report:
+                self.timing.write(timing_report)
         except SystemExit as error:
             exit = True
             exit_status = error.code
@@ -259,6 +339,9 @@ def publish(self, argv=None, usage=None, description=None,
     def debugging_dumps(self):
         if not self.document:
             return
+        if (self.settings.dump_settings or self.settings.dump_internals
+            or self.settings.dump_transforms):
+            import pprint
         if self.settings.dump_settings:
             print('\n::: Runtime settings:', file=self._stderr)
             print(pprint.pformat(self.settings.__dict__), file=self._stderr)
@@ -557,7 +640,8 @@ def publish_from_doctree(document, destination_path=None,
     generated.
 
     Parameters: `document` is a `docutils.nodes.document` object, an existing
-    document tree.
+    document tree, or its binary representation (`bytes`, cf.
+    `docutils.utils.binary_doctree`).
 
     Other parameters: see `publish_programmatically()`.
     """
@@ -734,6 +818,117 @@ def publish_programmatically(source_class, source, source_path,
     return output, publisher
 
 
+class Renderer:
+
+    """
+    Publish many documents with the same components and settings.
+
+    The runtime settings are assembled once, when the `Renderer` is
+    instantiated.  Reader, parser, and writer instances are kept in a
+    pool and re-used for the next document: the parser keeps its state
+    machines.  This saves most of the setup costs of the ``publish_*``
+    convenience functions when processing many small documents.
+
+    Every document gets a copy of the settings (including copies of
+    mutable values and a new list of dependencies).  Components
+    are never shared between concurrently processed documents, so one
+    `Renderer` instance can be used from several threads.
+
+    Usage example::
+
+        renderer = Renderer(writer_name='html5',
+                            settings_overrides={'report_level': 4})
+        for text in comments:
+            body = renderer.publish_parts(text)['body']
+    """
+
+    def __init__(self, reader_name='standalone',
+                 parser_name='restructuredtext', writer_name='pseudoxml',
+                 settings=None, settings_spec=None,
+                 settings_overrides=None, config_section=None):
+        """
+        Set up the settings and a first set of components.
+
+        Parameters: see `publish_programmatically()`.
+        """
+        self.reader_name = reader_name
+        self.parser_name = parser_name
+        self.writer_name = writer_name
+
+        self._idle = []
+        """Pool of unused (reader, parser, writer) tuples."""
+
+        publisher = Publisher(settings=settings)
+        publisher.set_components(reader_name, parser_name, writer_name)
+        publisher.process_programmatic_settings(
+            settings_spec, settings_overrides, config_section)
+        self._idle.append((publisher.reader, publisher.parser,
+                           publisher.writer))
+
+        self.settings = publisher.settings
+        """Runtime settings used as template for every document."""
+
+    def _get_components(self):
+        try:
+            return self._idle.pop()
+        except IndexError:
+            publisher = Publisher()
+            publisher.set_components(self.reader_name, self.parser_name,
+                                     self.writer_name)
+            return publisher.reader, publisher.parser, publisher.writer
+
+    def _copy_settings(self):
+        """Return a copy of `self.settings` for one document."""
+        settings = self.settings.copy()
+        for name, value in vars(settings).items():
+            if isinstance(value, (list, dict, set)):
+                setattr(settings, name, value.copy())
+        settings.record_dependencies = utils.DependencyList()
+        return settings
+
+    def _publish(self, source, source_path, destination_path,
+                 auto_encode=True):
+        """Process `source`.  Return the output and the document parts."""
+        components = self._get_components()
+        reader, parser, writer = components
+        writer.parts = {}
+        publisher = Publisher(reader, parser, writer,
+                              source_class=io.StringInput,
+                              destination_class=io.StringOutput,
+                              settings=self._copy_settings())
+        publisher.set_source(source, source_path)
+        publisher.set_destination(None, destination_path)
+        publisher.destination.auto_encode = auto_encode
+        output = publisher.publish()
+        parts = writer.parts
+        # Write the document's dependencies to the shared output file.
+        dependencies = self.settings.record_dependencies
+        if dependencies.file is not None:
+            dependencies.add(*publisher.settings.record_dependencies.list)
+        # Return the components to the pool (not after an exception:
+        # their state is undefined).
+        self._idle.append(components)
+        return output, parts
+
+    def publish_string(self, source, source_path=None, destination_path=None,
+                       auto_encode=True):
+        """
+        Process `source` (`str` or `bytes`) and return the output document.
+
+        Cf. `docutils.core.publish_string()`.
+        """
+        return self._publish(source, source_path, destination_path,
+                             auto_encode)[0]
+
+    def publish_parts(self, source, source_path=None, destination_path=None):
+        """
+        Process `source` and return a dictionary of document parts.
+
+        Cf. `docutils.core.publish_parts()`.
+        """
+        return self._publish(source, source_path, destination_path)[1]
+
+
 # "Entry points" with functionality of the "tools/rst2*.py" scripts
 # cf. https://packaging.python.org/en/latest/specifications/entry-points/
 
@@ -607,6 +607,21 @@ class OptionParser(optparse.OptionParser, docutils.SettingsSpec):
           ['--record-dependencies'],
           {'metavar': '<file>', 'validator': validate_dependency_file,
            'default': None}),           # default set in Values class
+         ('Cache parsed documents in <directory>.  Default: None.',
+          ['--doctree-cache-dir'], {'metavar': '<directory>'}),
+         ('Size limit of the doctree cache in MiB.  Default: 100.',
+          ['--doctree-cache-size'],
+          {'metavar': '<MiB>', 'default': 100,
+           'validator': validate_nonnegative_int}),
+         ('Write timing and counter statistics as JSON to <file>.',
+          ['--timing-report'], {'metavar': '<file>'}),
+         ('Index the document nodes by class to speed up queries '
+          '(experimental).',
+          ['--node-index'],
+          {'action': 'store_true', 'validator': validate_boolean}),
+         ('Do not index the document nodes (default).',
+          ['--no-node-index'],
+          {'dest': 'node_index', 'action': 'store_false'}),
          ('Read configuration settings from <file>, if it exists.',
           ['--config'], {'metavar': '<file>', 'type': 'string',
                          'action': 'callback', 'callback': read_config_file}),
@@ -664,7 +679,8 @@ def __init__(self, components=(), defaults=None, read_config_files=False,
         self.config_files = []
         """List of paths of applied configuration files."""
 
-        self.relative_path_settings = ['warning_stream']  # will be modified
+        self.relative_path_settings = ['warning_stream', 'doctree_cache_dir',
+                                       'timing_report']  # will be modified
 
         warnings.warn('The frontend.OptionParser class will be replaced '
                       'by a subclass of argparse.ArgumentParser '
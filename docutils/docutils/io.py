@@ -11,6 +11,10 @@
 
 import codecs
 import locale
+try:
+    import mmap
+except ImportError:  # not available on some platforms (e.g. WASI)
+    mmap = None
 import os
 import re
 import sys
@@ -74,6 +78,26 @@ def error_string(err):
     return f'{err.__class__.__name__}: {err}'
 
 
+# Line boundaries recognized by `str.splitlines()` except "\r" and "\n":
+_other_line_breaks = '\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+
+
+def _normalize_newlines(data):
+    """Return `data` with "\\n" line ends and a final newline.
+
+    Equivalent to ``'\\n'.join(data.splitlines()+[''])`` but without
+    creating a list of lines.
+    """
+    if '\r' in data:
+        data = data.replace('\r\n', '\n').replace('\r', '\n')
+    for line_break in _other_line_breaks:
+        if line_break in data:
+            data = data.replace(line_break, '\n')
+    if data and not data.endswith('\n'):
+        data += '\n'
+    return data
+
+
 class OutString(str):
     """Return a string representation of `object` with known encoding.
 
@@ -242,6 +266,8 @@ def decode(self, data):
     coding_slug = re.compile(br"coding[:=]\s*([-\w.]+)")
     """Encoding declaration pattern."""
 
+    _first_lines = re.compile(br'[^\r\n]*(\r\n|\r|\n)?[^\r\n]*')
+
     byte_order_marks = ((codecs.BOM_UTF8, 'utf-8'),
                         (codecs.BOM_UTF16_BE, 'utf-16-be'),
                         (codecs.BOM_UTF16_LE, 'utf-16-le'),)
@@ -258,8 +284,10 @@ def determine_encoding_from_data(self, data):
         for start_bytes, encoding in self.byte_order_marks:
             if data.startswith(start_bytes):
                 return encoding
-        # check for an encoding declaration pattern in first 2 lines of file:
-        for line in data.splitlines()[:2]:
+        # check for an encoding declaration pattern in first 2 lines of file
+        # (only split the first two lines, not the complete data):
+        end = self._first_lines.match(data).end()
+        for line in data[:end].splitlines()[:2]:
             match = self.coding_slug.search(line)
             if match:
                 return match.group(1).decode('ascii')
@@ -314,6 +342,14 @@ def write(self, data):
         """Write `data`. Define in subclasses."""
         raise NotImplementedError
 
+    def write_chunks(self, chunks):
+        """Write the concatenation of the `str` instances in `chunks`.
+
+        Provisional.  The default implementation joins the chunks and
+        calls `self.write()`.  Subclasses may write the chunks one by one.
+        """
+        return self.write(''.join(chunks))
+
     def encode(self, data):
         """
         Encode and return `data`.
@@ -428,6 +464,14 @@ class FileInput(Input):
     """
     Input for single, simple file-like objects.
     """
+
+    mmap_threshold = 2**20
+    """Map files of at least this size into memory (`mmap`) instead of
+    reading them into a buffer before decoding.  None: never map files.
+
+    Only used for text files opened by `FileInput`.  Provisional.
+    """
+
     def __init__(self, source=None, source_path=None,
                  encoding=None, error_handler='strict',
                  autoclose=True, mode='r'):
@@ -446,6 +490,7 @@ def __init__(self, source=None, source_path=None,
         Input.__init__(self, source, source_path, encoding, error_handler)
         self.autoclose = autoclose
         self._stderr = ErrorOutput()
+        self._mappable = False
 
         if source is None:
             if source_path:
@@ -455,6 +500,7 @@ def __init__(self, source=None, source_path=None,
                                        errors=self.error_handler)
                 except OSError as error:
                     raise InputError(error.errno, error.strerror, source_path)
+                self._mappable = 'b' not in mode
             else:
                 self.source = sys.stdin
         elif check_encoding(self.source, self.encoding) is False:
@@ -477,7 +523,9 @@ def read(self):
                 # read as binary data to circumvent auto-decoding
                 data = self.source.buffer.read()
             else:
-                data = self.source.read()
+                data = self._read_mapped()
+                if data is None:
+                    data = self.source.read()
         except (UnicodeError, LookupError):
             if not self.encoding and self.source_path:
                 # re-read in binary mode and decode with heuristics
@@ -491,7 +539,28 @@ def read(self):
                 self.close()
         data = self.decode(data)
         # normalise newlines
-        return '\n'.join(data.splitlines()+[''])
+        return _normalize_newlines(data)
+
+    def _read_mapped(self):
+        """Decode the memory-mapped source file.
+
+        Return None if the file is not mapped (cf. `mmap_threshold`).
+        """
+        if mmap is None or self.mmap_threshold is None or not self._mappable:
+            return None
+        try:
+            fileno = self.source.fileno()
+            if os.fstat(fileno).st_size < max(self.mmap_threshold, 1):
+                return None
+            mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        with mapped:
+            # Decode without an intermediate `bytes` copy of the data.
+            # `str()` does not translate newlines: `read()` normalizes them
+            # with `_normalize_newlines()`.
+            return str(mapped, self.encoding or 'utf-8-sig',
+                       self.error_handler)
 
     def readlines(self):
         """
@@ -590,6 +659,41 @@ def write(self, data):
             if os.linesep != '\n':
                 data = data.replace('\n', os.linesep)  # fix endings
             data = self.encode(data)
+        try:
+            self._write(data)
+        finally:
+            if self.autoclose:
+                self.close()
+        return data
+
+    def write_chunks(self, chunks):
+        """Write the `str` instances in the iterable `chunks` one by one.
+
+        In contrast to `write()`, the output is not returned.
+        Provisional.
+        """
+        if not self.opened:
+            self.open()
+        encoder = None
+        if ('b' not in self.mode
+            and check_encoding(self.destination, self.encoding) is False):
+            # incremental encoder: write a BOM only once
+            encoder = codecs.getincrementalencoder(self.encoding)(
+                          self.error_handler)
+        try:
+            for data in chunks:
+                if encoder:
+                    if os.linesep != '\n':
+                        data = data.replace('\n', os.linesep)
+                    data = encoder.encode(data)
+                self._write(data)
+            if encoder:
+                self._write(encoder.encode('', final=True))
+        finally:
+            if self.autoclose:
+                self.close()
+
+    def _write(self, data):
         try:
             self.destination.write(data)
         except TypeError as err:
@@ -609,10 +713,6 @@ def write(self, data):
             raise UnicodeError(
                 'Unable to encode output data. output-encoding is: '
                 f'{self.encoding}.\n({error_string(err)})')
-        finally:
-            if self.autoclose:
-                self.close()
-        return data
 
     def close(self):
         if self.destination not in (sys.stdout, sys.stderr):
@@ -23,6 +23,7 @@
 __docformat__ = 'reStructuredText'
 
 from collections import Counter
+import heapq
 import re
 import sys
 import warnings
@@ -51,6 +52,10 @@ class Node:
 
     _document = None
 
+    _position = 0
+    """Index of this Node in ``self.parent.children`` (a cached hint,
+    see `Element.child_position()`)."""
+
     @property
     def document(self):
         """Return the `document` root node of the tree containing this Node.
@@ -89,6 +94,15 @@ def pformat(self, indent='    ', level=0):
         """
         raise NotImplementedError
 
+    def pformat_lines(self, indent='    ', level=0):
+        """
+        Generate the indented pseudo-XML representation in pieces.
+
+        The concatenation of the pieces equals `self.pformat()`.
+        Extend in subclasses.
+        """
+        yield self.pformat(indent, level)
+
     def copy(self):
         """Return a copy of self."""
         raise NotImplementedError
@@ -103,12 +117,14 @@ def astext(self):
 
     def setup_child(self, child):
         child.parent = self
-        if self.document:
-            child.document = self.document
+        document = self.document
+        if document:
+            child.document = document
             if child.source is None:
-                child.source = self.document.current_source
+                child.source = document.current_source
             if child.line is None:
-                child.line = self.document.current_line
+                child.line = document.current_line
+            document._generation += 1
 
     def walk(self, visitor):
         """
@@ -133,28 +149,36 @@ def walk(self, visitor):
 
         Return true if we should stop the traversal.
         """
-        stop = False
-        visitor.document.reporter.debug(
-            'docutils.nodes.Node.walk calling dispatch_visit for %s'
-            % self.__class__.__name__)
-        try:
+        stack = []      # iterators over the children of the visited nodes
+        node = self
+        while True:
+            reporter = visitor.document.reporter
+            if reporter.debug_flag:
+                reporter.debug(
+                    'docutils.nodes.Node.walk calling dispatch_visit for %s'
+                    % node.__class__.__name__)
             try:
-                visitor.dispatch_visit(self)
+                try:
+                    visitor.dispatch_visit(node)
+                except SkipDeparture:       # not applicable; ignore
+                    pass
+                stack.append(iter(node.children[:]))
             except (SkipChildren, SkipNode):
-                return stop
-            except SkipDeparture:           # not applicable; ignore
                 pass
-            children = self.children
-            try:
-                for child in children[:]:
-                    if child.walk(visitor):
-                        stop = True
-                        break
+            except StopTraversal:
+                return True
             except SkipSiblings:
-                pass
-        except StopTraversal:
-            stop = True
-        return stop
+                if not stack:
+                    raise
+                stack.pop()
+            # next node in document order
+            while stack:
+                node = next(stack[-1], None)
+                if node is not None:
+                    break
+                stack.pop()
+            else:
+                return False
 
     def walkabout(self, visitor):
         """
@@ -168,36 +192,67 @@ def walkabout(self, visitor):
 
         Return true if we should stop the traversal.
         """
-        call_depart = True
-        stop = False
-        visitor.document.reporter.debug(
-            'docutils.nodes.Node.walkabout calling dispatch_visit for %s'
-            % self.__class__.__name__)
-        try:
+        # The traversal is iterative (no recursion limit).  Exceptions
+        # raised by the visit or depart methods have the same effect as
+        # in a recursive implementation with one call per node:
+        # `SkipSiblings` (from ``visit``) and `SkipSiblings`,
+        # `SkipChildren`, or `StopTraversal` (from ``depart``) end the
+        # traversal of the parent's children; other exceptions from
+        # ``depart`` propagate to the caller.
+        stack = []   # [node, iterator over children, call_depart, stop]
+        node = self
+        while True:
+            signal = None   # exception passed to the parent of `node`
+            stop = False
+            reporter = visitor.document.reporter
+            if reporter.debug_flag:
+                reporter.debug(
+                    'docutils.nodes.Node.walkabout calling dispatch_visit '
+                    'for %s' % node.__class__.__name__)
             try:
-                visitor.dispatch_visit(self)
+                try:
+                    visitor.dispatch_visit(node)
+                except SkipDeparture:
+                    stack.append([node, iter(node.children[:]), False, False])
+                else:
+                    stack.append([node, iter(node.children[:]), True, False])
             except SkipNode:
-                return stop
-            except SkipDeparture:
-                call_depart = False
-            children = self.children
-            try:
-                for child in children[:]:
-                    if child.walkabout(visitor):
-                        stop = True
-                        break
-            except SkipSiblings:
                 pass
-        except SkipChildren:
-            pass
-        except StopTraversal:
-            stop = True
-        if call_depart:
-            visitor.document.reporter.debug(
-                'docutils.nodes.Node.walkabout calling dispatch_departure '
-                'for %s' % self.__class__.__name__)
-            visitor.dispatch_departure(self)
-        return stop
+            except SkipChildren:
+                stack.append([node, iter(()), True, False])
+            except StopTraversal:
+                stack.append([node, iter(()), True, True])
+            except SkipSiblings as error:
+                signal = error
+            # depart finished nodes, find the next node to visit
+            while True:
+                if not stack:
+                    if signal is not None:
+                        raise signal
+                    return stop
+                frame = stack[-1]
+                if signal is None and not stop:
+                    node = next(frame[1], None)
+                    if node is not None:
+                        break
+                elif stop or isinstance(signal, StopTraversal):
+                    frame[3] = True
+                signal = None
+                stack.pop()
+                stop = frame[3]
+                if frame[2]:
+                    reporter = visitor.document.reporter
+                    if reporter.debug_flag:
+                        reporter.debug(
+                            'docutils.nodes.Node.walkabout calling '
+                            'dispatch_departure for %s'
+                            % frame[0].__class__.__name__)
+                    try:
+                        visitor.dispatch_departure(frame[0])
+                    except (SkipSiblings, SkipChildren,
+                            StopTraversal) as error:
+                        signal = error
+                        stop = False
 
     def _fast_findall(self, cls):
         """Return iterator that only supports instance checks."""
@@ -296,12 +351,10 @@ def condition(node, node_class=node_class):
         if siblings or ascend:
             node = self
             while node.parent:
-                index = node.parent.index(node)
-                # extra check since Text nodes have value-equality
-                while node.parent[index] is not node:
-                    index = node.parent.index(node, index + 1)
-                for sibling in node.parent[index+1:]:
-                    yield from sibling.findall(
+                index = node.parent.child_position(node)
+                following = node.parent.children
+                for i in range(index + 1, len(following)):
+                    yield from following[i].findall(
                         condition=condition,
                         include_self=True, descend=descend,
                         siblings=False, ascend=False)
@@ -436,6 +489,127 @@ def lstrip(self, chars=None):
         return self.__class__(str.lstrip(self, chars))
 
 
+def _delegate_to_list(name):
+    """Return a method that calls `list.<name>` on ``self._list()``."""
+    method = getattr(list, name)
+
+    def delegate(self, *args):
+        args = [arg._list() if isinstance(arg, _UnsetListAttribute) else arg
+                for arg in args]
+        return method(self._list(), *args)
+    delegate.__name__ = name
+    return delegate
+
+
+class _UnsetListAttribute(list):
+
+    """
+    Empty list returned for a list attribute that is not stored in
+    an element's attribute dictionary.
+
+    The placeholder has no items of its own: it is a view of the list
+    stored in the dictionary (if any), so all placeholders returned for
+    an attribute show the same items.  Adding items stores a new list
+    in the dictionary, so that ``element['classes'].append('x')`` works
+    as expected.
+    """
+
+    __slots__ = ('_attributes', '_key')
+
+    def __init__(self, attributes, key):
+        self._attributes = attributes
+        self._key = key
+
+    def _list(self):
+        """Return the stored list or (if there is none) self."""
+        return dict.get(self._attributes, self._key, self)
+
+    def _store(self):
+        """Return the stored list, store a new list if there is none."""
+        return dict.setdefault(self._attributes, self._key, [])
+
+    # read access and modifications that do not add items
+    for _name in ('__add__', '__contains__', '__delitem__', '__eq__',
+                  '__ge__', '__getitem__', '__gt__', '__imul__',
+                  '__iter__', '__le__', '__len__', '__lt__', '__mul__',
+                  '__ne__', '__repr__', '__reversed__', '__rmul__',
+                  'clear', 'copy', 'count', 'index', 'pop', 'remove',
+                  'reverse'):
+        locals()[_name] = _delegate_to_list(_name)
+    del _name
+
+    def __radd__(self, other):
+        return other + list(self._list())
+
+    def sort(self, *, key=None, reverse=False):
+        list.sort(self._list(), key=key, reverse=reverse)
+
+    def append(self, item):
+        self._store().append(item)
+
+    def extend(self, items):
+        self._store().extend(items)
+
+    def insert(self, index, item):
+        self._store().insert(index, item)
+
+    def __setitem__(self, key, value):
+        self._store()[key] = value
+
+    def __iadd__(self, other):
+        stored = self._store()
+        stored += other
+        return stored
+
+    def __reduce_ex__(self, protocol):
+        # pickle and copy as `list`
+        return list, (list(self),)
+
+
+class _Attributes(dict):
+
+    """
+    Dictionary of the attributes of an `Element`.
+
+    Empty list attributes are not stored: looking them up returns an
+    empty list that is inserted on the first modification.
+    """
+
+    __slots__ = ('list_attributes',)
+
+    def __init__(self, list_attributes, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.list_attributes = list_attributes
+        """Names of the attributes with an (empty) list default."""
+
+    def __missing__(self, key):
+        if key not in self.list_attributes:
+            raise KeyError(key)
+        return _UnsetListAttribute(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        if key in self.list_attributes:
+            default = []
+        return super().setdefault(key, default)
+
+    def pop(self, key, *default):
+        if key in self.list_attributes and key not in self:
+            return []
+        return super().pop(key, *default)
+
+    def __reduce__(self):
+        return self.__class__, (self.list_attributes, dict(self))
+
+    def copy(self):
+        return self.__class__(self.list_attributes, self)
+
+
 class Element(Node):
 
     """
@@ -522,12 +696,10 @@ def __init__(self, rawsource='', *children, **attributes):
 
         self.extend(children)           # maintain parent info
 
-        self.attributes = {}
-        """Dictionary of attribute {name: value}."""
+        self.attributes = _Attributes(self.list_attributes)
+        """Dictionary of attribute {name: value}.
 
-        # Initialize list attributes.
-        for att in self.list_attributes:
-            self.attributes[att] = []
+        List attributes are initialized lazily (see `_Attributes`)."""
 
         for att, value in attributes.items():
             att = att.lower()
@@ -635,6 +807,7 @@ def __setitem__(self, key, item):
             for node in item:
                 self.setup_child(node)
             self.children[key.start:key.stop] = item
+            self._note_removal()
         else:
             raise TypeError('element index must be an integer, a slice, or '
                             'an attribute name string')
@@ -644,9 +817,11 @@ def __delitem__(self, key):
             del self.attributes[key]
         elif isinstance(key, int):
             del self.children[key]
+            self._note_removal()
         elif isinstance(key, slice):
             assert key.step in (None, 1), 'cannot handle slice with stride'
             del self.children[key.start:key.stop]
+            self._note_removal()
         else:
             raise TypeError('element index must be an integer, a simple '
                             'slice, or an attribute name string')
@@ -725,18 +900,62 @@ def insert(self, index, item):
             self[index:index] = item
 
     def pop(self, i=-1):
+        self._note_removal()
         return self.children.pop(i)
 
     def remove(self, item):
-        self.children.remove(item)
+        del self.children[self.child_position(item)]
+        self._note_removal()
+
+    def _note_removal(self):
+        """Invalidate the document's node index after removing children.
+
+        (Adding children is registered by `setup_child()`.)
+        """
+        document = self.document
+        if document is not None:
+            document._generation += 1
 
     def index(self, item, start=0, stop=sys.maxsize):
         return self.children.index(item, start, stop)
 
+    def child_position(self, child):
+        """Return the index of `child` in `self.children`.
+
+        In contrast to `index()`, nodes are compared by identity
+        (`Text` nodes are equal to other `Text` nodes with the same text).
+        Raise ValueError if `child` is not a child of `self`.
+
+        Every node stores its last known position.  If it is outdated
+        (after insertion or removal of preceding siblings), the positions
+        of all children are updated, so that the amortized costs of
+        repeated calls are constant.
+        """
+        position = self._cached_position(child)
+        if position is not None:
+            return position
+        for position, node in enumerate(self.children):
+            node._position = position
+        position = self._cached_position(child)
+        if position is None:
+            raise ValueError(f'{child!r} is not a child of {self!r}')
+        return position
+
+    def _cached_position(self, child):
+        """Return the stored position of `child` if it is valid, else None.
+        """
+        position = getattr(child, '_position', 0)
+        try:
+            if self.children[position] is child:
+                return position
+        except IndexError:
+            pass
+        return None
+
     def previous_sibling(self):
         """Return preceding sibling node or ``None``."""
         try:
-            i = self.parent.index(self)
+            i = self.parent.child_position(self)
         except (AttributeError):
             return None
         return self.parent[i-1] if i > 0 else None
@@ -975,10 +1194,11 @@ def update_all_atts_convert(self, dict_, and_source=False):
 
     def clear(self):
         self.children = []
+        self._note_removal()
 
     def replace(self, old, new):
         """Replace one child `Node` with another child or children."""
-        index = self.index(old)
+        index = self.child_position(old)
         if isinstance(new, Node):
             self.setup_child(new)
             self[index] = new
@@ -1049,9 +1269,51 @@ def first_child_not_matching_class(self, childclass, start=0,
         return None
 
     def pformat(self, indent='    ', level=0):
-        tagline = '%s%s\n' % (indent*level, self.starttag())
-        childreps = (c.pformat(indent, level+1) for c in self.children)
-        return ''.join((tagline, *childreps))
+        return ''.join(self._pformat_lines(indent, level))
+
+    def pformat_lines(self, indent='    ', level=0):
+        """
+        Generate the indented pseudo-XML representation line by line.
+
+        The lines include the line end.  `Text` nodes and nodes that
+        override `pformat()` are generated as one piece.
+
+        Iterative (no recursion, no intermediate strings for sub-trees).
+        """
+        if type(self).pformat is not Element.pformat:
+            yield self.pformat(indent, level)
+        else:
+            yield from self._pformat_lines(indent, level)
+
+    def _pformat_lines(self, indent, level):
+        # Generate the pseudo-XML of `self` as `Element`,
+        # delegate to the `pformat()` method of descendants overriding it.
+        try:
+            detailed = self.document.settings.detailed
+        except AttributeError:
+            detailed = False
+        text_pformat = Text.pformat
+        element_pformat = Element.pformat
+        yield f'{indent*level}{self.starttag()}\n'
+        stack = [(iter(self.children), level+1)]
+        while stack:
+            children, level = stack[-1]
+            for child in children:
+                cls = type(child)
+                if cls.pformat is text_pformat and not detailed:
+                    prefix = indent * level
+                    lines = ''.join(prefix + line + '\n'
+                                    for line in child.astext().splitlines())
+                    if lines:
+                        yield lines
+                elif cls.pformat is element_pformat:
+                    yield f'{indent*level}{child.starttag()}\n'
+                    stack.append((iter(child.children), level+1))
+                    break
+                else:
+                    yield child.pformat(indent, level)
+            else:
+                stack.pop()
 
     def copy(self):
         obj = self.__class__(rawsource=self.rawsource, **self.attributes)
@@ -1340,6 +1602,13 @@ def __init__(self, settings, reporter, *args, **kwargs):
 
         self._document = self
 
+    _generation = 0
+    """Number of tree modifications (changes invalidate the node index)."""
+
+    _node_index = None
+    """Cached node index: (generation, nodes, positions by class, results).
+    """
+
     def __getstate__(self):
         """
         Return dict with unpicklable references removed.
@@ -1347,8 +1616,56 @@ def __getstate__(self):
         state = self.__dict__.copy()
         state['reporter'] = None
         state['transformer'] = None
+        state.pop('_node_index', None)
         return state
 
+    def findall(self, condition=None, include_self=True, descend=True,
+                siblings=False, ascend=False):
+        """
+        Return an iterator yielding nodes following `self`.
+
+        See `Node.findall()`.  If the node_index__ setting is True,
+        queries for all instances of a node class are answered from an
+        index of the document's nodes (rebuilt after modifications
+        of the document tree).
+
+        __ https://docutils.sourceforge.io/docs/user/config.html#node-index
+        """
+        if (isinstance(condition, type) and include_self and descend
+            and not (siblings or ascend)
+            and getattr(self.settings, 'node_index', False)):
+            return iter(self._query_node_index(condition))
+        return super().findall(condition, include_self, descend,
+                               siblings, ascend)
+
+    def _query_node_index(self, cls):
+        """Return list of all instances of `cls` in document order."""
+        index = self._node_index
+        if index is None or index[0] != self._generation:
+            nodes = []
+            positions = {}
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                positions.setdefault(node.__class__, []).append(len(nodes))
+                nodes.append(node)
+                stack.extend(reversed(node.children))
+            index = self._node_index = (self._generation, nodes,
+                                        positions, {})
+        generation, nodes, positions, results = index
+        try:
+            return results[cls]
+        except KeyError:
+            pass
+        matching = [p for node_class, p in positions.items()
+                    if issubclass(node_class, cls)]
+        if len(matching) == 1:
+            result = [nodes[i] for i in matching[0]]
+        else:
+            result = [nodes[i] for i in heapq.merge(*matching)]
+        results[cls] = result
+        return result
+
     def asdom(self, dom=None):
         """Return a DOM representation of this document."""
         if dom is None:
@@ -1997,12 +2314,18 @@ def dispatch_visit(self, node):
         Call self."``visit_`` + node class name" with `node` as
         parameter.  If the ``visit_...`` method does not exist, call
         self.unknown_visit.
+
+        The method is looked up once per node class and visitor instance.
         """
-        node_name = node.__class__.__name__
-        method = getattr(self, 'visit_' + node_name, self.unknown_visit)
-        self.document.reporter.debug(
-            'docutils.nodes.NodeVisitor.dispatch_visit calling %s for %s'
-            % (method.__name__, node_name))
+        try:
+            method = self._visit_methods[node.__class__]
+        except (AttributeError, KeyError):
+            method = self._dispatch_method(node, 'visit_', self.unknown_visit)
+        reporter = self.document.reporter
+        if reporter.debug_flag:
+            reporter.debug(
+                'docutils.nodes.NodeVisitor.dispatch_visit calling %s for %s'
+                % (method.__name__, node.__class__.__name__))
         return method(node)
 
     def dispatch_departure(self, node):
@@ -2010,14 +2333,29 @@ def dispatch_departure(self, node):
         Call self."``depart_`` + node class name" with `node` as
         parameter.  If the ``depart_...`` method does not exist, call
         self.unknown_departure.
+
+        The method is looked up once per node class and visitor instance.
         """
-        node_name = node.__class__.__name__
-        method = getattr(self, 'depart_' + node_name, self.unknown_departure)
-        self.document.reporter.debug(
-            'docutils.nodes.NodeVisitor.dispatch_departure calling %s for %s'
-            % (method.__name__, node_name))
+        try:
+            method = self._depart_methods[node.__class__]
+        except (AttributeError, KeyError):
+            method = self._dispatch_method(node, 'depart_',
+                                           self.unknown_departure)
+        reporter = self.document.reporter
+        if reporter.debug_flag:
+            reporter.debug(
+                'docutils.nodes.NodeVisitor.dispatch_departure calling %s '
+                'for %s' % (method.__name__, node.__class__.__name__))
         return method(node)
 
+    def _dispatch_method(self, node, prefix, default):
+        """Look up and store the method for `node` in the dispatch table.
+        """
+        table = self.__dict__.setdefault(f'_{prefix}methods', {})
+        method = getattr(self, prefix + node.__class__.__name__, default)
+        table[node.__class__] = method
+        return method
+
     def unknown_visit(self, node):
         """
         Called when entering unknown `Node` types.
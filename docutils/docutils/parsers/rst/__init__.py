@@ -72,7 +72,7 @@
 
 import docutils.parsers
 import docutils.statemachine
-from docutils.parsers.rst import roles, states
+from docutils.parsers.rst import states
 from docutils import frontend, nodes
 from docutils.transforms import universal
 
@@ -150,6 +150,10 @@ class Parser(docutils.parsers.Parser):
     config_section = 'restructuredtext parser'
     config_section_dependencies = ('parsers',)
 
+    statemachine = None
+    """The `states.RSTStateMachine` of the last parsed document.
+    Re-used for the next document."""
+
     def __init__(self, rfc2822=False, inliner=None):
         if rfc2822:
             self.initial_state = 'RFC2822Body'
@@ -167,10 +171,16 @@ def parse(self, inputstring, document):
         # provide fallbacks in case the document has only generic settings
         self.document.settings.setdefault('tab_width', 8)
         self.document.settings.setdefault('syntax_highlight', 'long')
-        self.statemachine = states.RSTStateMachine(
-              state_classes=self.state_classes,
-              initial_state=self.initial_state,
-              debug=document.reporter.debug_flag)
+        debug = document.reporter.debug_flag
+        # Re-use the state machine of the previous document (its states
+        # are re-initialized by `RSTStateMachine.run()`):
+        if (self.statemachine is None
+            or self.statemachine.debug != debug
+            or self.statemachine.initial_state != self.initial_state):
+            self.statemachine = states.RSTStateMachine(
+                  state_classes=self.state_classes,
+                  initial_state=self.initial_state,
+                  debug=debug)
         inputlines = docutils.statemachine.string2lines(
               inputstring, tab_width=document.settings.tab_width,
               convert_whitespace=True)
@@ -182,9 +192,6 @@ def parse(self, inputstring, document):
                 break
         else:
             self.statemachine.run(inputlines, document, inliner=self.inliner)
-        # restore the "default" default role after parsing a document
-        if '' in roles._roles:
-            del roles._roles['']
         self.finish_parse()
 
 
@@ -71,7 +71,13 @@
 names are defined in the ``language`` subpackage."""
 
 _directives = {}
-"""Cache of imported directives."""
+"""Mapping of directive names to directive classes registered with
+`register_directive()`."""
+
+_language_directives = {}
+"""Cache of imported directives.
+
+Mapping of (language module, directive name) to directive classes."""
 
 
 def directive(directive_name, language_module, document):
@@ -85,6 +91,10 @@ def directive(directive_name, language_module, document):
     msg_text = []
     if normname in _directives:
         return _directives[normname], messages
+    try:
+        return _language_directives[(language_module, normname)], messages
+    except (KeyError, TypeError):  # TypeError: unhashable language module
+        pass
     canonicalname = None
     try:
         canonicalname = language_module.directives[normname]
@@ -123,13 +133,16 @@ def directive(directive_name, language_module, document):
         return None, messages
     try:
         directive = getattr(module, classname)
-        _directives[normname] = directive
     except AttributeError:
         messages.append(document.reporter.error(
             'No directive class "%s" in module "%s" (directive "%s").'
             % (classname, modulename, directive_name),
             line=document.current_line))
         return None, messages
+    try:
+        _language_directives[(language_module, normname)] = directive
+    except TypeError:
+        pass
     return directive, messages
 
 
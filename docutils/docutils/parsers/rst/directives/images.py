@@ -8,23 +8,19 @@
 
 __docformat__ = 'reStructuredText'
 
-from urllib.request import url2pathname
-
-try:  # check for the Python Imaging Library
-    import PIL.Image
-except ImportError:
-    try:  # sometimes PIL modules are put in PYTHONPATH's root
-        import Image
-        class PIL: pass  # noqa:E701  dummy wrapper
-        PIL.Image = Image
-    except ImportError:
-        PIL = None
-
 from docutils import nodes
 from docutils.nodes import fully_normalize_name, whitespace_normalize_name
 from docutils.parsers.rst import Directive
 from docutils.parsers.rst import directives, states
 from docutils.parsers.rst.roles import set_classes
+from docutils.utils import image_info
+
+
+def __getattr__(name):
+    # `PIL` is imported on first access
+    if name == 'PIL':
+        return image_info._import_PIL()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 class Image(Directive):
@@ -125,14 +121,15 @@ def run(self):
             return [image_node]
         figure_node = nodes.figure('', image_node)
         if figwidth == 'image':
-            if PIL and self.state.document.settings.file_insertion_enabled:
+            if self.state.document.settings.file_insertion_enabled:
+                from urllib.request import url2pathname
                 imagepath = url2pathname(image_node['uri'])
                 try:
-                    with PIL.Image.open(imagepath) as img:
-                        figure_node['width'] = '%dpx' % img.size[0]
+                    size = image_info.cache.image_size(imagepath)
                 except (OSError, UnicodeEncodeError):
-                    pass  # TODO: warn/info?
-                else:
+                    size = None  # TODO: warn/info?
+                if size:
+                    figure_node['width'] = '%dpx' % size[0]
                     self.state.document.settings.record_dependencies.add(
                         imagepath.replace('\\', '/'))
         elif figwidth is not None:
@@ -9,7 +9,6 @@
 from pathlib import Path
 import re
 import time
-from urllib.request import urlopen
 from urllib.error import URLError
 
 from docutils import io, nodes, statemachine, utils
@@ -269,6 +268,7 @@ def run(self):
             attributes['source'] = path
         elif 'url' in self.options:
             source = self.options['url']
+            from urllib.request import urlopen
             try:
                 raw_text = urlopen(source).read()
             except (URLError, OSError) as error:
@@ -409,6 +409,18 @@ def run(self):
         return node_list
 
 
+def _document_role(directive, role_name):
+    """Return the role function for `role_name` and a list of messages.
+
+    Roles defined in the current document take precedence.
+    """
+    role = directive.state.memo.document_roles.get(role_name.lower())
+    if role is not None:
+        return role, []
+    return roles.role(role_name, directive.state_machine.language,
+                      directive.lineno, directive.state.reporter)
+
+
 class Role(Directive):
 
     has_content = True
@@ -430,9 +442,7 @@ def run(self):
         base_role_name = match.group(3)
         messages = []
         if base_role_name:
-            base_role, messages = roles.role(
-                base_role_name, self.state_machine.language, self.lineno,
-                self.state.reporter)
+            base_role, messages = _document_role(self, base_role_name)
             if base_role is None:
                 error = self.state.reporter.error(
                     'Unknown interpreted text role "%s".' % base_role_name,
@@ -467,7 +477,8 @@ def run(self):
                     line=self.lineno)
                 return messages + [error]
         role = roles.CustomRole(new_role_name, base_role, options, content)
-        roles.register_local_role(new_role_name, role)
+        roles.set_implicit_options(role)
+        self.state.memo.document_roles[new_role_name.lower()] = role
         return messages
 
 
@@ -479,21 +490,21 @@ class DefaultRole(Directive):
     final_argument_whitespace = False
 
     def run(self):
+        document_roles = self.state.memo.document_roles
         if not self.arguments:
-            if '' in roles._roles:
-                # restore the "default" default role
-                del roles._roles['']
+            # restore the "default" default role
+            document_roles[''] = roles._role_registry[
+                                     roles.DEFAULT_INTERPRETED_ROLE]
             return []
         role_name = self.arguments[0]
-        role, messages = roles.role(role_name, self.state_machine.language,
-                                    self.lineno, self.state.reporter)
+        role, messages = _document_role(self, role_name)
         if role is None:
             error = self.state.reporter.error(
                 'Unknown interpreted text role "%s".' % role_name,
                 nodes.literal_block(self.block_text, self.block_text),
                 line=self.lineno)
             return messages + [error]
-        roles._roles[''] = role
+        document_roles[''] = role
         return messages
 
 
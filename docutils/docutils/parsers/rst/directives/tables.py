@@ -17,7 +17,6 @@
 from docutils.utils import SystemMessagePropagation
 from docutils.parsers.rst import Directive
 from docutils.parsers.rst import directives
-from urllib.request import urlopen
 from urllib.error import URLError
 
 
@@ -370,6 +369,7 @@ def get_csv_data(self):
                 self.state.document.settings.record_dependencies.add(source)
         elif 'url' in self.options:
             source = self.options['url']
+            from urllib.request import urlopen
             try:
                 with urlopen(source) as response:
                     csv_text = response.read()
@@ -95,8 +95,16 @@ def role_fn(name, rawtext, text, lineno, inliner,
 """
 
 _roles = {}
-"""Mapping of local or language-dependent interpreted text role names to role
-functions."""
+"""Mapping of local interpreted text role names to role functions.
+
+Roles defined with the "role" and "default-role" directives are stored
+per document (see `states.RSTStateMachine.run()`).
+"""
+
+_language_roles = {}
+"""Cache of role functions for language-dependent role names.
+
+Mapping of (language module, role name) to role functions."""
 
 
 def role(role_name, language_module, lineno, reporter):
@@ -114,6 +122,10 @@ def role(role_name, language_module, lineno, reporter):
 
     if normname in _roles:
         return _roles[normname], messages
+    try:
+        return _language_roles[(language_module, normname)], messages
+    except (KeyError, TypeError):  # TypeError: unhashable language module
+        pass
 
     if role_name:
         canonicalname = None
@@ -148,7 +160,11 @@ def role(role_name, language_module, lineno, reporter):
     # Look the role up in the registry, and return it.
     if canonicalname in _role_registry:
         role_fn = _role_registry[canonicalname]
-        register_local_role(normname, role_fn)
+        set_implicit_options(role_fn)
+        try:
+            _language_roles[(language_module, normname)] = role_fn
+        except TypeError:
+            pass
         return role_fn, messages
     return None, messages  # Error message will be generated by caller.
 
@@ -115,7 +115,7 @@
 from docutils.parsers.rst import directives, languages, tableparser, roles
 from docutils.utils import escape2null, column_width
 from docutils.utils import punctuation_chars, roman, urischemes
-from docutils.utils import split_escaped_whitespace
+from docutils.utils import split_escaped_whitespace, timing
 
 
 class MarkupError(DataError): pass
@@ -161,7 +161,8 @@ def run(self, input_lines, document, input_offset=0, match_titles=True,
                            title_styles=[],
                            section_level=0,
                            section_bubble_up_kludge=False,
-                           inliner=inliner)
+                           inliner=inliner,
+                           document_roles={})
         self.document = document
         self.attach_observer(document.note_source)
         self.reporter = self.memo.reporter
@@ -179,7 +180,8 @@ class NestedStateMachine(StateMachineWS):
     document structures.
     """
 
-    def run(self, input_lines, input_offset, memo, node, match_titles=True):
+    def run(self, input_lines, input_offset, memo, node, match_titles=True,
+            initial_state=None):
         """
         Parse `input_lines` and populate a `docutils.nodes.document` instance.
 
@@ -192,7 +194,8 @@ def run(self, input_lines, input_offset, memo, node, match_titles=True):
         self.reporter = memo.reporter
         self.language = memo.language
         self.node = node
-        results = StateMachineWS.run(self, input_lines, input_offset)
+        results = StateMachineWS.run(self, input_lines, input_offset,
+                                     initial_state=initial_state)
         assert results == [], ('NestedStateMachine.run() results should be '
                                'empty!')
         return results
@@ -278,11 +281,11 @@ def nested_parse(self, block, input_offset, node, match_titles=False,
                                                 **state_machine_kwargs)
         state_machine.run(block, input_offset, memo=self.memo,
                           node=node, match_titles=match_titles)
+        new_offset = state_machine.abs_line_offset()
         if use_default == 2:
             self.nested_sm_cache.append(state_machine)
         else:
             state_machine.unlink()
-        new_offset = state_machine.abs_line_offset()
         # No `block.parent` implies disconnected -- lines aren't in sync:
         if block.parent and (len(block) - block_length) != 0:
             # Adjustment for block if modified in nested parse:
@@ -301,23 +304,43 @@ def nested_list_parse(self, block, input_offset, node, initial_state,
         `block`. Also keep track of optional intermediate blank lines and the
         required final one.
         """
+        use_default = 0
         if state_machine_class is None:
             state_machine_class = self.nested_sm
+            use_default += 1
         if state_machine_kwargs is None:
-            state_machine_kwargs = self.nested_sm_kwargs.copy()
-        state_machine_kwargs['initial_state'] = initial_state
-        state_machine = state_machine_class(debug=self.debug,
-                                            **state_machine_kwargs)
+            state_machine_kwargs = self.nested_sm_kwargs
+            use_default += 1
+
+        if use_default == 2:
+            # Use a default nested state machine (like `nested_parse()`)
+            # and pass the initial state to its `run()` method.
+            try:
+                state_machine = self.nested_sm_cache.pop()
+            except IndexError:
+                state_machine = state_machine_class(debug=self.debug,
+                                                    **state_machine_kwargs)
+            run_kwargs = {'initial_state': initial_state}
+        else:
+            state_machine_kwargs = state_machine_kwargs.copy()
+            state_machine_kwargs['initial_state'] = initial_state
+            state_machine = state_machine_class(debug=self.debug,
+                                                **state_machine_kwargs)
+            run_kwargs = {}
         if blank_finish_state is None:
             blank_finish_state = initial_state
         state_machine.states[blank_finish_state].blank_finish = blank_finish
         for key, value in extra_settings.items():
             setattr(state_machine.states[initial_state], key, value)
         state_machine.run(block, input_offset, memo=self.memo,
-                          node=node, match_titles=match_titles)
+                          node=node, match_titles=match_titles, **run_kwargs)
         blank_finish = state_machine.states[blank_finish_state].blank_finish
-        state_machine.unlink()
-        return state_machine.abs_line_offset(), blank_finish
+        new_offset = state_machine.abs_line_offset()
+        if use_default == 2:
+            self.nested_sm_cache.append(state_machine)
+        else:
+            state_machine.unlink()
+        return new_offset, blank_finish
 
     def section(self, title, source, style, lineno, messages):
         """Check for a valid subsection and create one if it checks out."""
@@ -457,6 +480,11 @@ def build_regexp(definition, compile=True):
         return regexp
 
 
+_inliner_patterns = {}
+"""Cache of compiled inline markup patterns, cf.
+`Inliner.compiled_patterns()`."""
+
+
 class Inliner:
 
     """
@@ -469,8 +497,56 @@ def __init__(self):
         `self.implicit_inline`."""
 
     def init_customizations(self, settings):
+        (self.start_string_prefix, self.end_string_suffix,
+         self.parts, patterns) = self.compiled_patterns(settings)
+        # The compiled patterns are shared, the container is not:
+        self.patterns = Struct(**patterns.__dict__)
+
+        # Remove the standard implicit markup handlers added for a
+        # previous document (if this instance is re-used).
+        standard = (self.standalone_uri, self.pep_reference,
+                    self.rfc_reference)
+        self.implicit_dispatch = [(pattern, method) for pattern, method
+                                  in self.implicit_dispatch
+                                  if method not in standard]
+        self.implicit_dispatch.append((self.patterns.uri,
+                                       self.standalone_uri))
+        if settings.pep_references:
+            self.implicit_dispatch.append((self.patterns.pep,
+                                           self.pep_reference))
+        if settings.rfc_references:
+            self.implicit_dispatch.append((self.patterns.rfc,
+                                           self.rfc_reference))
+
+    @classmethod
+    def compiled_patterns(cls, settings=None):
+        """
+        Return the inline markup patterns for `settings`.
+
+        Return a tuple (start_string_prefix, end_string_suffix, parts,
+        patterns).  The compiled patterns are cached and shared by all
+        `Inliner` instances of the same class.  Call this method at
+        process start (e.g. before forking worker processes) to
+        pre-compile the patterns.
+        """
+        character_level = bool(getattr(settings,
+                                       'character_level_inline_markup',
+                                       False))
+        key = (cls, character_level, punctuation_chars.openers,
+               punctuation_chars.closers, punctuation_chars.delimiters,
+               punctuation_chars.closing_delimiters)
+        try:
+            return _inliner_patterns[key]
+        except KeyError:
+            pass
+        patterns = _inliner_patterns[key] = cls._compile_patterns(
+                                                character_level)
+        return patterns
+
+    @classmethod
+    def _compile_patterns(cls, character_level_inline_markup):
         # lookahead and look-behind expressions for inline markup rules
-        if getattr(settings, 'character_level_inline_markup', False):
+        if character_level_inline_markup:
             start_string_prefix = '(^|(?<!\x00))'
             end_string_suffix = ''
         else:
@@ -481,12 +557,13 @@ def init_customizations(self, settings):
                                  (punctuation_chars.closing_delimiters,
                                   punctuation_chars.delimiters,
                                   punctuation_chars.closers))
-        args = locals().copy()
-        args.update(vars(self.__class__))
+        args = {'start_string_prefix': start_string_prefix,
+                'end_string_suffix': end_string_suffix}
+        args.update(vars(cls))
 
         parts = ('initial_inline', start_string_prefix, '',
            [
-            ('start', '', self.non_whitespace_after,  # simple start-strings
+            ('start', '', cls.non_whitespace_after,  # simple start-strings
              [r'\*\*',                # strong
               r'\*(?!\*)',            # emphasis but not strong
               r'``',                  # literal
@@ -495,32 +572,28 @@ def init_customizations(self, settings):
              ),
             ('whole', '', end_string_suffix,  # whole constructs
              [  # reference name & end-string
-              r'(?P<refname>%s)(?P<refend>__?)' % self.simplename,
+              r'(?P<refname>%s)(?P<refend>__?)' % cls.simplename,
               ('footnotelabel', r'\[', r'(?P<fnend>\]_)',
                [r'[0-9]+',                     # manually numbered
-                r'\#(%s)?' % self.simplename,  # auto-numbered (w/ label?)
+                r'\#(%s)?' % cls.simplename,  # auto-numbered (w/ label?)
                 r'\*',                         # auto-symbol
-                r'(?P<citationlabel>%s)' % self.simplename,  # citation ref
+                r'(?P<citationlabel>%s)' % cls.simplename,  # citation ref
                 ]
                )
               ]
              ),
             ('backquote',             # interpreted text or phrase reference
-             '(?P<role>(:%s:)?)' % self.simplename,  # optional role
-             self.non_whitespace_after,
+             '(?P<role>(:%s:)?)' % cls.simplename,  # optional role
+             cls.non_whitespace_after,
              ['`(?!`)']               # but not literal
              )
             ]
         )
-        self.start_string_prefix = start_string_prefix
-        self.end_string_suffix = end_string_suffix
-        self.parts = parts
-
-        self.patterns = Struct(
+        patterns = Struct(
           initial=build_regexp(parts),
-          emphasis=re.compile(self.non_whitespace_escape_before
+          emphasis=re.compile(cls.non_whitespace_escape_before
                               + r'(\*)' + end_string_suffix),
-          strong=re.compile(self.non_whitespace_escape_before
+          strong=re.compile(cls.non_whitespace_escape_before
                             + r'(\*\*)' + end_string_suffix),
           interpreted_or_phrase_ref=re.compile(
               r"""
@@ -546,14 +619,14 @@ def init_customizations(self, settings):
               )
               $                         # end of string
               """ % args, re.VERBOSE),
-          literal=re.compile(self.non_whitespace_before + '(``)'
+          literal=re.compile(cls.non_whitespace_before + '(``)'
                              + end_string_suffix),
-          target=re.compile(self.non_whitespace_escape_before
+          target=re.compile(cls.non_whitespace_escape_before
                             + r'(`)' + end_string_suffix),
-          substitution_ref=re.compile(self.non_whitespace_escape_before
+          substitution_ref=re.compile(cls.non_whitespace_escape_before
                                       + r'(\|_{0,2})'
                                       + end_string_suffix),
-          email=re.compile(self.email_pattern % args + '$',
+          email=re.compile(cls.email_pattern % args + '$',
                            re.VERBOSE),
           uri=re.compile(
                 (r"""
@@ -582,7 +655,7 @@ def init_customizations(self, settings):
                   )
                 |                       # *OR*
                   (?P<email>              # email address
-                    """ + self.email_pattern + r"""
+                    """ + cls.email_pattern + r"""
                   )
                 )
                 %(end_string_suffix)s
@@ -601,15 +674,7 @@ def init_customizations(self, settings):
                 %(start_string_prefix)s
                 (RFC(-|\s+)?(?P<rfcnum>\d+))
                 %(end_string_suffix)s""" % args, re.VERBOSE))
-
-        self.implicit_dispatch.append((self.patterns.uri,
-                                       self.standalone_uri))
-        if settings.pep_references:
-            self.implicit_dispatch.append((self.patterns.pep,
-                                           self.pep_reference))
-        if settings.rfc_references:
-            self.implicit_dispatch.append((self.patterns.rfc,
-                                           self.rfc_reference))
+        return start_string_prefix, end_string_suffix, parts, patterns
 
     def parse(self, text, lineno, memo, parent):
         # Needs to be refactored for nested inline markup.
@@ -633,6 +698,8 @@ def parse(self, text, lineno, memo, parent):
         self.reporter = memo.reporter
         self.document = memo.document
         self.language = memo.language
+        # `memo` may be created outside of `RSTStateMachine.run()`:
+        self.document_roles = getattr(memo, 'document_roles', {})
         self.parent = parent
         pattern_search = self.patterns.initial.search
         dispatch = self.dispatch
@@ -883,8 +950,13 @@ def adjust_uri(self, uri):
             return uri
 
     def interpreted(self, rawsource, text, role, lineno):
-        role_fn, messages = roles.role(role, self.language, lineno,
-                                       self.reporter)
+        # roles defined by directives in the current document come first
+        role_fn = self.document_roles.get(role.lower())
+        if role_fn is None:
+            role_fn, messages = roles.role(role, self.language, lineno,
+                                           self.reporter)
+        else:
+            messages = []
         if role_fn:
             nodes, messages2 = role_fn(role, rawsource, text, lineno, self)
             return nodes, messages + messages2
@@ -1829,11 +1901,59 @@ def build_table_row(self, rowdata, tableline):
                 attributes['morecols'] = morecols
             entry = nodes.entry(**attributes)
             row += entry
-            if ''.join(cellblock):
+            if not ''.join(cellblock):
+                continue
+            text = self.plain_paragraph_text(cellblock)
+            if text is None:
                 self.nested_parse(cellblock, input_offset=tableline+offset,
                                   node=entry)
+                continue
+            # Fast path: build the paragraph like `Text.paragraph()`,
+            # without running a nested state machine.
+            textnodes, messages = self.inliner.parse(
+                text, tableline + offset + 1, self.memo, entry)
+            p = nodes.paragraph(text, '', *textnodes)
+            p.source, srcoffset = cellblock.info(0)
+            p.line = srcoffset + 1
+            entry += p
+            entry += messages
+            # leave the document's current source & line like the
+            # state machine at the end of `cellblock`:
+            self.document.note_source(*cellblock.info(len(cellblock)))
         return row
 
+    def plain_paragraph_text(self, block):
+        """
+        Return the text of `block` if it is a paragraph without block markup.
+
+        Return None if `nested_parse()` of `block` may result in anything
+        but a single paragraph (e.g. a list, a literal block, or several
+        paragraphs).
+        """
+        if (self.nested_sm is not NestedStateMachine
+            or self.nested_sm_kwargs['initial_state'] != 'Body'):
+            return None
+        body = self.state_machine.states.get('Body')
+        text = self.state_machine.states.get('Text')
+        if (body is None or text is None
+            or type(body) not in self.nested_sm_kwargs['state_classes']
+            or type(text) not in self.nested_sm_kwargs['state_classes']):
+            return None
+        lines = list(block)
+        while lines and not lines[-1].strip(' '):  # trailing blank lines
+            lines.pop()
+        if (not lines
+            or block.offset(0) is None
+            or body.match_transition(lines[0]) != 'text'):
+            return None
+        for line in lines[1:]:
+            if text.match_transition(line) != 'text':
+                return None
+        data = '\n'.join(lines).rstrip()
+        if re.search(r'(?<!\\)(\\\\)*::$', data):  # literal block follows
+            return None
+        return data
+
     explicit = Struct()
     """Patterns and constants used for explicit markup recognition."""
 
@@ -2151,7 +2271,8 @@ def run_directive(self, directive, match, type_name, option_presets):
             type_name, arguments, options, content, lineno,
             content_offset, block_text, self, self.state_machine)
         try:
-            result = directive_instance.run()
+            with timing.directive(self.document.settings, type_name):
+                result = directive_instance.run()
         except docutils.parsers.rst.DirectiveError as error:
             msg_node = self.reporter.system_message(error.level, error.msg,
                                                     line=lineno)
@@ -20,10 +20,11 @@
 __docformat__ = 'reStructuredText'
 
 
+import heapq
 import re
 import sys
 from docutils import DataError
-from docutils.utils import strip_combining_chars
+from docutils.utils import column_indices, strip_combining_chars
 
 
 class TableMarkupError(DataError):
@@ -146,6 +147,7 @@ class GridTableParser(TableParser):
     def setup(self, block):
         self.block = block[:]           # make a copy; it may be modified
         self.block.disconnect()         # don't propagate changes to parent
+        self.lines = self.block.data    # fast access to the lines
         self.bottom = len(block) - 1
         self.right = len(block[0]) - 1
         self.head_body_sep = None
@@ -165,10 +167,18 @@ def parse_table(self):
 
         We'll end up knowing all the row and column boundaries, cell positions
         and their dimensions.
+
+        The queue is a heap (plus a set to skip corners that are already
+        queued).  The column indices of the lines (cf.
+        `utils.column_indices()`) are computed once per table.
         """
+        self.column_indices = [None if line.isascii()
+                               else column_indices(line)
+                               for line in self.lines]
         corners = [(0, 0)]
+        queued = {(0, 0)}
         while corners:
-            top, left = corners.pop(0)
+            top, left = heapq.heappop(corners)
             if (top == self.bottom
                 or left == self.right
                 or top <= self.done[left]):
@@ -180,13 +190,16 @@ def parse_table(self):
             update_dict_of_lists(self.rowseps, rowseps)
             update_dict_of_lists(self.colseps, colseps)
             self.mark_done(top, left, bottom, right)
-            cellblock = self.block.get_2D_block(top + 1, left + 1,
-                                                bottom, right)
+            cellblock = self.block.get_2D_block(
+                top + 1, left + 1, bottom, right,
+                column_indices=self.column_indices)
             cellblock.disconnect()      # lines in cell can't sync with parent
             cellblock.replace(self.double_width_pad_char, '')
             self.cells.append((top, left, bottom, right, cellblock))
-            corners.extend([(top, right), (bottom, left)])
-            corners.sort()
+            for corner in ((top, right), (bottom, left)):
+                if corner not in queued:
+                    queued.add(corner)
+                    heapq.heappush(corners, corner)
         if not self.check_parse_complete():
             raise TableMarkupError('Malformed table; parse incomplete.')
 
@@ -208,7 +221,7 @@ def check_parse_complete(self):
 
     def scan_cell(self, top, left):
         """Starting at the top-left corner, start tracing out a cell."""
-        assert self.block[top][left] == '+'
+        assert self.lines[top][left] == '+'
         return self.scan_right(top, left)
 
     def scan_right(self, top, left):
@@ -217,7 +230,7 @@ def scan_right(self, top, left):
         boundaries ('+').
         """
         colseps = {}
-        line = self.block[top]
+        line = self.lines[top]
         for i in range(left + 1, self.right + 1):
             if line[i] == '+':
                 colseps[i] = [top]
@@ -236,15 +249,16 @@ def scan_down(self, top, left, right):
         boundaries.
         """
         rowseps = {}
+        lines = self.lines
         for i in range(top + 1, self.bottom + 1):
-            if self.block[i][right] == '+':
+            if lines[i][right] == '+':
                 rowseps[i] = [right]
                 result = self.scan_left(top, left, i, right)
                 if result:
                     newrowseps, colseps = result
                     update_dict_of_lists(rowseps, newrowseps)
                     return i, rowseps, colseps
-            elif self.block[i][right] != '|':
+            elif lines[i][right] != '|':
                 return None
         return None
 
@@ -254,7 +268,7 @@ def scan_left(self, top, left, bottom, right):
         It must line up with the starting point.
         """
         colseps = {}
-        line = self.block[bottom]
+        line = self.lines[bottom]
         for i in range(right - 1, left, -1):
             if line[i] == '+':
                 colseps[i] = [bottom]
@@ -273,10 +287,11 @@ def scan_up(self, top, left, bottom, right):
         Noting row boundaries, see if we can return to the starting point.
         """
         rowseps = {}
+        lines = self.lines
         for i in range(bottom - 1, top, -1):
-            if self.block[i][left] == '+':
+            if lines[i][left] == '+':
                 rowseps[i] = [left]
-            elif self.block[i][left] != '|':
+            elif lines[i][left] != '|':
                 return None
         return rowseps
 
@@ -12,6 +12,7 @@
 
 from docutils import utils, parsers, Component
 from docutils.transforms import universal
+from docutils.utils import timing
 
 
 class Reader(Component):
@@ -66,8 +67,10 @@ def read(self, source, parser, settings):
         if not self.parser:
             self.parser = parser
         self.settings = settings
-        self.input = self.source.read()
-        self.parse()
+        with timing.phase(settings, 'read'):
+            self.input = self.source.read()
+        with timing.phase(settings, 'parse'):
+            self.parse()
         return self.document
 
     def parse(self):
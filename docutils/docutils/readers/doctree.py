@@ -22,6 +22,9 @@ class Reader(readers.ReReader):
     The original document settings are overridden; if you want to use the
     settings of the original document, pass ``settings=document.settings`` to
     the Publisher call above.
+
+    The document tree may also be passed in binary representation
+    (`bytes`, cf. `docutils.utils.binary_doctree`).
     """
 
     supported = ('doctree',)
@@ -34,6 +37,9 @@ def parse(self):
         No parsing to do; refurbish the document tree instead.
         Overrides the inherited method.
         """
+        if isinstance(self.input, (bytes, bytearray, memoryview)):
+            from docutils.utils import binary_doctree
+            self.input = binary_doctree.loads(self.input)
         self.document = self.input
         # Create fresh Transformer object, to be populated from Writer
         # component.
@@ -107,8 +107,12 @@ def atransition(self, match, context, next_state):
 
 __docformat__ = 'restructuredtext'
 
+from bisect import bisect_right
+from collections.abc import MutableSequence
+from itertools import islice
 import sys
 import re
+import warnings
 from unicodedata import east_asian_width
 
 from docutils import utils
@@ -434,7 +438,16 @@ def check_line(self, context, state, transitions=None):
         if self.debug:
             print('\nStateMachine.check_line: state="%s", transitions=%r.'
                   % (state.__class__.__name__, transitions), file=sys.stderr)
-        for name in transitions:
+        combined = state.combined_pattern(transitions)
+        if combined is None:
+            candidates = transitions
+        else:
+            # Classify the line with a single match of the combined pattern;
+            # the winning transition's own pattern provides the match object.
+            pattern, names = combined
+            match = pattern.match(self.line)
+            candidates = (names[match.lastindex],) if match else ()
+        for name in candidates:
             pattern, method, next_state = state.transitions[name]
             match = pattern.match(self.line)
             if match:
@@ -443,11 +456,10 @@ def check_line(self, context, state, transitions=None):
                           f'"{name}" in state "{state.__class__.__name__}".',
                           file=sys.stderr)
                 return method(match, context, next_state)
-        else:
-            if self.debug:
-                print('\nStateMachine.check_line: No match in state "%s".'
-                      % state.__class__.__name__, file=sys.stderr)
-            return state.no_match(context, transitions)
+        if self.debug:
+            print('\nStateMachine.check_line: No match in state "%s".'
+                  % state.__class__.__name__, file=sys.stderr)
+        return state.no_match(context, transitions)
 
     def add_state(self, state_class):
         """
@@ -579,6 +591,13 @@ class of the current state, and 'initial_state' defaults to the name of
     defaults.
     """
 
+    combine_patterns = True
+    """
+    Classify input lines with a single combined pattern of all transitions
+    (see `combined_pattern()`).  Set to False in subclasses that modify
+    `transitions` in place.
+    """
+
     def __init__(self, state_machine, debug=False):
         """
         Initialize a `State` object; make & add initial transitions.
@@ -601,6 +620,9 @@ def __init__(self, state_machine, debug=False):
         or other classes.
         """
 
+        self._combined_patterns = {}
+        """Cache of `combined_pattern()` results."""
+
         self.add_initial_transitions()
 
         self.state_machine = state_machine
@@ -651,6 +673,7 @@ def add_transitions(self, names, transitions):
                 raise UnknownTransitionError(name)
         self.transition_order[:0] = names
         self.transitions.update(transitions)
+        self._combined_patterns.clear()
 
     def add_transition(self, name, transition):
         """
@@ -664,6 +687,7 @@ def add_transition(self, name, transition):
             raise DuplicateTransitionError(name)
         self.transition_order[:0] = [name]
         self.transitions[name] = transition
+        self._combined_patterns.clear()
 
     def remove_transition(self, name):
         """
@@ -676,6 +700,7 @@ def remove_transition(self, name):
             self.transition_order.remove(name)
         except:  # noqa  catchall
             raise UnknownTransitionError(name)
+        self._combined_patterns.clear()
 
     def make_transition(self, name, next_state=None):
         """
@@ -729,6 +754,51 @@ def make_transitions(self, name_list):
                 names.append(namestate[0])
         return names, transitions
 
+    def combined_pattern(self, names):
+        """
+        Return a (compiled_pattern, names) pair for transition `names`.
+
+        The pattern is an alternation of the transition patterns in the
+        order of `names` (the first matching alternative wins, just like
+        trying the patterns one by one).  The `lastindex` of a match
+        indexes `names` to give the matching transition.
+
+        Return None if combining is disabled, not worthwhile (less than
+        two transitions), or not possible (incompatible pattern flags).
+        """
+        if not self.combine_patterns or len(names) < 2:
+            return None
+        key = tuple(names)
+        try:
+            return self._combined_patterns[key]
+        except KeyError:
+            pass
+        patterns = tuple((name, self.transitions[name][0]) for name in key)
+        try:
+            combined = _combined_patterns[patterns]
+        except KeyError:
+            combined = _combined_patterns[patterns] = _combine(patterns)
+        self._combined_patterns[key] = combined
+        return combined
+
+    def match_transition(self, line):
+        """
+        Return the name of the first transition in `self.transition_order`
+        whose pattern matches `line` (None if there is no match).
+
+        Like `StateMachine.check_line()`, but does not call the transition
+        method.
+        """
+        combined = self.combined_pattern(self.transition_order)
+        if combined is not None:
+            pattern, names = combined
+            match = pattern.match(line)
+            return names[match.lastindex] if match else None
+        for name in self.transition_order:
+            if self.transitions[name][0].match(line):
+                return name
+        return None
+
     def no_match(self, context, transitions):
         """
         Called when there is no match from `StateMachine.check_line()`.
@@ -773,6 +843,101 @@ def nop(self, match, context, next_state):
         return context, next_state, []
 
 
+_combined_patterns = {}
+"""Cache of combined transition patterns, cf. `State.combined_pattern()`."""
+
+_SCOPED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE
+_FLAG_LETTERS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'),
+                 (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+_group_reference = re.compile(r"""\\(?![0-7]{3})(?P<number>[1-9][0-9]?)
+                                  |\\(?P<escaped>.)
+                                  |\(\?P[<=](?P<name>\w+)
+                                  |\(\?\((?P<condition>\w+)\)
+                                  |(?P<charset>\[\^?\]?)
+                                  |(?P<comment>\#[^\n]*)""",
+                              re.VERBOSE | re.DOTALL)
+_charset_end = re.compile(r'(\\.|[^]\\])*\]', re.DOTALL)
+
+
+def _shift_groups(source, shift, prefix, verbose=False):
+    """
+    Prepare regular expression `source` for use as part of a larger pattern.
+
+    Add `shift` to numbered group references and `prefix` to group names.
+    `verbose` tells whether `source` is to be compiled with `re.VERBOSE`.
+    """
+    parts = []
+    pos = 0
+    while True:
+        match = _group_reference.search(source, pos)
+        if match is None:
+            break
+        parts.append(source[pos:match.start()])
+        pos = match.end()
+        if match.group('number'):
+            parts.append('(?:\\%d)' % (int(match.group('number')) + shift))
+        elif match.group('name'):
+            parts.append(match.group()[:-len(match.group('name'))]
+                         + prefix + match.group('name'))
+        elif match.group('condition'):
+            condition = match.group('condition')
+            if condition.isdigit():
+                condition = str(int(condition) + shift)
+            else:
+                condition = prefix + condition
+            parts.append('(?(%s)' % condition)
+        elif match.group('charset') is not None:
+            # skip character sets: no references there
+            end = _charset_end.match(source, pos)
+            if end:
+                pos = end.end()
+            parts.append(source[match.start():pos])
+        elif match.group('comment') and not verbose:
+            parts.append('#')
+            pos = match.start() + 1
+        else:
+            parts.append(match.group())
+    parts.append(source[pos:])
+    return ''.join(parts)
+
+
+def _combine(patterns):
+    """
+    Return a (compiled_pattern, names) pair or None, cf.
+    `State.combined_pattern()`.
+
+    `patterns` is a sequence of (transition name, compiled pattern) pairs.
+    """
+    alternatives = []
+    group_names = [None]
+    for name, pattern in patterns:
+        if pattern.flags & ~(re.UNICODE | _SCOPED_FLAGS):
+            alternatives = None
+            break
+        flags = ''.join(letter for flag, letter in _FLAG_LETTERS
+                        if pattern.flags & flag)
+        source = _shift_groups(pattern.pattern, len(group_names),
+                               'T%d_' % len(alternatives), 'x' in flags)
+        if 'x' in flags:
+            source += '\n'     # terminate a trailing comment
+        alternatives.append('(%s)' % (f'(?{flags}:{source})'
+                                      if flags else source))
+        group_names.append(name)
+        group_names.extend([None] * pattern.groups)
+    combined = None
+    if alternatives:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                pattern = re.compile('|'.join(alternatives))
+        except (re.error, Warning):
+            pass
+        else:
+            if pattern.groups == len(group_names) - 1:
+                combined = pattern, group_names
+    return combined
+
+
 class StateMachineWS(StateMachine):
 
     """
@@ -1050,6 +1215,236 @@ class SearchStateMachineWS(_SearchOverride, StateMachineWS):
     pass
 
 
+class _ItemSpans:
+
+    """
+    Run-length encoded ``(source, offset)`` pairs of a `ViewList`.
+
+    Consecutive lines from the same source with consecutive offsets (the
+    common case) are stored as a single run, so that slicing and copying
+    cost O(number of runs) instead of O(number of lines).  Runs with a
+    non-integer offset always have length 1.
+    """
+
+    __slots__ = ('starts', 'sources', 'offsets', 'length')
+
+    def __init__(self):
+        self.starts = []
+        """Index of the first item of each run."""
+
+        self.sources = []
+        """Source of each run."""
+
+        self.offsets = []
+        """Offset of the first item of each run."""
+
+        self.length = 0
+        """Total number of items."""
+
+    @classmethod
+    def from_source(cls, source, length):
+        """Return spans for `length` lines of `source`, starting at offset 0.
+        """
+        spans = cls()
+        spans.add_run(source, 0, length)
+        return spans
+
+    @classmethod
+    def from_items(cls, items):
+        """Return spans encoding the (source, offset) pairs in `items`."""
+        spans = cls()
+        for source, offset in items:
+            spans.add_run(source, offset, 1)
+        return spans
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError('list index out of range')
+        run = bisect_right(self.starts, i) - 1
+        offset = self.offsets[run]
+        if i > self.starts[run]:
+            offset += i - self.starts[run]
+        return self.sources[run], offset
+
+    def __iter__(self):
+        for source, offset, length in self.runs():
+            if length == 1:
+                yield source, offset
+            else:
+                for i in range(offset, offset + length):
+                    yield source, i
+
+    def runs(self):
+        """Return iterator yielding (source, offset, length) tuples."""
+        ends = self.starts[1:] + [self.length]
+        for start, end, source, offset in zip(self.starts, ends,
+                                              self.sources, self.offsets):
+            yield source, offset, end - start
+
+    def add_run(self, source, offset, length):
+        """Append `length` items, merging with the last run if contiguous."""
+        if length <= 0:
+            return
+        if (self.starts
+            and isinstance(offset, int)
+            and isinstance(self.offsets[-1], int)
+            and self.sources[-1] == source
+            and offset == self.offsets[-1] + self.length - self.starts[-1]):
+            self.length += length
+            return
+        assert length == 1 or isinstance(offset, int), 'non-integer offset'
+        self.starts.append(self.length)
+        self.sources.append(source)
+        self.offsets.append(offset)
+        self.length += length
+
+    def extend(self, other):
+        for run in list(other.runs()):
+            self.add_run(*run)
+
+    def copy(self):
+        spans = self.__class__()
+        spans.starts = self.starts[:]
+        spans.sources = self.sources[:]
+        spans.offsets = self.offsets[:]
+        spans.length = self.length
+        return spans
+
+    def slice(self, start, stop):
+        """Return new spans for the items from `start` to `stop`.
+
+        `start` and `stop` must be normalized (0 <= start <= stop <= len).
+        """
+        spans = self.__class__()
+        if start >= stop:
+            return spans
+        starts = self.starts
+        run = bisect_right(starts, start) - 1
+        while run < len(starts) and starts[run] < stop:
+            run_start = starts[run]
+            if run + 1 < len(starts):
+                run_end = starts[run + 1]
+            else:
+                run_end = self.length
+            lo = max(start, run_start)
+            offset = self.offsets[run]
+            if lo > run_start:
+                offset += lo - run_start
+            spans.add_run(self.sources[run], offset, min(stop, run_end) - lo)
+            run += 1
+        return spans
+
+    def splice(self, start, stop, other=None):
+        """Replace the items from `start` to `stop` with those of `other`.
+
+        `start` and `stop` must be normalized (0 <= start <= stop <= len).
+        """
+        if start == stop == self.length:       # appending
+            if other is not None:
+                self.extend(other)
+            return
+        head = self.slice(0, start)
+        if other is not None:
+            head.extend(other)
+        head.extend(self.slice(stop, self.length))
+        self.starts = head.starts
+        self.sources = head.sources
+        self.offsets = head.offsets
+        self.length = head.length
+
+
+class _ItemsView(MutableSequence):
+
+    """
+    The (source, offset) pairs of a `ViewList`, as a mutable list-like view
+    of its `_ItemSpans`.
+
+    Indexing costs O(log(number of runs)); modifications change the
+    spans of the ViewList.
+    """
+
+    __slots__ = ('_viewlist',)
+
+    def __init__(self, viewlist):
+        self._viewlist = viewlist
+
+    def __len__(self):
+        return len(self._viewlist._spans)
+
+    def __iter__(self):
+        return iter(self._viewlist._spans)
+
+    def __getitem__(self, i):
+        spans = self._viewlist._spans
+        if isinstance(i, slice):
+            return list(spans)[i]
+        return spans[i]
+
+    def __setitem__(self, i, value):
+        spans = self._viewlist._spans
+        if isinstance(i, slice):
+            items = list(spans)
+            items[i] = value
+            self._viewlist._spans = _ItemSpans.from_items(items)
+        else:
+            i = self._index(i)
+            spans.splice(i, i + 1, _ItemSpans.from_items([value]))
+
+    def __delitem__(self, i):
+        spans = self._viewlist._spans
+        if isinstance(i, slice):
+            items = list(spans)
+            del items[i]
+            self._viewlist._spans = _ItemSpans.from_items(items)
+        else:
+            i = self._index(i)
+            spans.splice(i, i + 1)
+
+    def _index(self, i):
+        """Return normalized index `i`, raise IndexError if out of range.
+        """
+        length = len(self)
+        if i < 0:
+            i += length
+        if not 0 <= i < length:
+            raise IndexError('list index out of range')
+        return i
+
+    def insert(self, i, value):
+        spans = self._viewlist._spans
+        i = min(max(i + len(spans) if i < 0 else i, 0), len(spans))
+        spans.splice(i, i, _ItemSpans.from_items([value]))
+
+    def append(self, value):
+        source, offset = value
+        self._viewlist._spans.add_run(source, offset, 1)
+
+    def __eq__(self, other):
+        if isinstance(other, _ItemsView):
+            other = list(other)
+        return list(self) == other
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __mul__(self, n):
+        return list(self) * n
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def copy(self):
+        return list(self)
+
+
 class ViewList:
 
     """
@@ -1068,17 +1463,29 @@ class ViewList:
     Also, ViewList objects keep track of the source & offset of each item.
     This information is accessible via the `source()`, `offset()`, and
     `info()` methods.
+
+    Slicing does not copy: a child list shares the data storage of its
+    parent until one of them is modified (copy-on-write), and the
+    (source, offset) pairs are stored run-length encoded.
     """
 
     def __init__(self, initlist=None, source=None, items=None,
                  parent=None, parent_offset=None):
-        self.data = []
-        """The actual list of data, flattened from various sources."""
+        self._data = []
+        """Storage of the data.  Possibly shared with other lists."""
 
-        self.items = []
-        """A list of (source, offset) pairs, same length as `self.data`: the
-        source of each line and the offset of each line from the beginning of
-        its source."""
+        self._start = 0
+        """Index of the first item in `_data`."""
+
+        self._stop = None
+        """Index after the last item in `_data` or None, if this list owns
+        and uses the complete `_data` list."""
+
+        self._shared = False
+        """True if `_data` is referenced by views (copy before writing)."""
+
+        self._spans = _ItemSpans()
+        """The (source, offset) pairs of the items, run-length encoded."""
 
         self.parent = parent
         """The parent list."""
@@ -1087,15 +1494,73 @@ def __init__(self, initlist=None, source=None, items=None,
         """Offset of this list from the beginning of the parent list."""
 
         if isinstance(initlist, ViewList):
-            self.data = initlist.data[:]
-            self.items = initlist.items[:]
+            self._data, self._start, self._stop = initlist._share()
+            self._spans = initlist._spans.copy()
         elif initlist is not None:
-            self.data = list(initlist)
-            if items:
-                self.items = items
+            self._data = list(initlist)
+            if isinstance(items, _ItemSpans):
+                self._spans = items
+            elif items:
+                self._spans = _ItemSpans.from_items(items)
             else:
-                self.items = [(source, i) for i in range(len(initlist))]
-        assert len(self.data) == len(self.items), 'data mismatch'
+                self._spans = _ItemSpans.from_source(source, len(self._data))
+        assert len(self) == len(self._spans), 'data mismatch'
+
+    @property
+    def data(self):
+        """The actual list of data, flattened from various sources.
+
+        Accessing this attribute gives this list a private copy of shared
+        data storage.
+        """
+        if self._stop is not None or self._shared:
+            self._data = self._data[self._start:self._stop]
+            self._start, self._stop, self._shared = 0, None, False
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._start, self._stop, self._shared = 0, None, False
+
+    @property
+    def items(self):
+        """A list of (source, offset) pairs, same length as `self.data`: the
+        source of each line and the offset of each line from the beginning of
+        its source.
+
+        A list-like view of the run-length encoded items (see `_ItemsView`).
+        """
+        return _ItemsView(self)
+
+    @items.setter
+    def items(self, items):
+        self._spans = _ItemSpans.from_items(items)
+
+    def _bounds(self):
+        """Return the data storage and the start and stop index of this list.
+        """
+        if self._stop is None:
+            return self._data, 0, len(self._data)
+        return self._data, self._start, self._stop
+
+    def _share(self):
+        """Like `_bounds()`, but mark the storage as shared."""
+        if self._stop is None:
+            self._shared = True
+        return self._bounds()
+
+    def _slice_bounds(self, i):
+        """Return normalized start and stop index for slice `i`."""
+        assert i.step in (None, 1), 'cannot handle slice with stride'
+        start, stop, step = i.indices(len(self))
+        return start, max(start, stop)
+
+    def _index(self, i):
+        """Return normalized index `i`."""
+        if i < 0:
+            i += len(self)
+        return i
 
     def __str__(self):
         return str(self.data)
@@ -1117,10 +1582,16 @@ def __cast(self, other):
             return other
 
     def __contains__(self, item):
-        return item in self.data
+        return item in iter(self)
+
+    def __iter__(self):
+        data, start, stop = self._bounds()
+        return islice(data, start, stop)
 
     def __len__(self):
-        return len(self.data)
+        if self._stop is None:
+            return len(self._data)
+        return self._stop - self._start
 
     # The __getitem__()/__setitem__() methods check whether the index
     # is a slice first, since indexing a native list with a slice object
@@ -1128,129 +1599,153 @@ def __len__(self):
 
     def __getitem__(self, i):
         if isinstance(i, slice):
-            assert i.step in (None, 1), 'cannot handle slice with stride'
-            return self.__class__(self.data[i.start:i.stop],
-                                  items=self.items[i.start:i.stop],
-                                  parent=self, parent_offset=i.start or 0)
+            start, stop = self._slice_bounds(i)
+            data, offset, end = self._share()
+            child = self.__class__(parent=self, parent_offset=start)
+            child._data = data
+            child._start, child._stop = offset + start, offset + stop
+            child._spans = self._spans.slice(start, stop)
+            return child
+        elif self._stop is None:
+            return self._data[i]
         else:
-            return self.data[i]
+            i = self._index(i)
+            if not 0 <= i < len(self):
+                raise IndexError('list index out of range')
+            return self._data[self._start + i]
 
     def __setitem__(self, i, item):
         if isinstance(i, slice):
-            assert i.step in (None, 1), 'cannot handle slice with stride'
             if not isinstance(item, ViewList):
                 raise TypeError('assigning non-ViewList to ViewList slice')
-            self.data[i.start:i.stop] = item.data
-            self.items[i.start:i.stop] = item.items
-            assert len(self.data) == len(self.items), 'data mismatch'
+            start, stop = self._slice_bounds(i)
+            spans = item._spans
+            self.data[start:stop] = item.data
+            self._spans.splice(start, stop, spans)
+            assert len(self) == len(self._spans), 'data mismatch'
             if self.parent:
-                k = (i.start or 0) + self.parent_offset
-                n = (i.stop or len(self)) + self.parent_offset
-                self.parent[k:n] = item
+                self.parent[start + self.parent_offset:
+                            stop + self.parent_offset] = item
         else:
+            i = self._index(i)
             self.data[i] = item
             if self.parent:
                 self.parent[i + self.parent_offset] = item
 
     def __delitem__(self, i):
-        try:
+        if isinstance(i, slice):
+            start, stop = self._slice_bounds(i)
+            del self.data[start:stop]
+            self._spans.splice(start, stop)
+            if self.parent:
+                del self.parent[start + self.parent_offset:
+                                stop + self.parent_offset]
+        else:
+            i = self._index(i)
             del self.data[i]
-            del self.items[i]
+            self._spans.splice(i, i + 1)
             if self.parent:
                 del self.parent[i + self.parent_offset]
-        except TypeError:
-            assert i.step is None, 'cannot handle slice with stride'
-            del self.data[i.start:i.stop]
-            del self.items[i.start:i.stop]
-            if self.parent:
-                k = (i.start or 0) + self.parent_offset
-                n = (i.stop or len(self)) + self.parent_offset
-                del self.parent[k:n]
 
     def __add__(self, other):
         if isinstance(other, ViewList):
-            return self.__class__(self.data + other.data,
-                                  items=(self.items + other.items))
+            spans = self._spans.copy()
+            spans.extend(other._spans)
+            return self.__class__(list(self) + list(other), items=spans)
         else:
             raise TypeError('adding non-ViewList to a ViewList')
 
     def __radd__(self, other):
         if isinstance(other, ViewList):
-            return self.__class__(other.data + self.data,
-                                  items=(other.items + self.items))
+            spans = other._spans.copy()
+            spans.extend(self._spans)
+            return self.__class__(list(other) + list(self), items=spans)
         else:
             raise TypeError('adding ViewList to a non-ViewList')
 
     def __iadd__(self, other):
         if isinstance(other, ViewList):
+            spans = other._spans
             self.data += other.data
+            self._spans.extend(spans)
         else:
             raise TypeError('argument to += must be a ViewList')
         return self
 
     def __mul__(self, n):
-        return self.__class__(self.data * n, items=(self.items * n))
+        spans = _ItemSpans()
+        for i in range(n):
+            spans.extend(self._spans)
+        return self.__class__(list(self) * n, items=spans)
 
     __rmul__ = __mul__
 
     def __imul__(self, n):
+        spans = self._spans.copy()
+        self._spans = _ItemSpans()
+        for i in range(n):
+            self._spans.extend(spans)
         self.data *= n
-        self.items *= n
         return self
 
     def extend(self, other):
         if not isinstance(other, ViewList):
             raise TypeError('extending a ViewList with a non-ViewList')
         if self.parent:
-            self.parent.insert(len(self.data) + self.parent_offset, other)
+            self.parent.insert(len(self) + self.parent_offset, other)
+        spans = other._spans
         self.data.extend(other.data)
-        self.items.extend(other.items)
+        self._spans.extend(spans)
 
     def append(self, item, source=None, offset=0):
         if source is None:
             self.extend(item)
         else:
             if self.parent:
-                self.parent.insert(len(self.data) + self.parent_offset, item,
+                self.parent.insert(len(self) + self.parent_offset, item,
                                    source, offset)
             self.data.append(item)
-            self.items.append((source, offset))
+            self._spans.add_run(source, offset, 1)
 
     def insert(self, i, item, source=None, offset=0):
+        index = min(max(self._index(i), 0), len(self))
         if source is None:
             if not isinstance(item, ViewList):
                 raise TypeError('inserting non-ViewList with no source given')
-            self.data[i:i] = item.data
-            self.items[i:i] = item.items
+            spans = item._spans
+            self.data[index:index] = item.data
+            self._spans.splice(index, index, spans)
             if self.parent:
-                index = (len(self.data) + i) % len(self.data)
                 self.parent.insert(index + self.parent_offset, item)
         else:
-            self.data.insert(i, item)
-            self.items.insert(i, (source, offset))
+            self.data.insert(index, item)
+            spans = _ItemSpans()
+            spans.add_run(source, offset, 1)
+            self._spans.splice(index, index, spans)
             if self.parent:
-                index = (len(self.data) + i) % len(self.data)
                 self.parent.insert(index + self.parent_offset, item,
                                    source, offset)
 
     def pop(self, i=-1):
+        i = self._index(i)
         if self.parent:
-            index = (len(self.data) + i) % len(self.data)
-            self.parent.pop(index + self.parent_offset)
-        self.items.pop(i)
-        return self.data.pop(i)
+            self.parent.pop(i + self.parent_offset)
+        item = self.data.pop(i)
+        self._spans.splice(i, i + 1)
+        return item
 
     def trim_start(self, n=1):
         """
         Remove items from the start of the list, without touching the parent.
         """
-        if n > len(self.data):
+        if n > len(self):
             raise IndexError("Size of trim too large; can't trim %s items "
-                             "from a list of size %s." % (n, len(self.data)))
+                             "from a list of size %s." % (n, len(self)))
         elif n < 0:
             raise IndexError('Trim size must be >= 0.')
-        del self.data[:n]
-        del self.items[:n]
+        data, start, stop = self._bounds()
+        self._data, self._start, self._stop = data, start + n, stop
+        self._spans = self._spans.slice(n, len(self._spans))
         if self.parent:
             self.parent_offset += n
 
@@ -1258,27 +1753,32 @@ def trim_end(self, n=1):
         """
         Remove items from the end of the list, without touching the parent.
         """
-        if n > len(self.data):
+        if n > len(self):
             raise IndexError("Size of trim too large; can't trim %s items "
-                             "from a list of size %s." % (n, len(self.data)))
+                             "from a list of size %s." % (n, len(self)))
         elif n < 0:
             raise IndexError('Trim size must be >= 0.')
-        del self.data[-n:]
-        del self.items[-n:]
+        data, start, stop = self._bounds()
+        self._data, self._start, self._stop = data, start, stop - n
+        self._spans = self._spans.slice(0, len(self._spans) - n)
 
     def remove(self, item):
         index = self.index(item)
         del self[index]
 
     def count(self, item):
-        return self.data.count(item)
+        data, start, stop = self._bounds()
+        return data[start:stop].count(item)
 
     def index(self, item):
-        return self.data.index(item)
+        data, start, stop = self._bounds()
+        return data.index(item, start, stop) - start
 
     def reverse(self):
+        items = list(self.items)
+        items.reverse()
         self.data.reverse()
-        self.items.reverse()
+        self.items = items
         self.parent = None
 
     def sort(self, *args):
@@ -1290,10 +1790,10 @@ def sort(self, *args):
     def info(self, i):
         """Return source & offset for index `i`."""
         try:
-            return self.items[i]
+            return self._spans[i]
         except IndexError:
-            if i == len(self.data):     # Just past the end
-                return self.items[i - 1][0], None
+            if i == len(self):     # Just past the end
+                return self._spans[i - 1][0], None
             else:
                 raise
 
@@ -1311,7 +1811,7 @@ def disconnect(self):
 
     def xitems(self):
         """Return iterator yielding (source, offset, value) tuples."""
-        for (value, (source, offset)) in zip(self.data, self.items):
+        for (value, (source, offset)) in zip(self, self._spans):
             yield source, offset, value
 
     def pprint(self):
@@ -1341,18 +1841,19 @@ def get_text_block(self, start, flush_left=False):
         indented line is encountered before the text block ends (with a blank
         line).
         """
-        end = start
-        last = len(self.data)
+        data, first, last = self._bounds()
+        end = start + first
         while end < last:
-            line = self.data[end]
+            line = data[end]
             if not line.strip():
                 break
             if flush_left and (line[0] == ' '):
+                end -= first
                 source, offset = self.info(end)
                 raise UnexpectedIndentationError(self[start:end], source,
                                                  offset + 1)
             end += 1
-        return self[start:end]
+        return self[start:end - first]
 
     def get_indented(self, start=0, until_blank=False, strip_indent=True,
                      block_indent=None, first_indent=None):
@@ -1382,16 +1883,18 @@ def get_indented(self, start=0, until_blank=False, strip_indent=True,
             first_indent = block_indent
         if first_indent is not None:
             end += 1
-        last = len(self.data)
+        data, first, last = self._bounds()
+        start += first
+        end += first
         while end < last:
-            line = self.data[end]
+            line = data[end]
             if line and (line[0] != ' '
                          or (block_indent is not None
                              and line[:block_indent].strip())):
                 # Line not indented or insufficiently indented.
                 # Block finished properly iff the last indented line blank:
                 blank_finish = ((end > start)
-                                and not self.data[end - 1].strip())
+                                and not data[end - 1].strip())
                 break
             stripped = line.lstrip()
             if not stripped:            # blank line
@@ -1407,28 +1910,43 @@ def get_indented(self, start=0, until_blank=False, strip_indent=True,
             end += 1
         else:
             blank_finish = 1            # block ends at end of lines
-        block = self[start:end]
+        block = self[start - first:end - first]
         if first_indent is not None and block:
             block.data[0] = block.data[0][first_indent:]
         if indent and strip_indent:
             block.trim_left(indent, start=(first_indent is not None))
         return block, indent or 0, blank_finish
 
-    def get_2D_block(self, top, left, bottom, right, strip_indent=True):
+    def get_2D_block(self, top, left, bottom, right, strip_indent=True,
+                     column_indices=None):
+        """Return the text block from line `top` to `bottom` (exclusive)
+        and column `left` to `right` (exclusive).
+
+        `column_indices` is an optional list of the precomputed
+        `utils.column_indices()` of all lines in `self` (None for lines
+        without combining characters).
+        """
         block = self[top:bottom]
+        data = block.data
         indent = right
-        for i in range(len(block.data)):
+        for i in range(len(data)):
             # get slice from line, care for combining characters
-            ci = utils.column_indices(block.data[i])
-            try:
-                left = ci[left]
-            except IndexError:
-                left += len(block.data[i]) - len(ci)
-            try:
-                right = ci[right]
-            except IndexError:
-                right += len(block.data[i]) - len(ci)
-            block.data[i] = line = block.data[i][left:right].rstrip()
+            if column_indices is not None:
+                ci = column_indices[top + i]
+            elif data[i].isascii():
+                ci = None
+            else:
+                ci = utils.column_indices(data[i])
+            if ci is not None:
+                try:
+                    left = ci[left]
+                except IndexError:
+                    left += len(data[i]) - len(ci)
+                try:
+                    right = ci[right]
+                except IndexError:
+                    right += len(data[i]) - len(ci)
+            data[i] = line = data[i][left:right].rstrip()
             if line:
                 indent = min(indent, len(line) - len(line.lstrip()))
         if strip_indent and 0 < indent < right:
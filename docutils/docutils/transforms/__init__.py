@@ -25,6 +25,7 @@
 
 
 from docutils import languages, ApplicationError, TransformSpec
+from docutils.utils import timing
 
 
 class TransformError(ApplicationError):
@@ -179,5 +180,7 @@ def apply_transforms(self):
                 self.sorted = True
             priority, transform_class, pending, kwargs = self.transforms.pop()
             transform = transform_class(self.document, startnode=pending)
-            transform.apply(**kwargs)
+            with timing.transform(self.document.settings,
+                                  priority, transform_class):
+                transform.apply(**kwargs)
             self.applied.append((priority, transform_class, pending, kwargs))
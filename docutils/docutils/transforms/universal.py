@@ -289,9 +289,11 @@ def apply(self):
             alternative = False
 
         document_language = self.document.settings.language_code
+        # do not modify the module-level defaults (thread-safety)
+        quotes = smartquotes.smartchars.quotes
         lc_smartquotes = self.document.settings.smartquotes_locales
         if lc_smartquotes:
-            smartquotes.smartchars.quotes.update(dict(lc_smartquotes))
+            quotes = {**quotes, **dict(lc_smartquotes)}
 
         # "Educate" quotes in normal text. Handle each block of text
         # (TextElement node) as a unit to keep context around inline nodes:
@@ -318,7 +320,7 @@ def apply(self):
                     lang += '-x-altquot'
             # drop unsupported subtags:
             for tag in utils.normalize_language_tag(lang):
-                if tag in smartquotes.smartchars.quotes:
+                if tag in quotes:
                     lang = tag
                     break
             else:  # language not supported -- keep ASCII quotes
@@ -333,7 +335,7 @@ def apply(self):
             # (see "utils/smartquotes.py" for the attribute setting)
             teacher = smartquotes.educate_tokens(
                 self.get_tokens(txtnodes),
-                attr=self.smartquotes_action, language=lang)
+                attr=self.smartquotes_action, language=lang, quotes=quotes)
 
             for txtnode, newtext in zip(txtnodes, teacher):
                 txtnode.parent.replace(txtnode, nodes.Text(newtext))
@@ -460,6 +460,9 @@ def new_document(source_path, settings=None):
         settings = frontend.get_default_settings()
     source_path = decode_path(source_path)
     reporter = new_reporter(source_path, settings)
+    timing_report = getattr(settings, '_timing', None)
+    if timing_report is not None:
+        reporter.attach_observer(timing_report.system_message)
     document = nodes.document(settings, reporter, source=source_path)
     document.note_source(source_path, -1)
     return document
@@ -0,0 +1,361 @@
+# $Id$
+# Copyright: This module has been placed in the public domain.
+
+"""
+Compact binary serialization of document trees.
+
+Store a (transformed) document tree, e.g. to process it later with
+several writers::
+
+    with open('doc.doctree', 'wb') as f:
+        binary_doctree.write(document, f)
+    ...
+    with open('doc.doctree', 'rb') as f:
+        data = f.read()
+    html = core.publish_from_doctree(data, writer_name='html5')
+
+The format stores the node classes, attributes, source and line of the
+elements, the text of the `nodes.Text` nodes, and the system messages
+not yet inserted into the tree (cf. `transforms.universal.Messages`).
+It does not store the other `nodes.document` bookkeeping attributes
+filled during parsing and transforming (footnote and citation lists,
+substitution definitions, ...); `load()` restores the `ids`, `nameids`,
+and `decoration` attributes needed by the writers.  `nodes.pending`
+elements and attribute values that are not strings, numbers, Booleans,
+None, lists or tuples cannot be stored.
+
+Loading does not import modules: node classes that are not defined in
+`docutils.nodes` must be subclasses of `nodes.Element` in a module
+imported by the application.  Still, like pickles, binary doctrees
+should not be loaded from untrusted sources.
+
+Format (version 1)
+==================
+
+All integers are unsigned LEB128 "varints".
+
+* header: the `magic` bytes and the format version (one byte),
+* string table: number of strings, then for each string the length of
+  its UTF-8 encoding and the encoded string.  The string table holds
+  node class names (the class name for classes in `docutils.nodes`,
+  "module:qualified_name" otherwise), attribute names, attribute
+  string values, and source paths,
+* text buffer: length and UTF-8 encoding of the concatenated text of all
+  `nodes.Text` nodes,
+* the node tree in document order.  A node starts with a code:
+  0 for a Text node (followed by the number of characters it takes from
+  the text buffer), string index + 1 for the class of an element,
+  followed by
+
+  - a flags field (1: line number follows, 2: source index follows),
+  - the number of attributes and (name index, value) pairs,
+  - the number of children and the children.
+
+  Values start with a type byte, cf. `_STR` to `_TUPLE`,
+* the number of pending system messages and the messages.
+"""
+
+__docformat__ = 'reStructuredText'
+
+import struct
+import sys
+
+import docutils
+from docutils import nodes, utils
+
+magic = b'\x89DTB'
+"""First bytes of the binary doctree format."""
+
+version = 1
+"""Format version written by `dumps()`."""
+
+# value types
+_STR, _INT, _NEGINT, _FLOAT, _TRUE, _FALSE, _NONE, _LIST, _TUPLE = range(9)
+
+_HAS_LINE, _HAS_SOURCE = 1, 2
+
+_double = struct.Struct('<d')
+
+
+class FormatError(docutils.DataError):
+    """Invalid binary doctree data."""
+
+
+def _varint(value, out):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def dumps(document):
+    """Return the binary representation of the document tree `document`.
+    """
+    strings = {}      # string -> index
+    texts = []
+    out = bytearray()
+
+    def string_index(string):
+        try:
+            return strings[string]
+        except KeyError:
+            index = strings[string] = len(strings)
+            return index
+
+    def class_name(cls):
+        if cls.__module__ == 'docutils.nodes':
+            return cls.__name__
+        return f'{cls.__module__}:{cls.__qualname__}'
+
+    def write_value(value):
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, str):
+            out.append(_STR)
+            _varint(string_index(value), out)
+        elif isinstance(value, int):
+            if value >= 0:
+                out.append(_INT)
+                _varint(value, out)
+            else:
+                out.append(_NEGINT)
+                _varint(-value, out)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out.extend(_double.pack(value))
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST if isinstance(value, list) else _TUPLE)
+            _varint(len(value), out)
+            for item in value:
+                write_value(item)
+        else:
+            raise TypeError('cannot serialize attribute value %r' % (value,))
+
+    def write_node(node):
+        if isinstance(node, nodes.Text):
+            out.append(0)
+            _varint(len(node), out)
+            texts.append(str(node))
+            return
+        if isinstance(node, nodes.pending):
+            raise TypeError('cannot serialize "pending" elements '
+                            '(apply the transforms first)')
+        _varint(string_index(class_name(node.__class__)) + 1, out)
+        flags = 0
+        if node.line is not None:
+            flags |= _HAS_LINE
+        if node.source is not None:
+            flags |= _HAS_SOURCE
+        out.append(flags)
+        if node.line is not None:
+            _varint(node.line, out)
+        if node.source is not None:
+            _varint(string_index(node.source), out)
+        attributes = [(key, value) for key, value in node.attributes.items()
+                      if value != [] or key not in node.list_attributes]
+        _varint(len(attributes), out)
+        for key, value in attributes:
+            _varint(string_index(key), out)
+            write_value(value)
+        _varint(len(node.children), out)
+        for child in node.children:
+            write_node(child)
+
+    write_node(document)
+    messages = [msg for msg in document.transform_messages
+                if msg.parent is None]
+    _varint(len(messages), out)
+    for message in messages:
+        write_node(message)
+
+    header = bytearray(magic)
+    header.append(version)
+    _varint(len(strings), header)
+    for string in strings:
+        encoded = string.encode('utf-8', 'surrogatepass')
+        _varint(len(encoded), header)
+        header += encoded
+    text = ''.join(texts).encode('utf-8', 'surrogatepass')
+    _varint(len(text), header)
+    header += text
+    return bytes(header + out)
+
+
+def write(document, stream):
+    """Write the binary representation of `document` to `stream`
+    (a binary file-like object)."""
+    stream.write(dumps(document))
+
+
+def _resolve_class(name):
+    if ':' not in name:
+        cls = getattr(nodes, name, None)
+    else:
+        # Look up classes in imported modules only (no code execution).
+        module_name, qualname = name.split(':', 1)
+        cls = sys.modules.get(module_name)
+        for part in qualname.split('.'):
+            cls = getattr(cls, part, None)
+    if not (isinstance(cls, type) and issubclass(cls, nodes.Element)):
+        raise FormatError(f'unknown node class "{name}"')
+    return cls
+
+
+def loads(data, settings=None):
+    """
+    Return the document tree stored in `data` (bytes).
+
+    If `settings` are given, also set up a reporter for the document.
+    """
+    data = bytes(data)
+    if data[:len(magic)] != magic or len(data) == len(magic):
+        raise FormatError('not a binary doctree (invalid header)')
+    if data[len(magic)] != version:
+        raise FormatError(f'unsupported binary doctree version '
+                          f'{data[len(magic)]}')
+    pos = len(magic) + 1
+
+    def varint():
+        nonlocal pos
+        result = data[pos]
+        pos += 1
+        if result < 0x80:
+            return result
+        result &= 0x7f
+        shift = 7
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    try:
+        strings = []
+        for i in range(varint()):
+            length = varint()
+            strings.append(
+                data[pos:pos+length].decode('utf-8', 'surrogatepass'))
+            pos += length
+        length = varint()
+        text = data[pos:pos+length].decode('utf-8', 'surrogatepass')
+        pos += length
+    except (IndexError, UnicodeError) as error:
+        raise FormatError(f'corrupt binary doctree ({error})')
+
+    classes = {}
+    text_pos = 0
+    Text = nodes.Text
+    Attributes = nodes._Attributes
+
+    def read_value():
+        nonlocal pos
+        kind = data[pos]
+        pos += 1
+        if kind == _STR:
+            return strings[varint()]
+        if kind == _INT:
+            return varint()
+        if kind == _NEGINT:
+            return -varint()
+        if kind == _NONE:
+            return None
+        if kind == _TRUE:
+            return True
+        if kind == _FALSE:
+            return False
+        if kind == _FLOAT:
+            pos += 8
+            return _double.unpack_from(data, pos - 8)[0]
+        if kind == _LIST:
+            return [read_value() for i in range(varint())]
+        if kind == _TUPLE:
+            return tuple(read_value() for i in range(varint()))
+        raise FormatError(f'unknown value type {kind}')
+
+    def read_node(parent):
+        nonlocal pos, text_pos
+        code = data[pos]
+        pos += 1
+        if code > 0x7f:
+            pos -= 1
+            code = varint()
+        if code == 0:
+            length = varint()
+            node = Text(text[text_pos:text_pos+length])
+            text_pos += length
+            node.parent = parent
+            return node
+        try:
+            cls = classes[code]
+        except KeyError:
+            cls = classes[code] = _resolve_class(strings[code-1])
+        # Bypass the constructor (like `pickle`):
+        node = cls.__new__(cls)
+        node.rawsource = ''
+        node.attributes = attributes = Attributes(cls.list_attributes)
+        if cls.tagname is None:
+            node.tagname = cls.__name__
+        node.parent = parent
+        flags = data[pos]
+        pos += 1
+        if flags & _HAS_LINE:
+            node.line = varint()
+        if flags & _HAS_SOURCE:
+            node.source = strings[varint()]
+        count = data[pos]
+        pos += 1
+        if count:
+            pos -= 1
+            for i in range(varint()):
+                key = strings[varint()]
+                attributes[key] = read_value()
+            if 'ids' in attributes or 'names' in attributes:
+                targets.append(node)
+        count = data[pos]
+        pos += 1
+        if count > 0x7f:
+            pos -= 1
+            count = varint()
+        node.children = [read_node(node) for i in range(count)]
+        return node
+
+    targets = []      # elements with "ids" or "names", in document order
+    try:
+        document = read_node(None)
+        messages = [read_node(None) for i in range(varint())]
+    except (IndexError, UnicodeError, struct.error) as error:
+        raise FormatError(f'corrupt binary doctree ({error})')
+    if pos != len(data) or not isinstance(document, nodes.document):
+        raise FormatError('corrupt binary doctree')
+
+    # set up the document attributes
+    reporter = None
+    if settings is not None:
+        reporter = utils.new_reporter(document.get('source', ''), settings)
+    attributes, children = document.attributes, document.children
+    nodes.document.__init__(document, settings, reporter)
+    document.attributes = attributes
+    document.children = children
+    document.transform_messages = messages
+    for node in targets:
+        ids = node.attributes.get('ids', [])
+        for id in ids:
+            document.ids.setdefault(id, node)
+        for name in node.attributes.get('names', ()):
+            document.nameids.setdefault(name, ids[0] if ids else None)
+    for node in children:
+        if isinstance(node, nodes.decoration):
+            document.decoration = node
+    return document
+
+
+def load(stream, settings=None):
+    """Return the document tree read from `stream` (a binary file-like
+    object), cf. `loads()`."""
+    return loads(stream.read(), settings)
@@ -5,13 +5,32 @@
 """Lexical analysis of formal languages (i.e. code) using Pygments."""
 
 from docutils import ApplicationError
-try:
-    import pygments
-    from pygments.lexers import get_lexer_by_name
-    from pygments.formatters.html import _get_ttype_class
-    with_pygments = True
-except ImportError:
-    with_pygments = False
+
+# Pygments is imported on first use (it takes longer to import than
+# all of the reStructuredText parser), cf. `_import_pygments()`.
+_pygments = None
+
+
+def _import_pygments():
+    """Return the `pygments` module (False, if it is not installed)."""
+    global _pygments
+    if _pygments is None:
+        try:
+            import pygments
+            import pygments.lexers
+            import pygments.formatters.html
+            _pygments = pygments
+        except ImportError:
+            _pygments = False
+    return _pygments
+
+
+def __getattr__(name):
+    # `with_pygments` is computed on first access
+    if name == 'with_pygments':
+        return bool(_import_pygments())
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 # Filter the following token types from the list of class arguments:
 unstyled_tokens = ['token',  # Token (base token type)
@@ -55,11 +74,12 @@ def __init__(self, code, language, tokennames='short'):
         # get lexical analyzer for `language`:
         if language in ('', 'text') or tokennames == 'none':
             return
-        if not with_pygments:
+        pygments = _import_pygments()
+        if not pygments:
             raise LexerError('Cannot analyze code. '
                              'Pygments package not found.')
         try:
-            self.lexer = get_lexer_by_name(self.language)
+            self.lexer = pygments.lexers.get_lexer_by_name(self.language)
         except pygments.util.ClassNotFound:
             raise LexerError('Cannot analyze code. '
                              'No Pygments lexer found for "%s".' % language)
@@ -95,12 +115,13 @@ def __iter__(self):
         if self.lexer is None:
             yield [], self.code
             return
-        tokens = pygments.lex(self.code, self.lexer)
+        tokens = _pygments.lex(self.code, self.lexer)
+        get_ttype_class = _pygments.formatters.html._get_ttype_class
         for tokentype, value in self.merge(tokens):
             if self.tokennames == 'long':  # long CSS class args
                 classes = str(tokentype).lower().split('.')
             else:  # short CSS class args
-                classes = [_get_ttype_class(tokentype)]
+                classes = [get_ttype_class(tokentype)]
             classes = [cls for cls in classes if cls not in unstyled_tokens]
             yield classes, value
 
@@ -0,0 +1,239 @@
+# $Id$
+# Copyright: This module has been placed in the public domain.
+
+"""
+Persistent cache of parsed document trees.
+
+The cache stores the document tree returned by the Reader (before the
+transforms are applied) together with the transforms registered during
+parsing and the recorded dependencies (included files, CSV data, ...).
+
+Entries are keyed by a hash of the source text, the source path, the
+Reader and Parser classes, the runtime settings and the Docutils version.
+An entry is invalid if one of its dependencies changed since it was
+stored.  If the total size of the cache exceeds a limit, the least
+recently used entries are removed.
+
+Cf. the doctree_cache_dir__ and doctree_cache_size__ settings.
+
+__ https://docutils.sourceforge.io/docs/user/config.html#doctree-cache-dir
+__ https://docutils.sourceforge.io/docs/user/config.html#doctree-cache-size
+"""
+
+__docformat__ = 'reStructuredText'
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import docutils
+
+ignored_settings = {'_config_files', '_destination', 'output',
+                    'record_dependencies', 'warning_stream',
+                    'doctree_cache_dir', 'doctree_cache_size',
+                    'timing_report', '_timing'}
+"""Settings that do not affect the result of parsing."""
+
+suffix = '.doctree'
+"""File name extension of cache entries."""
+
+
+class DoctreeCache:
+
+    """
+    A directory of pickled document trees.
+
+    Usage::
+
+        cache = DoctreeCache.get(settings.doctree_cache_dir)
+        key = cache.key(text, source_path, settings, (reader, parser))
+        entry = cache.load(key)
+        if entry is None:
+            ...  # parse
+            cache.store(key, {'document': document, ...})
+
+    The size and age of the entries are read from the directory once
+    and then tracked in memory (changes by other processes are noticed
+    by the next instance only).
+    """
+
+    instances = {}
+    """Absolute directory path -> shared `DoctreeCache` (cf. `get()`)."""
+
+    def __init__(self, directory, max_size=100):
+        self.directory = directory
+        """Path of the cache directory."""
+
+        self.max_size = max_size * 2**20
+        """Maximal size of all entries in bytes (`max_size` is in MiB)."""
+
+        self._entries = None
+        """Path -> (mtime [ns], size) of all entries (cf. `_scan()`)."""
+
+        self._total = 0
+        """Total size of all entries in bytes."""
+
+    @classmethod
+    def get(cls, directory, max_size=100):
+        """Return the shared instance for `directory`.
+
+        Use this when processing many documents (e.g. with buildhtml.py),
+        so that the cache directory is scanned only once.
+        """
+        path = os.path.abspath(directory)
+        cache = cls.instances.get(path)
+        if cache is None:
+            cache = cls.instances[path] = cls(directory, max_size)
+        cache.max_size = max_size * 2**20
+        return cache
+
+    def key(self, text, source_path, settings, components=()):
+        """Return the key for parsing `text` with `settings`.
+
+        `components` is a sequence of objects whose classes affect the
+        parsing result (i.e. Reader and Parser).
+        """
+        hash = hashlib.sha256()
+        for component in components:
+            hash.update(('%s.%s\0' % (component.__class__.__module__,
+                                      component.__class__.__qualname__)
+                         ).encode())
+        hash.update(('%s\0%s\0%r\0' % (docutils.__version__,
+                                       sys.version_info[:2],
+                                       source_path)).encode())
+        for name, value in sorted(settings.__dict__.items()):
+            if name in ignored_settings:
+                continue
+            if isinstance(value, (str, int, float, type(None),
+                                  list, tuple, dict)):
+                hash.update(('%s=%r\0' % (name, value)).encode(
+                                'utf-8', 'surrogatepass'))
+            else:
+                hash.update(('%s:%s\0' % (name, type(value).__name__)
+                             ).encode())
+        hash.update(text.encode('utf-8', 'surrogatepass'))
+        return hash.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + suffix)
+
+    def load(self, key):
+        """Return the entry stored under `key` or None.
+
+        An entry is a dictionary with the keys
+
+        :document:     the document tree (without settings, reporter,
+                       and transformer),
+        :transforms:   the transforms registered during parsing,
+        :serialno:     the transformer's serial number after parsing,
+        :max_level:    the highest system message level during parsing,
+        :dependencies: the list of recorded dependencies.
+
+        Entries with changed dependencies are removed.
+        """
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                dependencies = pickle.load(f)
+                if not self._valid(dependencies):
+                    entry = None
+                else:
+                    entry = pickle.load(f)
+        except OSError:
+            return None
+        except Exception:  # corrupt entry or incompatible Python objects
+            entry = None
+        if entry is None:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)      # mark as recently used
+        except OSError:
+            pass
+        if self._entries is not None and path in self._entries:
+            self._entries[path] = (time.time_ns(), self._entries[path][1])
+        return entry
+
+    def store(self, key, entry):
+        """Store `entry` (see `load()`) under `key`.
+
+        Silently ignore entries that cannot be pickled.
+        Remove least recently used entries if the cache grows too large.
+        """
+        dependencies = [(path, *self._stat(path))
+                        for path in entry['dependencies']]
+        try:
+            data = (pickle.dumps(dependencies, pickle.HIGHEST_PROTOCOL)
+                    + pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+        except Exception:  # unpicklable objects in the doctree
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp',
+                                            dir=self.directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            path = self.path(key)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        if self._entries is None:
+            self._scan()
+        self._forget(path)
+        self._entries[path] = (time.time_ns(), len(data))
+        self._total += len(data)
+        if self._total > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries exceeding `self.max_size`."""
+        if self._entries is None:
+            self._scan()
+        for path, (mtime, size) in sorted(self._entries.items(),
+                                          key=lambda item: item[1]):
+            if self._total <= self.max_size:
+                break
+            self._remove(path)
+
+    def _scan(self):
+        """Read the modification time and size of all entries."""
+        self._entries = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for dir_entry in it:
+                    if not dir_entry.name.endswith(suffix):
+                        continue
+                    try:
+                        stat = dir_entry.stat()
+                    except OSError:
+                        continue
+                    self._entries[dir_entry.path] = (stat.st_mtime_ns,
+                                                     stat.st_size)
+        except OSError:
+            pass
+        self._total = sum(size for mtime, size in self._entries.values())
+
+    def _forget(self, path):
+        if self._entries is not None and path in self._entries:
+            self._total -= self._entries.pop(path)[1]
+
+    def _stat(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _valid(self, dependencies):
+        return all(self._stat(path) == (mtime, size)
+                   for path, mtime, size in dependencies)
+
+    def _remove(self, path):
+        self._forget(path)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,264 @@
+# $Id$
+# Copyright: This module has been placed in the public domain.
+
+"""
+Image size detection and a shared cache of image information.
+
+`read_size()` determines the size of PNG, GIF, JPEG, and SVG images
+from the file header, without the Python Imaging Library (PIL).
+Other formats are handed to PIL (if it is installed).
+
+`ImageInfoCache` stores image sizes, content digests, and "data:" URIs
+of embedded images.
+Entries are keyed by the resolved path, the modification time, and the
+size of the image file.  The writers use the shared instance `cache`,
+so an image used many times (e.g. a logo or icon) is read only once per
+process, also when converting many documents (e.g. with buildhtml.py).
+Image sizes can be stored in a file for use in later runs::
+
+    image_info.cache = image_info.ImageInfoCache('image-sizes.json')
+    ...
+    image_info.cache.save()
+"""
+
+__docformat__ = 'reStructuredText'
+
+import base64
+import hashlib
+from io import BytesIO
+import os
+import re
+import struct
+
+# The Python Imaging Library is imported on first use, cf. `_import_PIL()`.
+_PIL = False
+
+
+def _import_PIL():
+    """Return the `PIL` package (None, if it is not installed)."""
+    global _PIL
+    if _PIL is False:
+        try:  # check for the Python Imaging Library
+            import PIL.Image
+        except ImportError:
+            try:  # sometimes PIL modules are put in PYTHONPATH's root
+                import Image
+                class PIL: pass  # noqa:E701  dummy wrapper
+                PIL.Image = Image
+            except ImportError:
+                PIL = None
+        _PIL = PIL
+    return _PIL
+
+
+# SVG length units in CSS pixels:
+_svg_units = {'': 1, 'px': 1, 'in': 96, 'cm': 96/2.54, 'mm': 96/25.4,
+              'pt': 96/72, 'pc': 16}
+
+_svg_start = re.compile(rb'\s*(?:<\?.*?\?>\s*|<!--.*?-->\s*'
+                        rb'|<!DOCTYPE[^>\[]*(?:\[.*?\])?\s*>\s*)*'
+                        rb'<(?:[\w.-]+:)?svg\b([^>]*)>', re.DOTALL)
+_svg_length = re.compile(r'(?<![\w:.-])(width|height)\s*=\s*'
+                         r'(["\'])\s*([0-9.]+(?:[eE][-+]?[0-9]+)?)'
+                         r'\s*([a-z]*)\s*\2')
+
+
+def read_size(stream):
+    """Return the size (width, height) in pixels of the image in `stream`.
+
+    `stream` is a binary file-like object supporting `seek()`.
+    Only the file header is read.  Supports PNG, GIF, JPEG, and SVG
+    (if the root element has absolute "width" and "height" attributes).
+    Return None for other or invalid images.
+    """
+    header = stream.read(32)
+    try:
+        if header[:8] == b'\x89PNG\r\n\x1a\n' and header[12:16] == b'IHDR':
+            return struct.unpack('>II', header[16:24])
+        if header[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', header[6:10])
+        if header.startswith(b'\xff\xd8'):
+            return _jpeg_size(stream)
+    except (struct.error, IndexError):  # truncated file
+        return None
+    if header.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'<'):
+        return _svg_size(header + stream.read(2**16))
+    return None
+
+
+def data_size(data):
+    """Return the size (width, height) in pixels of the image `data`.
+
+    Like `read_size()` but for image data (bytes).  Hand formats not
+    supported by `read_size()` to PIL (if it is installed).
+    """
+    size = read_size(BytesIO(data))
+    if size is None:
+        size = _PIL_size(BytesIO(data))
+    return size
+
+
+def _PIL_size(source):
+    # `source` may be a path or a binary file-like object
+    PIL = _import_PIL()
+    if PIL is None:
+        return None
+    try:
+        with PIL.Image.open(source) as img:
+            return img.size
+    except OSError:  # not an image or unsupported format
+        return None
+
+
+def _jpeg_size(stream):
+    # Scan the segments for a "start of frame" marker.
+    stream.seek(2)
+    while True:
+        marker = stream.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        while code == 0xFF:  # fill bytes
+            code = stream.read(1)[0]
+        if code == 0x01 or 0xD0 <= code <= 0xD8:  # no segment data
+            continue
+        length = struct.unpack('>H', stream.read(2))[0]
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>xHH', stream.read(5))
+            return width, height
+        stream.seek(length - 2, os.SEEK_CUR)
+
+
+def _svg_size(data):
+    match = _svg_start.match(data.lstrip(b'\xef\xbb\xbf'))
+    if not match:
+        return None
+    lengths = {}
+    for name, quote, value, unit in _svg_length.findall(
+            match.group(1).decode('utf-8', 'replace')):
+        if unit not in _svg_units:
+            return None  # relative length
+        lengths[name] = float(value) * _svg_units[unit]
+    if len(lengths) < 2:
+        return None
+    return lengths['width'], lengths['height']
+
+
+class ImageInfoCache:
+
+    """Cache of image sizes, content digests, and "data:" URIs.
+
+    If `path` is given, load the image sizes stored in this file
+    (cf. `save()`).  "data:" URIs are kept in memory only, up to a total
+    size of `max_data_size` characters.
+    """
+
+    def __init__(self, path=None, max_data_size=2**25):
+        self.path = path
+        self.max_data_size = max_data_size
+        self.sizes = {}
+        """Resolved path -> (mtime [ns], file size, image size or None)."""
+        self.digests = {}
+        """Resolved path -> (mtime [ns], file size, SHA-256 hex digest)."""
+        self.data_uris = {}
+        """(Resolved path, mtime, file size, MIME type) -> "data:" URI."""
+        self._data_size = 0
+        if path is not None:
+            self.load()
+
+    def image_size(self, path):
+        """Return the size (width, height) in pixels of image file `path`.
+
+        Return None if the size cannot be determined.
+        Raise OSError if the file cannot be read.
+        """
+        realpath, mtime, file_size = self._key(path)
+        try:
+            entry = self.sizes[realpath]
+        except KeyError:
+            entry = None
+        if entry is None or entry[:2] != (mtime, file_size):
+            with open(path, 'rb') as stream:
+                size = read_size(stream)
+            if size is None:
+                size = _PIL_size(path)
+            entry = self.sizes[realpath] = (mtime, file_size, size)
+        return entry[2]
+
+    def digest(self, path):
+        """Return the SHA-256 hex digest of the content of file `path`.
+
+        Used to detect identical images with different paths.
+        Raise OSError if the file cannot be read.
+        """
+        realpath, mtime, file_size = self._key(path)
+        entry = self.digests.get(realpath)
+        if entry is None or entry[:2] != (mtime, file_size):
+            sha = hashlib.sha256()
+            with open(path, 'rb') as imagefile:
+                for chunk in iter(lambda: imagefile.read(2**16), b''):
+                    sha.update(chunk)
+            entry = self.digests[realpath] = (mtime, file_size,
+                                              sha.hexdigest())
+        return entry[2]
+
+    def data_uri(self, path, mimetype):
+        """Return a "data:" URI with the content of the file `path`.
+
+        Raise OSError if the file cannot be read.
+        """
+        key = (*self._key(path), mimetype)
+        try:
+            return self.data_uris[key]
+        except KeyError:
+            pass
+        with open(path, 'rb') as imagefile:
+            data64 = base64.b64encode(imagefile.read()).decode()
+        uri = 'data:%s;base64,%s' % (mimetype, data64)
+        # remove the oldest entries if the cache gets too large
+        while self.data_uris and (self._data_size + len(uri)
+                                  > self.max_data_size):
+            self._data_size -= len(self.data_uris.pop(
+                                       next(iter(self.data_uris))))
+        if len(uri) <= self.max_data_size:
+            self.data_uris[key] = uri
+            self._data_size += len(uri)
+        return uri
+
+    def clear(self):
+        """Remove all entries."""
+        self.sizes.clear()
+        self.digests.clear()
+        self.data_uris.clear()
+        self._data_size = 0
+
+    def load(self, path=None):
+        """Add the image sizes stored in the file `path` (default:
+        `self.path`).  Ignore missing or invalid files."""
+        import json
+        try:
+            with open(path or self.path, encoding='utf-8') as f:
+                stored = json.load(f)
+            for realpath, (mtime, file_size, size) in stored.items():
+                self.sizes[realpath] = (mtime, file_size,
+                                        size and tuple(size))
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def save(self, path=None):
+        """Store the image sizes in the file `path` (default: `self.path`).
+        """
+        import json
+        path = path or self.path
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.sizes, f)
+        os.replace(path + '.tmp', path)
+
+    @staticmethod
+    def _key(path):
+        stat = os.stat(path)
+        return os.path.realpath(path), stat.st_mtime_ns, stat.st_size
+
+
+cache = ImageInfoCache()
+"""Image information cache shared by the Docutils components."""
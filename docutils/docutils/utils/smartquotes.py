@@ -496,11 +496,18 @@ class smartchars:
         'zh-tw':        '「」『』',
         }
 
-    def __init__(self, language='en'):
+    def __init__(self, language='en', quotes=None):
+        """Set the quote characters for `language`.
+
+        `quotes` is a mapping of language tags to quote characters
+        that replaces the class attribute `smartchars.quotes`.
+        """
         self.language = language
+        if quotes is None:
+            quotes = self.quotes
         try:
             (self.opquote, self.cpquote,
-             self.osquote, self.csquote) = self.quotes[language.lower()]
+             self.osquote, self.csquote) = quotes[language.lower()]
         except KeyError:
             self.opquote, self.cpquote, self.osquote, self.csquote = '""\'\''
 
@@ -514,8 +521,12 @@ def smartyPants(text, attr=default_smartypants_attr, language='en'):
     return "".join(t for t in educate_tokens(tokenize(text), attr, language))
 
 
-def educate_tokens(text_tokens, attr=default_smartypants_attr, language='en'):
-    """Return iterator that "educates" the items of `text_tokens`."""
+def educate_tokens(text_tokens, attr=default_smartypants_attr, language='en',
+                   quotes=None):
+    """Return iterator that "educates" the items of `text_tokens`.
+
+    `quotes` is passed to `smartchars` (default: `smartchars.quotes`).
+    """
     # Parse attributes:
     # 0 : do nothing
     # 1 : set all
@@ -605,19 +616,19 @@ def educate_tokens(text_tokens, attr=default_smartypants_attr, language='en'):
 
         # Note: backticks need to be processed before quotes.
         if do_backticks:
-            text = educateBackticks(text, language)
+            text = educateBackticks(text, language, quotes)
 
         if do_backticks == 2:
-            text = educateSingleBackticks(text, language)
+            text = educateSingleBackticks(text, language, quotes)
 
         if do_quotes:
             # Replace plain quotes in context to prevent conversion to
             # 2-character sequence in French.
             context = prev_token_last_char.replace('"', ';').replace("'", ';')
-            text = educateQuotes(context+text, language)[1:]
+            text = educateQuotes(context+text, language, quotes)[1:]
 
         if do_stupefy:
-            text = stupefyEntities(text, language)
+            text = stupefyEntities(text, language, quotes)
 
         # Remember last char as context for the next token
         prev_token_last_char = last_char
@@ -627,7 +638,7 @@ def educate_tokens(text_tokens, attr=default_smartypants_attr, language='en'):
         yield text
 
 
-def educateQuotes(text, language='en'):
+def educateQuotes(text, language='en', quotes=None):
     """
     Parameter:  - text string (unicode or bytes).
                 - language (`BCP 47` language tag.)
@@ -637,7 +648,7 @@ def educateQuotes(text, language='en'):
     Example output: “Isn’t this fun?“;
     """
 
-    smart = smartchars(language)
+    smart = smartchars(language, quotes)
     ch_classes = {'open': '[([{]',    # opening braces
                   'close': r'[^\s]',  # everything except whitespace
                   'punct': r"""[-!" #\$\%'()*+,.\/:;<=>?\@\[\\\]\^_`{|}~]""",
@@ -722,7 +733,7 @@ def educateQuotes(text, language='en'):
     return text
 
 
-def educateBackticks(text, language='en'):
+def educateBackticks(text, language='en', quotes=None):
     """
     Parameter:  String (unicode or bytes).
     Returns:    The `text`, with ``backticks'' -style double quotes
@@ -730,14 +741,14 @@ def educateBackticks(text, language='en'):
     Example input:  ``Isn't this fun?''
     Example output: “Isn't this fun?“;
     """
-    smart = smartchars(language)
+    smart = smartchars(language, quotes)
 
     text = text.replace(r'``', smart.opquote)
     text = text.replace(r"''", smart.cpquote)
     return text
 
 
-def educateSingleBackticks(text, language='en'):
+def educateSingleBackticks(text, language='en', quotes=None):
     """
     Parameter:  String (unicode or bytes).
     Returns:    The `text`, with `backticks' -style single quotes
@@ -746,7 +757,7 @@ def educateSingleBackticks(text, language='en'):
     Example input:  `Isn't this fun?'
     Example output: ‘Isn’t this fun?’
     """
-    smart = smartchars(language)
+    smart = smartchars(language, quotes)
 
     text = text.replace(r'`', smart.osquote)
     text = text.replace(r"'", smart.csquote)
@@ -812,7 +823,7 @@ def educateEllipses(text):
     return text
 
 
-def stupefyEntities(text, language='en'):
+def stupefyEntities(text, language='en', quotes=None):
     """
     Parameter:  String (unicode or bytes).
     Returns:    The `text`, with each SmartyPants character translated to
@@ -821,7 +832,7 @@ def stupefyEntities(text, language='en'):
     Example input:  “Hello — world.”
     Example output: "Hello -- world."
     """
-    smart = smartchars(language)
+    smart = smartchars(language, quotes)
 
     text = text.replace(smart.endash, "-")
     text = text.replace(smart.emdash, "--")
@@ -0,0 +1,140 @@
+# $Id$
+# Copyright: This module has been placed in the public domain.
+
+"""
+Timing and counter statistics of the processing of a document.
+
+Instrumentation is opt-in: it is active if a `TimingReport` instance is
+stored in the private runtime setting ``_timing``.  `core.Publisher`
+does this if its `timing` attribute is set or the timing_report__
+setting is specified.
+
+The module-level functions `phase()`, `transform()`, and `directive()`
+return context managers that record the time spent in a processing step
+if instrumentation is active and do nothing otherwise.
+
+__ https://docutils.sourceforge.io/docs/user/config.html#timing-report
+"""
+
+__docformat__ = 'reStructuredText'
+
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+import time
+
+
+class TimingReport:
+
+    """
+    Wall-clock and CPU time of the processing phases and transforms,
+    the directives executed, and the number of nodes and system messages.
+
+    All times are in seconds.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        """Mapping of processing phase names to dictionaries with the keys
+        "wall" and "cpu" (in the order of execution)."""
+
+        self.transforms = []
+        """Applied transforms: list of dictionaries with the keys
+        "priority", "transform", "wall", and "cpu"."""
+
+        self.directives = {}
+        """Mapping of directive names to dictionaries with the keys
+        "count", "wall", and "cpu".  Times include nested directives."""
+
+        self.nodes = {}
+        """Mapping of phase names to `Counter` instances with the number
+        of nodes per node class in the document tree after this phase."""
+
+        self.system_messages = Counter()
+        """Number of system messages per type ("WARNING", ...)."""
+
+    @contextmanager
+    def _measure(self, record):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall'] += time.perf_counter() - wall
+            record['cpu'] += time.process_time() - cpu
+
+    def phase(self, name):
+        """Return a context manager timing the processing phase `name`."""
+        record = self.phases.setdefault(name, {'wall': 0.0, 'cpu': 0.0})
+        return self._measure(record)
+
+    def transform(self, priority, transform_class):
+        """Return a context manager timing a transform."""
+        record = {'priority': priority,
+                  'transform': '%s.%s' % (transform_class.__module__,
+                                          transform_class.__name__),
+                  'wall': 0.0, 'cpu': 0.0}
+        self.transforms.append(record)
+        return self._measure(record)
+
+    def directive(self, name):
+        """Return a context manager timing the directive `name`."""
+        record = self.directives.setdefault(
+                     name.lower(), {'count': 0, 'wall': 0.0, 'cpu': 0.0})
+        record['count'] += 1
+        return self._measure(record)
+
+    def count_nodes(self, name, document):
+        """Count the nodes in `document` after the phase `name`."""
+        self.nodes[name] = Counter(node.__class__.__name__
+                                   for node in document.findall())
+
+    def system_message(self, message):
+        """Count `message` (a `nodes.system_message`).
+
+        Attach this method as observer to the document's reporter.
+        """
+        self.system_messages[message['type']] += 1
+
+    def as_dict(self):
+        """Return the statistics as dictionary of JSON-compatible values.
+        """
+        return {'phases': self.phases,
+                'transforms': self.transforms,
+                'directives': self.directives,
+                'nodes': {name: dict(sorted(counter.items()))
+                          for name, counter in self.nodes.items()},
+                'system_messages': dict(self.system_messages)}
+
+    def write(self, path):
+        """Write the statistics as JSON to the file `path`."""
+        import json
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+
+def get_report(settings):
+    """Return the `TimingReport` stored in `settings` or None."""
+    return getattr(settings, '_timing', None)
+
+
+def phase(settings, name):
+    """Time the processing phase `name` if instrumentation is active."""
+    report = get_report(settings)
+    if report is None:
+        return nullcontext()
+    return report.phase(name)
+
+
+def transform(settings, priority, transform_class):
+    """Time a transform if instrumentation is active."""
+    report = get_report(settings)
+    if report is None:
+        return nullcontext()
+    return report.transform(priority, transform_class)
+
+
+def directive(settings, name):
+    """Time the directive `name` if instrumentation is active."""
+    report = get_report(settings)
+    if report is None:
+        return nullcontext()
+    return report.directive(name)
@@ -13,6 +13,7 @@
 import docutils
 from docutils import languages, Component
 from docutils.transforms import universal
+from docutils.utils import timing
 
 
 class Writer(Component):
@@ -77,8 +78,10 @@ def write(self, document, destination):
             document.settings.language_code,
             document.reporter)
         self.destination = destination
-        self.translate()
-        return self.destination.write(self.output)
+        with timing.phase(document.settings, 'translate'):
+            self.translate()
+        with timing.phase(document.settings, 'write'):
+            return self.destination.write(self.output)
 
     def translate(self):
         """
@@ -16,22 +16,21 @@
 
 """common definitions for Docutils HTML writers"""
 
-import base64
 import mimetypes
 import os
 import os.path
 import re
-from urllib.request import unquote as unquote_url
-from urllib.request import url2pathname  # unquote and use local path sep
+from urllib.parse import unquote as unquote_url
 import warnings
 
 import docutils
-from docutils import frontend, languages, nodes, utils, writers
+from docutils import frontend, io, languages, nodes, utils, writers
+from docutils.utils import image_info, timing
 from docutils.parsers.rst.directives import length_or_percentage_or_unitless
-from docutils.parsers.rst.directives.images import PIL
 from docutils.transforms import writer_aux
-from docutils.utils.math import (unichar2tex, pick_math_environment,
-                                 math2html, latex2mathml, tex2mathml_extern)
+from docutils.utils.math import pick_math_environment
+# The math conversion modules and `urllib.request` are imported on first use
+# (in `visit_math()` and `visit_image()`) to keep the start-up time low.
 
 
 class Writer(writers.Writer):
@@ -129,6 +128,15 @@ class Writer(writers.Writer):
           'keeping email links usable with standards-compliant browsers.',
           ['--cloak-email-addresses'],
           {'action': 'store_true', 'validator': frontend.validate_boolean}),
+         ('Write the document body to the output file in chunks (buffered '
+          'in a temporary file) instead of assembling the complete output '
+          'in memory. Ignored unless the output is written to a file.',
+          ['--stream-output'],
+          {'default': False, 'action': 'store_true',
+           'validator': frontend.validate_boolean}),
+         ('Assemble the complete output in memory. (default)',
+          ['--no-stream-output'],
+          {'dest': 'stream_output', 'action': 'store_false'}),
          )
         )
 
@@ -144,11 +152,60 @@ class Writer(writers.Writer):
         'html_prolog', 'html_head', 'html_title', 'html_subtitle',
         'html_body')
 
+    streamed_parts = ('whole', 'body', 'fragment', 'html_body')
+    """Parts that are not available (None) after streaming output."""
+
+    spool = None
+    """Temporary file for the document body (only with streaming output).
+    """
+
     def get_transforms(self):
         return super().get_transforms() + [writer_aux.Admonitions]
 
+    def write(self, document, destination):
+        """Translate `document` and write it to `destination`.
+
+        With the stream_output__ setting and a `io.FileOutput`
+        destination, the document body is buffered in a temporary file
+        and copied to `destination` in chunks. Return None in this case.
+
+        __ https://docutils.sourceforge.io/docs/user/config.html
+           #stream-output
+        """
+        if not (getattr(document.settings, 'stream_output', False)
+                and isinstance(destination, io.FileOutput)):
+            self.spool = None
+            return super().write(document, destination)
+        self.document = document
+        self.language = languages.get_language(
+            document.settings.language_code,
+            document.reporter)
+        self.destination = destination
+        import tempfile
+        with tempfile.TemporaryFile('w+', encoding='utf-8',
+                                    newline='') as self.spool:
+            with timing.phase(document.settings, 'translate'):
+                self.translate()
+            with timing.phase(document.settings, 'write'):
+                self.destination.write_chunks(self.stream_chunks())
+        self.output = None
+        return None
+
+    def stream_chunks(self, size=2**16):
+        """Generate the output, replacing spool markers with the spool.
+        """
+        marker = self.visitor.spool_marker
+        pieces = self.output.split(marker)
+        yield pieces[0]
+        for piece in pieces[1:]:
+            self.spool.seek(0)
+            while chunk := self.spool.read(size):
+                yield chunk
+            yield piece
+
     def translate(self):
         self.visitor = visitor = self.translator_class(self.document)
+        visitor.spool = self.spool
         self.document.walkabout(visitor)
         for attr in self.visitor_attributes:
             setattr(self, attr, getattr(visitor, attr))
@@ -173,6 +230,9 @@ def assemble_parts(self):
         writers.Writer.assemble_parts(self)
         for part in self.visitor_attributes:
             self.parts[part] = ''.join(getattr(self, part))
+        if self.spool is not None:
+            for part in self.streamed_parts:
+                self.parts[part] = None
 
 
 class HTMLTranslator(nodes.NodeVisitor):
@@ -270,6 +330,9 @@ def depart_example(self, node):
     in_word_wrap_point = re.compile(r'.+\W\W.+|[-?].+')
     lang_attribute = 'lang'  # name changes to 'xml:lang' in XHTML 1.1
 
+    spool_threshold = 1000
+    """Number of `body` items that triggers writing to `spool`."""
+
     special_characters = {ord('&'): '&amp;',
                           ord('<'): '&lt;',
                           ord('"'): '&quot;',
@@ -356,6 +419,38 @@ def __init__(self, document):
         self.in_mailto = False
         self.author_in_authors = False  # for html4css1
         self.math_header = []
+        self.spool = None
+        """Text file for body content (set by the writer for streaming).
+
+        Complete blocks are moved from `self.body` to the spool
+        and replaced by `self.spool_marker`."""
+        self.spool_marker = '\x00spool-%x\x00' % id(self)
+
+    def dispatch_visit(self, node):
+        if (self.spool is not None
+            and len(self.body) >= self.spool_threshold):
+            self.flush_body(node)
+        super().dispatch_visit(node)
+
+    def flush_body(self, node):
+        """Move the content of `self.body` to `self.spool`.
+
+        Only done between top-level blocks (i.e. if `node` is a block
+        element in a section or the document) when no position in
+        `self.body` is stored in `self.context`.  Trailing newlines are
+        kept in `self.body` as they may be stripped from the final output.
+        """
+        if (self.context or self.in_document_title
+            or not isinstance(node, (nodes.Structural, nodes.Body))
+            or not isinstance(node.parent, (nodes.document, nodes.section))):
+            return
+        if self.body[0] == self.spool_marker:
+            text = ''.join(self.body[1:])
+        else:
+            text = ''.join(self.body)
+        content = text.rstrip('\n')
+        self.spool.write(content)
+        self.body[:] = [self.spool_marker, text[len(content):]]
 
     def astext(self):
         return ''.join(self.head_prefix + self.head
@@ -1015,22 +1110,21 @@ def visit_image(self, node):
         if 'height' in node:
             atts['height'] = node['height']
         if 'scale' in node:
-            if (PIL and ('width' not in node or 'height' not in node)
+            if (('width' not in node or 'height' not in node)
                 and self.settings.file_insertion_enabled):
+                from urllib.request import url2pathname
                 imagepath = url2pathname(uri)
                 try:
-                    with PIL.Image.open(imagepath) as img:
-                        imgsize = img.size
+                    imgsize = image_info.cache.image_size(imagepath)
                 except (OSError, UnicodeEncodeError):
-                    pass  # TODO: warn?
-                else:
+                    imgsize = None  # TODO: warn?
+                if imgsize:
                     self.settings.record_dependencies.add(
                         imagepath.replace('\\', '/'))
                     if 'width' not in atts:
                         atts['width'] = '%dpx' % imgsize[0]
                     if 'height' not in atts:
                         atts['height'] = '%dpx' % imgsize[1]
-                    del img
             for att_name in 'width', 'height':
                 if att_name in atts:
                     match = re.match(r'([0-9.]+)(\S*)$', atts[att_name])
@@ -1059,9 +1153,10 @@ def visit_image(self, node):
             atts['class'] = 'align-%s' % node['align']
         # Embed image file (embedded SVG or data URI):
         if self.image_loading == 'embed':
+            from urllib.request import url2pathname
             try:
-                with open(url2pathname(uri), 'rb') as imagefile:
-                    imagedata = imagefile.read()
+                data_uri = image_info.cache.data_uri(url2pathname(uri),
+                                                     mimetype)
             except OSError as err:
                 self.document.reporter.error('Cannot embed image %r: %s'
                                              % (uri, err.strerror))
@@ -1071,8 +1166,7 @@ def visit_image(self, node):
                 # if mimetype == 'image/svg+xml':
                 # read/parse, apply arguments,
                 # insert as <svg ....> ... </svg> # (about 1/3 less data)
-                data64 = base64.b64encode(imagedata).decode()
-                uri = 'data:%s;base64,%s' % (mimetype, data64)
+                uri = data_uri
         elif self.image_loading == 'lazy':
             atts['loading'] = 'lazy'
         if mimetype == 'application/x-shockwave-flash':
@@ -1220,6 +1314,7 @@ def visit_math(self, node, math_env=''):
                  or self.math_output_options[0] == 'blahtexml')):
             wrapper = None
         # get and wrap content
+        from docutils.utils.math import unichar2tex
         math_code = node.astext().translate(unichar2tex.uni2tex_table)
         if wrapper:
             try:  # wrapper with three "%s"
@@ -1248,6 +1343,7 @@ def visit_math(self, node, math_env=''):
                     adjust_path=True)
                     for s in self.math_output_options[0].split(',')]
             # TODO: fix display mode in matrices and fractions
+            from docutils.utils.math import math2html
             math2html.DocumentParameters.displaymode = (math_env != '')
             math_code = math2html.math2html(math_code)
         elif self.math_output == 'mathml':
@@ -1255,6 +1351,7 @@ def visit_math(self, node, math_env=''):
                 self.doctype = self.doctype_mathml
                 self.content_type = self.content_type_mathml
             converter = ' '.join(self.math_output_options).lower()
+            from docutils.utils.math import latex2mathml, tex2mathml_extern
             try:
                 if converter == 'latexml':
                     math_code = tex2mathml_extern.latexml(
@@ -19,7 +19,7 @@
 
 from docutils import frontend, nodes, writers
 from docutils.writers import _html_base
-from docutils.writers._html_base import PIL, url2pathname
+from docutils.utils import image_info
 
 
 class Writer(writers._html_base.Writer):
@@ -559,15 +559,15 @@ def visit_image(self, node):
         if 'height' in node:
             atts['height'] = node['height']
         if 'scale' in node:
-            if (PIL and ('width' not in node or 'height' not in node)
+            if (('width' not in node or 'height' not in node)
                 and self.settings.file_insertion_enabled):
+                from urllib.request import url2pathname
                 imagepath = url2pathname(uri)
                 try:
-                    with PIL.Image.open(imagepath) as img:
-                        img_size = img.size
+                    img_size = image_info.cache.image_size(imagepath)
                 except (OSError, UnicodeEncodeError):
-                    pass  # TODO: warn/info?
-                else:
+                    img_size = None  # TODO: warn/info?
+                if img_size:
                     self.settings.record_dependencies.add(
                         imagepath.replace('\\', '/'))
                     if 'width' not in atts:
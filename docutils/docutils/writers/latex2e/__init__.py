@@ -15,7 +15,6 @@
 from pathlib import Path
 import re
 import string
-from urllib.request import url2pathname
 import warnings
 try:
     import roman
@@ -24,7 +23,7 @@
 
 from docutils import frontend, nodes, languages, writers, utils
 from docutils.transforms import writer_aux
-from docutils.utils.math import pick_math_environment, unichar2tex
+from docutils.utils.math import pick_math_environment
 
 LATEX_WRITER_DIR = Path(__file__).parent
 
@@ -781,6 +780,10 @@ class CharMaps:
         0x2713: '\\ding{51}',                # check mark
         0x2717: '\\ding{55}',                # check mark
     }
+    # characters that may require a package or preamble definition
+    # (cf. `LaTeXTranslator.encode()`):
+    requiring_packages = frozenset(map(chr, [*textcomp, *pifont,
+                                             *unsupported_unicode]))
     # TODO: greek alphabet ... ?
     # see also LaTeX codec
     # http://aspn.activestate.com/ASPN/Cookbook/Python/Recipe/252124
@@ -1155,6 +1158,7 @@ class LaTeXTranslator(nodes.NodeVisitor):
 
     def __init__(self, document, babel_class=Babel):
         super().__init__(document)
+        self._encode_tables = {}  # cache for `encode_table()`
         # Reporter
         # ~~~~~~~~
         self.warn = self.document.reporter.warning
@@ -1472,44 +1476,22 @@ def encode(self, text):
         """
         if self.verbatim:
             return text
-        # Set up the translation table:
-        table = CharMaps.alltt.copy()
-        if not self.alltt:
-            table.update(CharMaps.special)
-        # keep the underscore in citation references
-        if self.inside_citation_reference_label and not self.alltt:
-            del table[ord('_')]
-        # Workarounds for OT1 font-encoding
-        if self.font_encoding in ['OT1', ''] and not self.is_xetex:
-            # * out-of-order characters in cmtt
-            if self.literal:
-                # replace underscore by underlined blank,
-                # because this has correct width.
-                table[ord('_')] = '\\underline{~}'
-                # the backslash doesn't work, so we use a mirrored slash.
-                # \reflectbox is provided by graphicx:
-                self.requirements['graphicx'] = self.graphicx_package
-                table[ord('\\')] = '\\reflectbox{/}'
-            # * ``< | >`` come out as different chars (except for cmtt):
-            else:
-                table[ord('|')] = '\\textbar{}'
-                table[ord('<')] = '\\textless{}'
-                table[ord('>')] = '\\textgreater{}'
-        if self.insert_non_breaking_blanks:
-            table[ord(' ')] = '~'
-            # tab chars may occur in included files (literal or code)
-            # quick-and-dirty replacement with spaces
-            # (for better results use `--literal-block-env=lstlisting`)
-            table[ord('\t')] = '~' * self.settings.tab_width
-        # Unicode replacements for 8-bit tex engines (not required with XeTeX)
-        if not self.is_xetex:
-            if not self.latex_encoding.startswith('utf8'):
-                table.update(CharMaps.unsupported_unicode)
-                table.update(CharMaps.utf8_supported_unicode)
-                table.update(CharMaps.textcomp)
-            table.update(CharMaps.pifont)
-            # Characters that require a feature/package to render
-            for ch in text:
+        # The translation tables are cached for every combination of modes:
+        key = (self.alltt, self.literal, self.insert_non_breaking_blanks,
+               self.inside_citation_reference_label, self.font_encoding,
+               self.is_xetex, self.latex_encoding)
+        try:
+            table = self._encode_tables[key]
+        except KeyError:
+            table = self._encode_tables[key] = self.encode_table()
+        if (self.literal and self.font_encoding in ['OT1', '']
+            and not self.is_xetex):
+            # \reflectbox (for the backslash) is provided by graphicx:
+            self.requirements['graphicx'] = self.graphicx_package
+        # Characters that require a feature/package to render
+        # (all non-ASCII, not required with XeTeX):
+        if not (self.is_xetex or text.isascii()):
+            for ch in CharMaps.requiring_packages.intersection(text):
                 cp = ord(ch)
                 if cp in CharMaps.textcomp and not self.fallback_stylesheet:
                     self.requirements['textcomp'] = PreambleCmds.textcomp
@@ -1530,10 +1512,13 @@ def encode(self, text):
             # other characters which can't occur in non-literal text.
             if self.literal:
                 separate_chars += ',`\'"<>'
-            for char in separate_chars * 2:
-                # Do it twice ("* 2") because otherwise we would replace
-                # '---' by '-{}--'.
-                text = text.replace(char + char, char + '{}' + char)
+            for char in separate_chars:
+                pair = char + char
+                if pair in text:
+                    # Replace twice because otherwise we would replace
+                    # '---' by '-{}--'.
+                    text = text.replace(pair, char + '{}' + char).replace(
+                                        pair, char + '{}' + char)
 
         # Literal line breaks (in address or literal blocks):
         if self.insert_newline:
@@ -1549,6 +1534,44 @@ def encode(self, text):
             text = text.replace('  ', ' ~')
         return text
 
+    def encode_table(self):
+        """Return the translation table for `encode()` in the current mode.
+        """
+        table = CharMaps.alltt.copy()
+        if not self.alltt:
+            table.update(CharMaps.special)
+        # keep the underscore in citation references
+        if self.inside_citation_reference_label and not self.alltt:
+            del table[ord('_')]
+        # Workarounds for OT1 font-encoding
+        if self.font_encoding in ['OT1', ''] and not self.is_xetex:
+            # * out-of-order characters in cmtt
+            if self.literal:
+                # replace underscore by underlined blank,
+                # because this has correct width.
+                table[ord('_')] = '\\underline{~}'
+                # the backslash doesn't work, so we use a mirrored slash.
+                table[ord('\\')] = '\\reflectbox{/}'
+            # * ``< | >`` come out as different chars (except for cmtt):
+            else:
+                table[ord('|')] = '\\textbar{}'
+                table[ord('<')] = '\\textless{}'
+                table[ord('>')] = '\\textgreater{}'
+        if self.insert_non_breaking_blanks:
+            table[ord(' ')] = '~'
+            # tab chars may occur in included files (literal or code)
+            # quick-and-dirty replacement with spaces
+            # (for better results use `--literal-block-env=lstlisting`)
+            table[ord('\t')] = '~' * self.settings.tab_width
+        # Unicode replacements for 8-bit tex engines (not required with XeTeX)
+        if not self.is_xetex:
+            if not self.latex_encoding.startswith('utf8'):
+                table.update(CharMaps.unsupported_unicode)
+                table.update(CharMaps.utf8_supported_unicode)
+                table.update(CharMaps.textcomp)
+            table.update(CharMaps.pifont)
+        return table
+
     def attval(self, text,
                whitespace=re.compile('[\n\r\t\v\f]')):
         """Cleanse, encode, and return attribute value text."""
@@ -2402,6 +2425,7 @@ def visit_image(self, node):
         self.requirements['graphicx'] = self.graphicx_package
         attrs = node.attributes
         # Convert image URI to a local file path
+        from urllib.request import url2pathname
         imagepath = url2pathname(attrs['uri']).replace('\\', '/')
         # alignment defaults:
         if 'align' not in attrs:
@@ -2656,6 +2680,7 @@ def visit_math(self, node, math_env='$'):
         """math role"""
         self.visit_inline(node)
         self.requirements['amsmath'] = r'\usepackage{amsmath}'
+        from docutils.utils.math import unichar2tex
         math_code = node.astext().translate(unichar2tex.uni2tex_table)
         if math_env == '$':
             if self.alltt:
@@ -14,6 +14,7 @@
 
 from configparser import ConfigParser
 import copy
+import hashlib
 from io import StringIO
 import itertools
 import locale
@@ -23,8 +24,6 @@
 import subprocess
 import tempfile
 import time
-from urllib.request import urlopen
-from urllib.error import HTTPError
 import weakref
 from xml.etree import ElementTree as etree
 from xml.dom import minidom
@@ -32,18 +31,28 @@
 
 import docutils
 from docutils import frontend, nodes, utils, writers, languages
-from docutils.parsers.rst.directives.images import PIL  # optional
 from docutils.readers import standalone
 from docutils.transforms import references
+from docutils.utils import image_info
+
+# Pygments and the odtwriter pygments formatters are imported on first use,
+# cf. `_import_pygments()`.
+_pygments = None
+
+
+def _import_pygments():
+    """Return the `pygments` module (False, if it cannot be imported)."""
+    global _pygments
+    if _pygments is None:
+        try:
+            import pygments
+            import pygments.lexers
+            from . import pygmentsformatter  # noqa: F401
+            _pygments = pygments
+        except (ImportError, SyntaxError):
+            _pygments = False
+    return _pygments
 
-# Import pygments and odtwriter pygments formatters if possible.
-try:
-    import pygments
-    import pygments.lexers
-    from .pygmentsformatter import (OdtPygmentsProgFormatter,
-                                    OdtPygmentsLaTeXFormatter)
-except (ImportError, SyntaxError):
-    pygments = None
 
 # import warnings
 # warnings.warn('importing IPShellEmbed', UserWarning)
@@ -330,6 +339,69 @@ def set_backgroundcolor_(self, backgroundcolor):
     border='0.0007in solid #000000')
 
 
+class StylesheetTemplate:
+
+    """Parsed content of an ODF stylesheet (styles.odt or styles.xml).
+
+    Use `StylesheetTemplate.get()`: the templates are cached per process,
+    so that the stylesheet is read and parsed only once when converting
+    many documents.  The attributes are shared by all documents and must
+    not be modified: the translator works on copies of the style trees.
+    """
+
+    cache = {}
+    """Resolved path -> (mtime [ns], file size, `StylesheetTemplate`)."""
+
+    def __init__(self, path, zipped=True):
+        self.styles = None
+        """Raw "styles.xml"."""
+        self.dom_styles = None
+        self.content = None
+        """Raw "content.xml" (automatic styles)."""
+        self.dom_content = None
+        self.settings = None
+        """Raw "settings.xml"."""
+        self.pictures = []
+        """(name, data) tuples of the "Pictures/*" entries."""
+        self.table_styles = None
+        """Table styles extracted from the automatic styles (cf.
+        `ODFTranslator.extract_table_styles()`)."""
+        if zipped:
+            with zipfile.ZipFile(path, 'r') as zfile:
+                self.styles = zfile.read('styles.xml')
+                self.content = zfile.read('content.xml')
+                self.settings = zfile.read('settings.xml')
+                self.pictures = [(name, zfile.read(name))
+                                 for name in zfile.namelist()
+                                 if name.startswith('Pictures/')]
+        else:
+            with open(path, 'r', encoding='utf-8') as stylesfile:
+                self.styles = stylesfile.read()
+        self.dom_styles = etree.fromstring(self.styles)
+        if self.content is not None:
+            self.dom_content = etree.fromstring(self.content)
+
+    @classmethod
+    def get(cls, path, zipped=True):
+        """Return the template for the stylesheet file `path`.
+
+        Read and parse the file, if it is not in the cache or if it
+        changed since it was cached.
+        """
+        stat = os.stat(path)
+        realpath = os.path.realpath(path)
+        entry = cls.cache.get(realpath)
+        if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+            entry = cls.cache[realpath] = (stat.st_mtime_ns, stat.st_size,
+                                           cls(path, zipped))
+        return entry[2]
+
+
+_paper_size = None
+"""Paper size reported by `paperconf` (cf. `ODFTranslator.setup_paper()`).
+"""
+
+
 #
 # Information about the indentation level for lists nested inside
 #   other contexts, e.g. dictionary lists.
@@ -511,6 +583,14 @@ class Writer(writers.Writer):
     config_section = 'odf_odt writer'
     config_section_dependencies = ('writers',)
 
+    spool_max_size = 2**26
+    """Assemble the ODF package in memory up to this size (in bytes).
+    Larger packages are spilled to a temporary file."""
+
+    stored_extensions = ('.gif', '.jpeg', '.jpg', '.png')
+    """Store files with these extensions uncompressed in the package
+    (the formats are compressed already)."""
+
     def __init__(self):
         writers.Writer.__init__(self)
         self.translator_class = ODFTranslator
@@ -528,7 +608,7 @@ def assemble_my_parts(self):
         """Assemble the `self.parts` dictionary.  Extend in subclasses.
         """
         writers.Writer.assemble_parts(self)
-        f = tempfile.NamedTemporaryFile()
+        f = tempfile.SpooledTemporaryFile(max_size=self.spool_max_size)
         zfile = zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED)
         self.write_zip_str(
             zfile, 'mimetype', self.MIME_TYPE,
@@ -652,13 +732,23 @@ def write_zip_str(
         zinfo.compress_type = compress_type
         zfile.writestr(zinfo, bytes)
 
+    def get_compress_type(self, name):
+        """Return the compression method for the package entry `name`."""
+        if os.path.splitext(name)[1].lower() in self.stored_extensions:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
     def store_embedded_files(self, zfile):
         embedded_files = self.visitor.get_embedded_file_list()
         for source, destination in embedded_files:
             if source is None:
                 continue
+            compress_type = self.get_compress_type(destination)
+            if isinstance(source, bytes):  # downloaded image data
+                self.write_zip_str(zfile, destination, source, compress_type)
+                continue
             try:
-                zfile.write(source, destination)
+                zfile.write(source, destination, compress_type)
             except OSError:
                 self.document.reporter.warning(
                     "Can't open file %s." % (source, ))
@@ -667,11 +757,7 @@ def get_settings(self):
         """
         modeled after get_stylesheet
         """
-        stylespath = self.settings.stylesheet
-        zfile = zipfile.ZipFile(stylespath, 'r')
-        s1 = zfile.read('settings.xml')
-        zfile.close()
-        return s1
+        return StylesheetTemplate.get(self.settings.stylesheet).settings
 
     def get_stylesheet(self):
         """Get the stylesheet from the visitor.
@@ -682,18 +768,12 @@ def get_stylesheet(self):
     def copy_from_stylesheet(self, outzipfile):
         """Copy images, settings, etc from the stylesheet doc into target doc.
         """
-        stylespath = self.settings.stylesheet
-        inzipfile = zipfile.ZipFile(stylespath, 'r')
+        stylesheet = StylesheetTemplate.get(self.settings.stylesheet)
         # Copy the styles.
-        s1 = inzipfile.read('settings.xml')
-        self.write_zip_str(outzipfile, 'settings.xml', s1)
+        self.write_zip_str(outzipfile, 'settings.xml', stylesheet.settings)
         # Copy the images.
-        namelist = inzipfile.namelist()
-        for name in namelist:
-            if name.startswith('Pictures/'):
-                imageobj = inzipfile.read(name)
-                outzipfile.writestr(name, imageobj)
-        inzipfile.close()
+        for name, imageobj in stylesheet.pictures:
+            outzipfile.writestr(name, imageobj, self.get_compress_type(name))
 
     def assemble_parts(self):
         pass
@@ -891,6 +971,7 @@ def __init__(self, document):
         self.image_count = 0
         self.image_style_count = 0
         self.image_dict = {}
+        self.image_digests = {}
         self.embedded_file_list = []
         self.syntaxhighlighting = 1
         self.syntaxhighlight_lexer = 'python'
@@ -932,29 +1013,35 @@ def retrieve_styles(self, extension):
         """Retrieve the stylesheet from either a .xml file or from
         a .odt (zip) file.  Return the content as a string.
         """
-        s2 = None
         stylespath = self.settings.stylesheet
         ext = os.path.splitext(stylespath)[1]
-        if ext == '.xml':
-            with open(stylespath, 'r', encoding='utf-8') as stylesfile:
-                s1 = stylesfile.read()
-        elif ext == extension:
-            zfile = zipfile.ZipFile(stylespath, 'r')
-            s1 = zfile.read('styles.xml')
-            s2 = zfile.read('content.xml')
-            zfile.close()
-        else:
+        if ext not in ('.xml', extension):
             raise RuntimeError('stylesheet path (%s) must be %s or '
                                '.xml file' % (stylespath, extension))
-        self.str_stylesheet = s1
-        self.str_stylesheetcontent = s2
-        self.dom_stylesheet = etree.fromstring(self.str_stylesheet)
-        self.dom_stylesheetcontent = etree.fromstring(
-            self.str_stylesheetcontent)
-        self.table_styles = self.extract_table_styles(s2)
+        # The parsed stylesheet is cached. Work on copies of the style
+        # trees, as they are modified for the current document.
+        stylesheet = StylesheetTemplate.get(stylespath, ext == extension)
+        self.str_stylesheet = stylesheet.styles
+        self.str_stylesheetcontent = stylesheet.content
+        self.dom_stylesheet = copy.deepcopy(stylesheet.dom_styles)
+        self.dom_stylesheetcontent = copy.deepcopy(stylesheet.dom_content)
+        if stylesheet.table_styles is None:
+            stylesheet.table_styles = self.extract_table_styles(
+                stylesheet.dom_content)
+        self.table_styles = stylesheet.table_styles.copy()
 
     def extract_table_styles(self, styles_str):
-        root = etree.fromstring(styles_str)
+        """Return a dictionary of the table styles in `styles_str`.
+
+        `styles_str` is the content.xml of the stylesheet, either as string
+        or parsed.
+        """
+        if etree.iselement(styles_str):
+            root = styles_str
+        elif styles_str is None:  # styles.xml has no automatic styles
+            return {}
+        else:
+            root = etree.fromstring(styles_str)
         table_styles = {}
         auto_styles = root.find(
             '{%s}automatic-styles' % (CNSD['office'], ))
@@ -1062,11 +1149,19 @@ def get_dom_stylesheet(self):
         return self.dom_stylesheet
 
     def setup_paper(self, root_el):
-        try:
-            dimensions = subprocess.check_output(('paperconf', '-s'),
-                                                 stderr=subprocess.STDOUT)
-            w, h = (float(s) for s in dimensions.split())
-        except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+        global _paper_size
+        if _paper_size is None:  # run `paperconf` only once per process
+            try:
+                dimensions = subprocess.check_output(
+                    ('paperconf', '-s'), stderr=subprocess.STDOUT)
+                w, h = (float(s) for s in dimensions.split())
+                _paper_size = (w, h)
+            except (subprocess.CalledProcessError, FileNotFoundError,
+                    ValueError):
+                _paper_size = False
+        if _paper_size:
+            w, h = _paper_size
+        else:
             self.document.reporter.info(
                 'Cannot use `paperconf`, defaulting to Letter.')
             w, h = 612, 792     # default to Letter
@@ -2141,27 +2236,29 @@ def visit_image(self, node):
         if source in self.image_dict:
             filename, destination = self.image_dict[source]
         else:
-            self.image_count += 1
-            filename = os.path.split(source)[1]
-            destination = 'Pictures/1%08x%s' % (self.image_count, filename, )
+            # Downloaded images are kept in memory (`filename` is the
+            # image data). Identical images are stored only once.
             if source.startswith('http:') or source.startswith('https:'):
+                from urllib.request import urlopen
                 try:
-                    imgfile = urlopen(source)
-                    content = imgfile.read()
-                    imgfile.close()
-                    imgfile2 = tempfile.NamedTemporaryFile('wb', delete=False)
-                    imgfile2.write(content)
-                    imgfile2.close()
-                    imgfilename = imgfile2.name
-                    source = imgfilename
-                except HTTPError:
+                    with urlopen(source) as imgfile:
+                        filename = imgfile.read()
+                except OSError:
                     self.document.reporter.warning(
                         "Can't open image url %s." % (source, ))
-                spec = (source, destination,)
+                    return
+                digest = hashlib.sha256(filename).hexdigest()
             else:
-                spec = (os.path.abspath(source), destination,)
-            self.embedded_file_list.append(spec)
-            self.image_dict[source] = (source, destination,)
+                filename = os.path.abspath(source)
+                digest = image_info.cache.digest(filename)
+            destination = self.image_digests.get(digest)
+            if destination is None:
+                self.image_count += 1
+                destination = 'Pictures/1%08x%s' % (
+                    self.image_count, os.path.split(source)[1], )
+                self.embedded_file_list.append((filename, destination,))
+                self.image_digests[digest] = destination
+            self.image_dict[source] = (filename, destination,)
         # Is this a figure (containing an image) or just a plain image?
         if self.in_paragraph:
             el1 = self.current_element
@@ -2258,23 +2355,18 @@ def get_image_scaled_width_height(self, node, source):
         scale = self.get_image_scale(node)
         width, width_unit = self.get_image_width_height(node, 'width')
         height, _ = self.get_image_width_height(node, 'height')
-        dpi = (72, 72)
-        if PIL is not None and source in self.image_dict:
+        img_size = None
+        if source in self.image_dict:
             filename, destination = self.image_dict[source]
-            with PIL.Image.open(filename, 'r') as img:
-                img_size = img.size
-                dpi = img.info.get('dpi', dpi)
-            # dpi information can be (xdpi, ydpi) or xydpi
-            try:
-                iter(dpi)
-            except TypeError:
-                dpi = (dpi, dpi)
-        else:
-            img_size = None
+            if isinstance(filename, bytes):  # downloaded image data
+                img_size = image_info.data_size(filename)
+            else:
+                img_size = image_info.cache.image_size(filename)
         if width is None or height is None:
             if img_size is None:
-                raise RuntimeError(
-                    'image size not fully specified and PIL not installed')
+                raise RuntimeError('image size not fully specified and '
+                                   'cannot be determined (unsupported '
+                                   'image format and PIL not installed)')
             if width is None:
                 width = img_size[0]
                 width = float(width) * 0.026        # convert px to cm
@@ -2579,6 +2671,9 @@ def _calculate_code_block_padding(self, line):
         return count
 
     def _add_syntax_highlighting(self, insource, language):
+        from .pygmentsformatter import (OdtPygmentsProgFormatter,
+                                        OdtPygmentsLaTeXFormatter)
+        pygments = _import_pygments()
         lexer = pygments.lexers.get_lexer_by_name(language, stripall=True)
         if language in ('latex', 'tex'):
             fmtr = OdtPygmentsLaTeXFormatter(
@@ -2612,7 +2707,7 @@ def visit_literal_block(self, node):
             wrapper1 = '<text:p text:style-name="%s">%%s</text:p>' % (
                 self.rststyle('codeblock'), )
         source = node.astext()
-        if (pygments and self.settings.add_syntax_highlighting):
+        if (self.settings.add_syntax_highlighting and _import_pygments()):
             language = node.get('language', 'python')
             source = self._add_syntax_highlighting(source, language)
         else:
@@ -9,7 +9,8 @@
 __docformat__ = 'reStructuredText'
 
 
-from docutils import writers, frontend
+from docutils import frontend, io, languages, writers
+from docutils.utils import timing
 
 
 class Writer(writers.Writer):
@@ -23,6 +24,15 @@ class Writer(writers.Writer):
         (('Pretty-print <#text> nodes.',
           ['--detailed'],
           {'action': 'store_true', 'validator': frontend.validate_boolean}),
+         ('Write the output file line by line instead of assembling the '
+          'complete output in memory. Ignored unless the output is '
+          'written to a file.',
+          ['--stream-output'],
+          {'default': False, 'action': 'store_true',
+           'validator': frontend.validate_boolean}),
+         ('Assemble the complete output in memory. (default)',
+          ['--no-stream-output'],
+          {'dest': 'stream_output', 'action': 'store_false'}),
          )
         )
 
@@ -32,6 +42,43 @@ class Writer(writers.Writer):
     output = None
     """Final translated form of `document`."""
 
+    def write(self, document, destination):
+        """Translate `document` and write it to `destination`.
+
+        With the stream_output__ setting and a `io.FileOutput`
+        destination, the pseudo-XML is written in chunks while it is
+        generated. Return None in this case.
+
+        __ https://docutils.sourceforge.io/docs/user/config.html
+           #stream-output-pseudoxml-writer
+        """
+        if not (getattr(document.settings, 'stream_output', False)
+                and isinstance(destination, io.FileOutput)):
+            return super().write(document, destination)
+        self.document = document
+        self.language = languages.get_language(
+            document.settings.language_code,
+            document.reporter)
+        self.destination = destination
+        with timing.phase(document.settings, 'write'):
+            self.destination.write_chunks(self.stream_chunks())
+        self.output = None
+        return None
+
+    def stream_chunks(self, size=2**16):
+        """Generate the pseudo-XML in chunks of about `size` characters.
+        """
+        chunk = []
+        length = 0
+        for piece in self.document.pformat_lines():
+            chunk.append(piece)
+            length += len(piece)
+            if length >= size:
+                yield ''.join(chunk)
+                chunk = []
+                length = 0
+        yield ''.join(chunk)
+
     def translate(self):
         self.output = self.document.pformat()
 
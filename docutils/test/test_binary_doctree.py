@@ -0,0 +1,156 @@
+#! /usr/bin/env python3
+# $Id$
+# Copyright: This module has been placed in the public domain.
+
+"""
+Tests of the binary document tree format (`docutils.utils.binary_doctree`).
+"""
+
+import io
+from pathlib import Path
+import pickle
+import sys
+import types
+import unittest
+from unittest import mock
+
+if __name__ == '__main__':
+    # prepend the "docutils root" to the Python library path
+    # so we import the local `docutils` package.
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from docutils import core, nodes
+from docutils.utils import binary_doctree
+
+FUNCTIONAL = Path(__file__).resolve().parent / 'functional'
+
+SETTINGS = {'_disable_config': True,
+            'warning_stream': '',
+            'embed_stylesheet': False,
+            'output_encoding': 'unicode',
+            }
+
+sample = """\
+Title
+=====
+
+A paragraph with *emphasis*, a footnote [#]_, a `link`_,
+and a reference to an `unknown target`_.
+
+.. [#] The footnote.
+.. _link: https://example.org
+
+.. image:: picture.png
+   :width: 2.5em
+   :align: center
+
+====  ====
+a     b
+====  ====
+"""
+
+
+class BinaryDoctreeTests(unittest.TestCase):
+
+    def check_round_trip(self, source, source_path=None):
+        doctree = core.publish_doctree(source, source_path=source_path,
+                                       settings_overrides=SETTINGS)
+        expected = core.publish_from_doctree(
+            doctree, writer_name='docutils_xml', settings_overrides=SETTINGS)
+        doctree = core.publish_doctree(source, source_path=source_path,
+                                       settings_overrides=SETTINGS)
+        data = binary_doctree.dumps(doctree)
+        output = core.publish_from_doctree(
+            data, writer_name='docutils_xml', settings_overrides=SETTINGS)
+        self.assertEqual(expected, output)
+
+    def test_round_trip(self):
+        self.check_round_trip(sample)
+
+    def test_round_trip_standard(self):
+        # the functional test input exercises all standard elements
+        path = FUNCTIONAL / 'input' / 'data' / 'standard.txt'
+        self.check_round_trip(path.read_text(encoding='utf-8'),
+                              source_path=path.as_posix())
+
+    def test_loads(self):
+        doctree = core.publish_doctree(sample, settings_overrides=SETTINGS)
+        loaded = binary_doctree.loads(binary_doctree.dumps(doctree))
+        self.assertEqual(doctree.pformat(), loaded.pformat())
+        self.assertEqual(doctree.ids.keys(), loaded.ids.keys())
+        self.assertEqual(doctree.nameids, loaded.nameids)
+        for node in loaded.findall():
+            if isinstance(node, nodes.Element):
+                for child in node.children:
+                    self.assertIs(child.parent, node)
+        # pending system messages are kept
+        self.assertEqual(
+            [msg.pformat() for msg in doctree.transform_messages
+             if msg.parent is None],
+            [msg.pformat() for msg in loaded.transform_messages])
+
+    def test_attribute_values(self):
+        doctree = nodes.document(None, None)
+        doctree += nodes.paragraph('', 'Text', number=-42, scale=1.5,
+                                   flag=True, empty=None,
+                                   pair=('a', 3), names=['x', 'y'])
+        loaded = binary_doctree.loads(binary_doctree.dumps(doctree))
+        self.assertEqual(doctree.pformat(), loaded.pformat())
+        self.assertEqual(doctree[0].attributes, loaded[0].attributes)
+
+    def test_write_load(self):
+        doctree = core.publish_doctree(sample, settings_overrides=SETTINGS)
+        stream = io.BytesIO()
+        binary_doctree.write(doctree, stream)
+        stream.seek(0)
+        loaded = binary_doctree.load(stream)
+        self.assertEqual(doctree.pformat(), loaded.pformat())
+
+    def test_smaller_than_pickle(self):
+        doctree = core.publish_doctree(sample, settings_overrides=SETTINGS)
+        self.assertLess(len(binary_doctree.dumps(doctree)),
+                        len(pickle.dumps(doctree)))
+
+    def test_pending(self):
+        doctree = nodes.document(None, None)
+        doctree += nodes.pending(None)
+        with self.assertRaises(TypeError):
+            binary_doctree.dumps(doctree)
+
+    def test_custom_node_class(self):
+        class custom(nodes.Element):
+            pass
+        custom.__module__, custom.__qualname__ = 'xxxx', 'custom'
+        doctree = nodes.document(None, None)
+        doctree += custom()
+        data = binary_doctree.dumps(doctree)
+        with mock.patch.dict(sys.modules, xxxx=types.SimpleNamespace(
+                                                   custom=custom)):
+            loaded = binary_doctree.loads(data)
+        self.assertIsInstance(loaded[0], custom)
+        # modules are not imported when loading
+        data = data.replace(b'xxxx:custom', b'this:custom')
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop('this', None)
+            with self.assertRaisesRegex(binary_doctree.FormatError,
+                                        'unknown node class "this:custom"'):
+                binary_doctree.loads(data)
+            self.assertNotIn('this', sys.modules)
+
+    def test_invalid_header(self):
+        with self.assertRaisesRegex(binary_doctree.FormatError,
+                                    'invalid header'):
+            binary_doctree.loads(b'<document/>')
+        with self.assertRaisesRegex(binary_doctree.FormatError,
+                                    'unsupported binary doctree version'):
+            binary_doctree.loads(binary_doctree.magic + b'\x7f')
+
+    def test_truncated(self):
+        doctree = core.publish_doctree(sample, settings_overrides=SETTINGS)
+        data = binary_doctree.dumps(doctree)
+        with self.assertRaises(binary_doctree.FormatError):
+            binary_doctree.loads(data[:-10])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,7 +22,6 @@
 import docutils.core
 import docutils.utils
 import docutils.io
-from docutils.parsers.rst.directives.images import PIL
 
 TEST_ROOT = Path(__file__).parent  # ./test/ from the docutils root
 DATA_ROOT = TEST_ROOT / 'data'
@@ -73,7 +72,7 @@ def test_dependencies_xml(self):
         # parsing even if not used in the chosen output format.
         # This should change (see parsers/rst/directives/misc.py).
         keys = ['include', 'raw']
-        if PIL and TEST_ROOT == CWD:
+        if TEST_ROOT == CWD:
             keys += ['figure-image']
         expected = [paths[key] for key in keys]
         record, output = self.get_record(writer_name='xml')
@@ -82,7 +81,7 @@ def test_dependencies_xml(self):
 
     def test_dependencies_html(self):
         keys = ['include', 'raw']
-        if PIL and (TEST_ROOT == CWD):
+        if TEST_ROOT == CWD:
             keys += ['figure-image', 'scaled-image']
         expected = [paths[key] for key in keys]
         # stylesheets are tested separately in test_stylesheet_dependencies():
@@ -99,7 +98,7 @@ def test_dependencies_latex(self):
         # parsing even if not used in the chosen output format.
         # This should change (see parsers/rst/directives/misc.py).
         keys = ['include', 'raw']
-        if PIL and TEST_ROOT == CWD:
+        if TEST_ROOT == CWD:
             keys += ['figure-image']
         expected = [paths[key] for key in keys]
         record, output = self.get_record(
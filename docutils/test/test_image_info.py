@@ -0,0 +1,159 @@
+#! /usr/bin/env python3
+# $Id$
+# Copyright: This module has been placed in the public domain.
+
+"""
+Tests of `docutils.utils.image_info`.
+"""
+
+import base64
+import hashlib
+from io import BytesIO
+import os
+from pathlib import Path
+import struct
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+if __name__ == '__main__':
+    # prepend the "docutils root" to the Python library path
+    # so we import the local `docutils` package.
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from docutils.utils import image_info
+
+DOCS = Path(__file__).resolve().parents[1] / 'docs'
+IMAGES = DOCS / 'user' / 'rst' / 'images'
+
+# minimal image headers:
+gif = b'GIF89a' + struct.pack('<HH', 20, 10) + b'\x00' * 30
+jpeg = (b'\xff\xd8'
+        + b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+        + b'\xff\xff\xc0' + struct.pack('>HBHH', 17, 8, 300, 400)
+        + b'\x00' * 12)
+svg = b'''\xef\xbb\xbf<?xml version="1.0"?>
+<!-- width="1" -->
+<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN"
+  "http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">
+<svg xmlns="http://www.w3.org/2000/svg" stroke-width="2"
+     width="2in" height='30'><rect width="5" height="5"/></svg>
+'''
+
+
+class ReadSizeTests(unittest.TestCase):
+
+    def read_size(self, data):
+        return image_info.read_size(BytesIO(data))
+
+    def test_png(self):
+        with open(IMAGES / 'title.png', 'rb') as stream:
+            self.assertEqual((516, 49), image_info.read_size(stream))
+
+    def test_gif(self):
+        self.assertEqual((20, 10), self.read_size(gif))
+
+    def test_jpeg(self):
+        self.assertEqual((400, 300), self.read_size(jpeg))
+
+    def test_svg(self):
+        self.assertEqual((192, 30), self.read_size(svg))
+        with open(IMAGES / 'title.svg', 'rb') as stream:
+            width, height = image_info.read_size(stream)
+        self.assertAlmostEqual(width, 203*4/3)
+        self.assertAlmostEqual(height, 32)
+
+    def test_data_size(self):
+        self.assertEqual((20, 10), image_info.data_size(gif))
+        with patch.object(image_info, '_import_PIL', return_value=None):
+            self.assertIsNone(image_info.data_size(b'no image'))
+
+    def test_svg_relative_size(self):
+        self.assertIsNone(self.read_size(b'<svg width="100%" height="2em">'))
+        self.assertIsNone(self.read_size(b'<svg width="10">'))
+        self.assertIsNone(self.read_size(b'<html><svg width="1" height="1">'))
+
+    def test_invalid(self):
+        self.assertIsNone(self.read_size(b''))
+        self.assertIsNone(self.read_size(b'no image'))
+        self.assertIsNone(self.read_size(b'\x89PNG\r\n\x1a\n\x00\x00'))
+        self.assertIsNone(self.read_size(jpeg[:25]))
+        self.assertIsNone(self.read_size(jpeg[:2] + b'garbage'))
+
+
+class ImageInfoCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'image.gif')
+        with open(self.path, 'wb') as f:
+            f.write(gif)
+        self.cache = image_info.ImageInfoCache()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_image_size(self):
+        with patch.object(image_info, 'read_size',
+                          wraps=image_info.read_size) as read_size:
+            self.assertEqual((20, 10), self.cache.image_size(self.path))
+            self.assertEqual((20, 10), self.cache.image_size(self.path))
+            self.assertEqual(1, read_size.call_count)
+            # re-read changed files
+            with open(self.path, 'wb') as f:
+                f.write(jpeg)
+            self.assertEqual((400, 300), self.cache.image_size(self.path))
+            self.assertEqual(2, read_size.call_count)
+
+    def test_unknown_format(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'no image')
+        with patch.object(image_info, '_import_PIL', return_value=None):
+            self.assertIsNone(self.cache.image_size(self.path))
+
+    def test_missing_file(self):
+        with self.assertRaises(OSError):
+            self.cache.image_size(self.path + '.missing')
+        with self.assertRaises(OSError):
+            self.cache.data_uri(self.path + '.missing', 'image/gif')
+
+    def test_digest(self):
+        digest = self.cache.digest(self.path)
+        self.assertEqual(hashlib.sha256(gif).hexdigest(), digest)
+        with patch('builtins.open') as open_:
+            self.assertEqual(digest, self.cache.digest(self.path))
+            open_.assert_not_called()
+
+    def test_data_uri(self):
+        uri = self.cache.data_uri(self.path, 'image/gif')
+        self.assertEqual('data:image/gif;base64,'
+                         + base64.b64encode(gif).decode(), uri)
+        self.assertIs(uri, self.cache.data_uri(self.path, 'image/gif'))
+
+    def test_data_uri_limit(self):
+        self.cache.max_data_size = 100
+        uri = self.cache.data_uri(self.path, 'image/gif')
+        self.assertEqual(1, len(self.cache.data_uris))
+        self.cache.data_uri(self.path, 'image/x-gif')
+        self.assertEqual(1, len(self.cache.data_uris))  # oldest removed
+        self.cache.max_data_size = 10
+        self.assertEqual(uri, self.cache.data_uri(self.path, 'image/gif'))
+        self.assertEqual(0, len(self.cache.data_uris))  # too large
+
+    def test_save_load(self):
+        stored = os.path.join(self.tmpdir.name, 'sizes.json')
+        self.cache.image_size(self.path)
+        self.cache.save(stored)
+        cache = image_info.ImageInfoCache(stored)
+        self.assertEqual(self.cache.sizes, cache.sizes)
+        with patch.object(image_info, 'read_size') as read_size:
+            self.assertEqual((20, 10), cache.image_size(self.path))
+            read_size.assert_not_called()
+        # missing files are ignored
+        cache = image_info.ImageInfoCache(stored + '.missing')
+        self.assertEqual({}, cache.sizes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#! /usr/bin/env python3
+# $Id$
+# Copyright: This module has been placed in the public domain.
+
+"""
+Test the import time of the command line interface.
+
+Heavy modules (math conversion, Pygments, PIL, `urllib.request`, ...)
+must be imported on first use only.
+"""
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+import unittest
+
+if __name__ == '__main__':
+    # prepend the "docutils root" to the Python library path
+    # so we import the local `docutils` package.
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+DOCUTILS_ROOT = Path(__file__).resolve().parents[1]
+
+sample = """\
+Title
+=====
+
+A paragraph with *emphasis* and a ``literal``.
+
+* a list item
+"""
+
+# Modules that must not be imported when processing `sample`:
+deferred = ('PIL',
+            'docutils.utils.binary_doctree',
+            'docutils.utils.doctree_cache',
+            'docutils.utils.math.latex2mathml',
+            'docutils.utils.math.math2html',
+            'docutils.utils.math.tex2mathml_extern',
+            'docutils.utils.math.unichar2tex',
+            'pprint',
+            'pygments',
+            'urllib.request',
+            )
+
+# Upper limit for the summed import time of all modules (in seconds).
+# Generous, to prevent spurious failures on slow or busy machines;
+# the actual value is about 0.1 s.
+budget = 1.0
+
+
+def import_times(*args):
+    """Run the Docutils CLI with `args` on `sample`.
+
+    Return a dictionary mapping module names to the "self" import time
+    (in seconds) as reported by ``python -X importtime``.
+    """
+    env = dict(os.environ, DOCUTILSCONFIG='')  # ignore config files
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (str(DOCUTILS_ROOT), env.get('PYTHONPATH'))))
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'docutils', *args],
+        input=sample, capture_output=True, encoding='utf-8', env=env)
+    if process.returncode:
+        raise AssertionError(process.stderr)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_time, cumulative, name = line[12:].split('|')
+        times[name.strip()] = int(self_time) / 1e6
+    return times
+
+
+class ImportTimeTests(unittest.TestCase):
+
+    writers = ('html5', 'html4', 'latex', 'manpage', 'pseudoxml')
+
+    def test_deferred_imports(self):
+        for writer in self.writers:
+            with self.subTest(writer=writer):
+                times = import_times(f'--writer={writer}')
+                self.assertIn('docutils.core', times)
+                for name in deferred:
+                    self.assertNotIn(name, times)
+
+    def test_budget(self):
+        # use the faster of two runs (the first may compile bytecode)
+        total = min(sum(import_times().values()) for i in range(2))
+        self.assertLess(total, budget)
+
+
+if __name__ == '__main__':
+    unittest.main()
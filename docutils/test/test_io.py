@@ -13,6 +13,7 @@
 from pathlib import Path
 import sys
 import unittest
+from unittest.mock import patch
 
 if __name__ == '__main__':
     # prepend the "docutils root" to the Python library path
@@ -88,6 +89,13 @@ def test_error_string(self):
         self.assertEqual('ImportError: %s' % us,
                          du_io.error_string(ImportError(us)))
 
+    def test_normalize_newlines(self):
+        for data in ('', 'a', '\n', 'a\n', 'a\n\n', 'a\r\nb\rc\r\r\n',
+                     'a\fb\x0bc\x1cd\x1de\x1ef\x85g\u2028h\u2029',
+                     '\r\f\r\n\x85\n', '\ufeffa\u2029'):
+            self.assertEqual(du_io._normalize_newlines(data),
+                             '\n'.join(data.splitlines()+['']))
+
 
 class InputTests(unittest.TestCase):
 
@@ -124,6 +132,17 @@ def test_coding_slug(self):
 print("hello world")
 """)
         self.assertNotEqual(input.successful_encoding, 'ascii')
+        # only the first two lines are checked, also with CR line ends
+        input = du_io.StringInput(source=b'#! python\r'
+                                  b'# -*- coding: ascii -*-\r'
+                                  b'print("hello world")\r')
+        input.read()
+        self.assertEqual(input.successful_encoding, 'ascii')
+        self.assertIsNone(input.determine_encoding_from_data(
+            b'no\n\ndeclaration coding: ascii'))
+        # the declaration must be on one line
+        self.assertIsNone(input.determine_encoding_from_data(
+            b'coding:\nascii'))
 
     def test_bom_detection(self):
         source = '\ufeffdata\nblah\n'
@@ -237,6 +256,24 @@ def test_encoding_clash_nonresolvable(self):
                               encoding='latin1', autoclose=False)
         self.assertRaises(ValueError, fo.write, self.udata)
 
+    def test_write_chunks(self):
+        fo = du_io.FileOutput(destination=self.udrain, encoding='utf-8',
+                              autoclose=False)
+        fo.write_chunks(iter(['a', self.udata, 'b']))
+        self.assertEqual(self.udrain.getvalue(), 'a\xfcb')
+
+    def test_write_chunks_encoding_clash(self):
+        # encode with an incremental encoder (only one BOM)
+        fo = du_io.FileOutput(destination=self.mock_stdout,
+                              encoding='utf-16', autoclose=False)
+        fo.write_chunks(['a', self.udata])
+        self.assertEqual(self.mock_stdout.buffer.getvalue(),
+                         'a\xfc'.encode('utf-16'))
+
+    def test_write_chunks_string_output(self):
+        so = du_io.StringOutput(encoding='latin1')
+        self.assertEqual(so.write_chunks(['a', self.udata]), b'a\xfc')
+
 
 class OutStringTests(unittest.TestCase):
 
@@ -376,6 +413,23 @@ def test_fallback_no_utf8(self):
         if source.successful_encoding in ('latin-1', 'iso8859-1'):
             self.assertEqual(data, 'Grüße\n')
 
+    def test_mmap(self):
+        """Mapping the file into memory does not change the result.
+        """
+        for name in ('utf-8-sig.txt', 'utf-16-le-sig.txt', 'latin2.txt',
+                     'latin1.txt', 'utf8.txt', 'include.txt'):
+            path = os.path.join(DATA_ROOT, name)
+            with patch.object(du_io.FileInput, 'mmap_threshold', None):
+                source = du_io.FileInput(source_path=path)
+                expected = source.read()
+            with patch.object(du_io.FileInput, 'mmap_threshold', 1):
+                source = du_io.FileInput(source_path=path)
+                self.assertEqual(source.read(), expected)
+        with patch.object(du_io.FileInput, 'mmap_threshold', 1):
+            source = du_io.FileInput(
+                source_path=os.path.join(DATA_ROOT, 'utf8.txt'))
+            self.assertEqual(source._read_mapped(), 'Grüße\n')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,6 +8,7 @@
 """
 
 from pathlib import Path
+import pickle
 import sys
 import unittest
 
@@ -147,6 +148,44 @@ def test_index(self):
         self.assertEqual(e.index(e[4]), 1)
         self.assertEqual(e.index(e[4], start=2), 4)
 
+    def test_child_position(self):
+        # Element.child_position() compares by identity
+        e = nodes.Element()
+        e += nodes.Element()
+        e += nodes.Text('sample')
+        e += nodes.Element()
+        e += nodes.Text('other sample')
+        e += nodes.Text('sample')
+        for i in range(5):
+            self.assertEqual(e.child_position(e[i]), i)
+        # stored positions are updated after changes of the child list:
+        last = e[4]
+        e.insert(0, nodes.Text('new'))
+        self.assertEqual(e.child_position(last), 5)
+        del e[1]
+        e.remove(e[1])
+        self.assertEqual(e.child_position(last), 3)
+        self.assertEqual(e.child_position(e[0]), 0)
+        with self.assertRaises(ValueError):
+            e.child_position(nodes.Text('sample'))
+        with self.assertRaises(ValueError):
+            e.child_position(nodes.Element())
+
+    def test_remove_text_by_identity(self):
+        e = nodes.Element()
+        first, second = nodes.Text('sample'), nodes.Text('sample')
+        e += [first, second]
+        e.remove(second)
+        self.assertIs(e[0], first)
+
+    def test_replace_text_by_identity(self):
+        e = nodes.Element()
+        first, second = nodes.Text('sample'), nodes.Text('sample')
+        e += [first, second]
+        e.replace(second, nodes.Text('new'))
+        self.assertIs(e[0], first)
+        self.assertEqual(e[1], 'new')
+
     def test_previous_sibling(self):
         e = nodes.Element()
         c1 = nodes.Element()
@@ -185,6 +224,59 @@ def test_default_attributes(self):
                          {'ids': ['someid']})
         self.assertTrue(element.is_not_default('ids'))
 
+    def test_lazy_list_attributes(self):
+        # empty list attributes are only stored when modified
+        element = nodes.Element()
+        self.assertEqual(dict(element.attributes), {})
+        self.assertEqual(element.get('classes'), [])
+        self.assertEqual(element.attributes['names'], [])
+        classes = element['classes']
+        names = element['names']
+        classes.append('cls')
+        names += ['name']
+        element['ids'][:] = ['id1']
+        element.attributes.get('dupnames').extend(['dup'])
+        self.assertEqual(element.attributes, {'classes': ['cls'],
+                                              'names': ['name'],
+                                              'ids': ['id1'],
+                                              'dupnames': ['dup']})
+        self.assertIs(type(element['classes']), list)
+        # all look-ups show the stored list
+        backrefs1, backrefs2 = element['backrefs'], element['backrefs']
+        backrefs1.append('a')
+        backrefs2.append('b')
+        self.assertEqual(element['backrefs'], ['a', 'b'])
+        self.assertEqual(backrefs1, ['a', 'b'])
+        self.assertEqual(backrefs2, backrefs1)
+        self.assertEqual(' '.join(backrefs2), 'a b')
+        self.assertEqual(['x'] + backrefs2, ['x', 'a', 'b'])
+        backrefs2.remove('a')
+        self.assertEqual(element['backrefs'], ['b'])
+        element = nodes.Element()
+        ids = element['ids']
+        element.attributes.setdefault('ids', []).append('id1')
+        self.assertEqual(ids, ['id1'])
+        self.assertEqual(len(ids), 1)
+        self.assertIn('id1', ids)
+        # reading does not store anything
+        self.assertFalse(element['names'])
+        self.assertEqual(list(element['names']), [])
+        self.assertNotIn('names', element.attributes)
+        self.assertEqual(element.setdefault('foo', 'bar'), 'bar')
+        self.assertEqual(nodes.Element().setdefault('ids', None), [])
+        self.assertEqual(nodes.Element().attributes.pop('ids'), [])
+
+    def test_lazy_list_attributes_pickle(self):
+        element = nodes.Element(rawsource='raw')
+        element['ids'].append('id1')
+        clone = pickle.loads(pickle.dumps(element))
+        self.assertIs(type(clone['ids']), list)
+        self.assertEqual(clone['ids'], ['id1'])
+        clone['classes'].append('cls')
+        self.assertEqual(clone.non_default_attributes(),
+                         {'ids': ['id1'], 'classes': ['cls']})
+        self.assertEqual(element.deepcopy().attributes, {'ids': ['id1']})
+
     def test_update_basic_atts(self):
         element1 = nodes.Element(ids=['foo', 'bar'], test=['test1'])
         element2 = nodes.Element(ids=['baz', 'qux'], test=['test2'])
@@ -357,6 +449,29 @@ def test_set_class_deprecation_warning(self):
         with self.assertWarns(DeprecationWarning):
             node.set_class('parrot')
 
+    def test_pformat_lines(self):
+        parent = nodes.Element(ids=['parent'])
+        parent += nodes.Element('', nodes.Text('Line 1.\nLine 2.'))
+        parent += nodes.pending(nodes.Element)  # overrides pformat()
+        parent += nodes.Element(ids=['last'])
+        lines = list(parent.pformat_lines(level=1))
+        self.assertEqual(lines[:3], ['    <Element ids="parent">\n',
+                                     '        <Element>\n',
+                                     '            Line 1.\n'
+                                     '            Line 2.\n'])
+        self.assertEqual(''.join(lines), parent.pformat(level=1))
+        self.assertEqual(lines[-1], '        <Element ids="last">\n')
+
+    def test_pformat_deeply_nested(self):
+        # no recursion (a recursive implementation needs two stack frames
+        # per level)
+        depth = sys.getrecursionlimit() // 2 + 10
+        element = root = nodes.Element()
+        for i in range(depth):
+            element += nodes.Element()
+            element = element[0]
+        self.assertEqual(root.pformat().count('\n'), depth + 1)
+
 
 class MiscTests(unittest.TestCase):
 
@@ -606,6 +721,35 @@ def test_findall_duplicate_texts(self):
         self.assertIs(partial_list[0], e[0][3])
         self.assertIs(partial_list[1], e[0][4])
 
+    def test_findall_node_index(self):
+        document = utils.new_document('test data')
+        document.settings.node_index = True
+        document += nodes.section('', nodes.title('', 'title'),
+                                  nodes.paragraph('', 'text'))
+        document += nodes.paragraph('', 'more text')
+        section, paragraph = document
+        self.assertEqual(list(document.findall(nodes.paragraph)),
+                         [section[1], paragraph])
+        self.assertEqual(list(document.findall(nodes.TextElement)),
+                         [section[0], section[1], paragraph])
+        # the index is updated after changes of the document tree
+        section[1] += nodes.emphasis('', 'emphasis')
+        section.insert(0, nodes.paragraph())
+        self.assertEqual(list(document.findall(nodes.TextElement)),
+                         [section[0], section[1], section[2],
+                          section[2][1], paragraph])
+        section.remove(section[0])
+        self.assertEqual(list(document.findall(nodes.paragraph)),
+                         [section[1], paragraph])
+        section[1:] = []
+        self.assertEqual(list(document.findall(nodes.paragraph)),
+                         [paragraph])
+        document.pop()
+        self.assertEqual(list(document.findall(nodes.paragraph)), [])
+        # the result is the same as without index
+        document.settings.node_index = False
+        self.assertEqual(list(document.findall(nodes.title)), [section[0]])
+
     def test_next_node(self):
         e = nodes.Element()
         e += nodes.Element()
@@ -30,14 +30,12 @@ def test_parser(self):
         settings.language_code = 'de'
         for name, cases in totest.items():
             for casenum, (case_input, case_expected) in enumerate(cases):
-                # Language-specific roles and roles added by the
-                # "default-role" and "role" directives are currently stored
-                # globally in the roles._roles dictionary.
-                # Language-specific directives are currently stored
-                # globally in the directives._directives dictionary.
+                # Language-specific roles and directives are cached
+                # globally in the roles._language_roles and
+                # directives._language_directives dictionaries.
                 # This workaround empties these dictionaries.
-                directives._directives = {}
-                roles._roles = {}
+                directives._language_directives.clear()
+                roles._language_roles.clear()
                 with self.subTest(id=f'totest[{name!r}][{casenum}]'):
                     document = new_document('test data', settings.copy())
                     parser.parse(case_input, document)
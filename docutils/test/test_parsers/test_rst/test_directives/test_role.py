@@ -18,7 +18,7 @@
     sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
 
 from docutils.frontend import get_default_settings
-from docutils.parsers.rst import Parser, roles
+from docutils.parsers.rst import Parser
 from docutils.utils import new_document
 
 
@@ -29,11 +29,6 @@ def test_parser(self):
         settings.warning_stream = ''
         for name, cases in totest.items():
             for casenum, (case_input, case_expected) in enumerate(cases):
-                # Language-specific roles and roles added by the
-                # "default-role" and "role" directives are currently stored
-                # globally in the roles._roles dictionary.  This workaround
-                # empties that dictionary.
-                roles._roles = {}
                 with self.subTest(id=f'totest[{name!r}][{casenum}]'):
                     document = new_document('test data', settings.copy())
                     parser.parse(case_input, document)
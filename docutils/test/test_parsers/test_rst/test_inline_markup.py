@@ -18,7 +18,7 @@
     sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from docutils.frontend import get_default_settings
-from docutils.parsers.rst import Parser
+from docutils.parsers.rst import Parser, languages, states
 from docutils.utils import new_document
 
 
@@ -36,6 +36,48 @@ def test_parser(self):
                     self.assertEqual(output, case_expected)
 
 
+class InlinerPatternsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = get_default_settings(Parser)
+
+    def test_cached(self):
+        patterns = states.Inliner.compiled_patterns(self.settings)
+        self.assertIs(states.Inliner.compiled_patterns(self.settings),
+                      patterns)
+        self.settings.character_level_inline_markup = True
+        self.assertIsNot(states.Inliner.compiled_patterns(self.settings),
+                         patterns)
+
+    def test_shared(self):
+        inliner1, inliner2 = states.Inliner(), states.Inliner()
+        inliner1.init_customizations(self.settings)
+        inliner2.init_customizations(self.settings)
+        self.assertIs(inliner1.patterns.initial, inliner2.patterns.initial)
+        self.assertIsNot(inliner1.patterns, inliner2.patterns)
+
+    def test_reused_inliner(self):
+        inliner = states.Inliner()
+        self.settings.pep_references = True
+        inliner.init_customizations(self.settings)
+        self.assertEqual(len(inliner.implicit_dispatch), 2)
+        self.settings.pep_references = False
+        inliner.init_customizations(self.settings)
+        self.assertEqual(inliner.implicit_dispatch,
+                         [(inliner.patterns.uri, inliner.standalone_uri)])
+
+    def test_memo_without_document_roles(self):
+        document = new_document('test data', self.settings)
+        inliner = states.Inliner()
+        inliner.init_customizations(self.settings)
+        memo = states.Struct(document=document,
+                             reporter=document.reporter,
+                             language=languages.get_language('en'))
+        nodes, messages = inliner.parse(':emphasis:`text`', 1, memo, document)
+        self.assertEqual(messages, [])
+        self.assertEqual(nodes[0].pformat(), '<emphasis>\n    text\n')
+
+
 totest = {}
 
 totest['emphasis'] = [
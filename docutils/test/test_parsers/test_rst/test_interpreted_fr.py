@@ -31,11 +31,10 @@ def test_parser(self):
         settings.language_code = 'fr'
         for name, cases in totest.items():
             for casenum, (case_input, case_expected) in enumerate(cases):
-                # Language-specific roles and roles added by the
-                # "default-role" and "role" directives are currently stored
-                # globally in the roles._roles dictionary.  This workaround
+                # Language-specific roles are cached globally in the
+                # roles._language_roles dictionary.  This workaround
                 # empties that dictionary.
-                roles._roles = {}
+                roles._language_roles.clear()
                 with self.subTest(id=f'totest[{name!r}][{casenum}]'):
                     document = new_document('test data', settings.copy())
                     parser.parse(case_input, document)
@@ -13,6 +13,7 @@
 from pathlib import Path
 import sys
 import unittest
+from unittest.mock import patch
 
 if __name__ == '__main__':
     # prepend the "docutils root" to the Python library path
@@ -20,7 +21,7 @@
     sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from docutils.frontend import get_default_settings
-from docutils.parsers.rst import Parser
+from docutils.parsers.rst import Parser, states
 from docutils.utils import new_document
 
 # TEST_ROOT is ./test/ from the docutils root
@@ -42,6 +43,61 @@ def test_parser(self):
                     self.assertEqual(output, case_expected)
 
 
+class PlainCellTestCase(unittest.TestCase):
+    """Table cells without block markup are parsed without nested parse."""
+
+    source = """\
++--------+-------------+---------+----------+
+| 42     | *emph* [#]_ | ``lit`` | unknown_ |
++--------+-------------+---------+----------+
+| - one  | two lines   | 1.      | -5       |
+|        | of text     |         |          |
++--------+-------------+---------+----------+
+| text:: | a           | b       | c        |
+|        |             |         |          |
+|        | d           |         |          |
++--------+-------------+---------+----------+
+
+.. [#] footnote
+
+.. csv-table::
+
+   1, "two, three", *four*
+"""
+
+    def parse(self):
+        settings = get_default_settings(Parser)
+        settings.warning_stream = ''
+        settings.halt_level = 5
+        document = new_document('test data', settings)
+        Parser().parse(self.source, document)
+        return document
+
+    def dump(self, document):
+        return [(node.pformat(), node.source, node.line)
+                for node in document.findall(include_self=False)]
+
+    def test_plain_cells(self):
+        texts = []
+        plain_paragraph_text = states.Body.plain_paragraph_text
+
+        def spy(state, block):
+            texts.append(plain_paragraph_text(state, block))
+            return texts[-1]
+
+        with patch.object(states.Body, 'plain_paragraph_text', spy):
+            fast = self.parse()
+        self.assertEqual(['42', '*emph* [#]_', '``lit``', 'unknown_',
+                          None, 'two lines\nof text', None, None,
+                          None, None, 'b', 'c',
+                          '1', 'two, three', '*four*'], texts)
+        with patch.object(states.Body, 'plain_paragraph_text',
+                          return_value=None):
+            slow = self.parse()
+        # the same document tree, including source and line numbers
+        self.assertEqual(self.dump(slow), self.dump(fast))
+
+
 mydir = os.path.join(TEST_ROOT, 'test_parsers/test_rst')
 include2 = os.path.join(mydir, 'test_directives/include2.txt')
 
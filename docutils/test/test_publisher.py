@@ -7,11 +7,15 @@
 """
 Test the `Publisher` facade and the ``publish_*`` convenience functions.
 """
+import json
 import os.path
 import pickle
 from pathlib import Path
 import sys
+import tempfile
+import threading
 import unittest
+from unittest import mock
 
 if __name__ == '__main__':
     # prepend the "docutils root" to the Python library path
@@ -20,6 +24,8 @@
 
 import docutils
 from docutils import core, nodes
+from docutils.parsers import rst
+from docutils.utils import doctree_cache, timing
 
 # DATA_ROOT is ./test/data/ from the docutils root
 DATA_ROOT = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'data')
@@ -239,5 +245,337 @@ def test_publish_pickle(self):
         self.assertEqual(output, pseudoxml_output)
 
 
+class DoctreeCacheTests(unittest.TestCase):
+
+    source = """\
+.. contents::
+
+Section
+=======
+
+.. include:: %s
+"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmpdir.name, 'cache')
+        self.include_path = os.path.join(self.tmpdir.name, 'include.txt')
+        self.write_include('Included paragraph.\n')
+        self.parser = rst.Parser()
+        self.parse_calls = 0
+        parse = self.parser.parse
+
+        def counting_parse(*args):
+            self.parse_calls += 1
+            parse(*args)
+        self.parser.parse = counting_parse
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_include(self, text):
+        with open(self.include_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def publish(self, source=None, **settings):
+        return core.publish_string(
+            source or self.source % self.include_path, parser=self.parser,
+            writer_name='pseudoxml',
+            settings_overrides={'_disable_config': True,
+                                'doctree_cache_dir': self.cache_dir,
+                                'output_encoding': 'unicode',
+                                'warning_stream': '',
+                                **settings})
+
+    def test_cache(self):
+        output = self.publish()
+        self.assertEqual(self.parse_calls, 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        # unchanged input: no parsing, identical output
+        self.assertEqual(self.publish(), output)
+        self.assertEqual(self.parse_calls, 1)
+        # changed dependency: parse again
+        self.write_include('Changed included paragraph.\n')
+        self.assertIn('Changed included paragraph.', self.publish())
+        self.assertEqual(self.parse_calls, 2)
+        self.publish()
+        self.assertEqual(self.parse_calls, 2)
+
+    def test_timing_report_ignored(self):
+        self.publish()
+        report_path = os.path.join(self.tmpdir.name, 'timing.json')
+        self.publish(timing_report=report_path)
+        self.assertEqual(self.parse_calls, 1)
+        self.assertTrue(os.path.exists(report_path))
+
+    def test_no_caching_with_system_messages(self):
+        self.publish('.. unknown-directive::')
+        self.publish('.. unknown-directive::')
+        self.assertEqual(self.parse_calls, 2)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_size_limit(self):
+        cache = doctree_cache.DoctreeCache(self.cache_dir, max_size=0)
+        cache.store('test', {'dependencies': []})
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_eviction_without_rescan(self):
+        cache = doctree_cache.DoctreeCache(self.cache_dir)
+        cache.store('first', {'dependencies': []})
+        size = os.path.getsize(cache.path('first'))
+        cache.max_size = 2 * size
+        with mock.patch('os.scandir') as scandir:
+            for key in ('second', 'third', 'fourth'):
+                cache.store(key, {'dependencies': []})
+            self.assertIsNotNone(cache.load('third'))
+            cache.store('fifth', {'dependencies': []})
+        scandir.assert_not_called()
+        self.assertEqual(sorted(os.listdir(self.cache_dir)),
+                         ['fifth.doctree', 'third.doctree'])
+
+    def test_shared_instance(self):
+        cache = doctree_cache.DoctreeCache.get(self.cache_dir, 1)
+        self.assertIs(doctree_cache.DoctreeCache.get(self.cache_dir, 2),
+                      cache)
+        self.assertEqual(cache.max_size, 2 * 2**20)
+
+
+class TimingReportTests(unittest.TestCase):
+
+    source = """\
+Title
+=====
+
+.. note:: A note.
+
+.. Note:: Another note.
+
+.. unknown-directive::
+"""
+
+    def test_timing_attribute(self):
+        publisher = core.Publisher(source_class=docutils.io.StringInput,
+                                   destination_class=docutils.io.StringOutput)
+        publisher.set_components('standalone', 'restructuredtext', 'html5')
+        publisher.process_programmatic_settings(
+            None, {'_disable_config': True,
+                   'warning_stream': docutils.io.NullOutput()}, None)
+        publisher.set_source(self.source)
+        publisher.set_destination()
+        publisher.timing = timing.TimingReport()
+        publisher.publish()
+        report = publisher.timing.as_dict()
+        self.assertEqual(list(report['phases']),
+                         ['read', 'parse', 'transform', 'translate', 'write',
+                          'assemble parts'])
+        self.assertIn('docutils.transforms.frontmatter.DocTitle',
+                      [t['transform'] for t in report['transforms']])
+        self.assertEqual(report['directives']['note']['count'], 2)
+        # INFO: "No directive entry for "unknown-directive"..."
+        self.assertEqual(report['system_messages'], {'INFO': 1, 'ERROR': 1})
+        self.assertEqual(report['nodes']['parse']['section'], 1)
+        self.assertNotIn('section', report['nodes']['transform'])
+
+    def test_timing_report_setting(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'timing.json')
+            core.publish_string(self.source,
+                                settings_overrides={
+                                    '_disable_config': True,
+                                    'warning_stream': '',
+                                    'timing_report': path})
+            with open(path, encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertEqual(report['nodes']['transform']['title'], 1)
+        self.assertGreaterEqual(report['phases']['parse']['cpu'], 0)
+
+    def test_disabled(self):
+        doctree = core.publish_doctree(
+                      self.source, settings_overrides={'_disable_config': True,
+                                                       'warning_stream': ''})
+        self.assertIsNone(doctree.settings._timing)
+
+
+class ConcurrentPublishingTests(unittest.TestCase):
+    """Documents published in parallel threads must not interfere."""
+
+    sources = [
+        # local default role and custom role
+        '.. default-role:: strong\n\n'
+        '.. role:: custom(emphasis)\n\n'
+        '`default` and :custom:`custom` and "quoted"\n',
+        # plain document: standard default role, no custom role
+        '`default` and :custom:`custom` and "quoted"\n',
+        # custom quotes
+        '`default` and "quoted" and \'quoted\'\n',
+        # nested parsing: lists, directive content, table of contents
+        '.. contents::\n\n'
+        + ''.join(f'Section {i}\n==========\n\n'
+                  f'* item {i}\n\n  - nested item\n\n'
+                  f':field {i}: value\n\n'
+                  f'.. note:: Note {i}\n\n   1. enumerated\n\n'
+                  for i in range(8)),
+        ]
+    settings = [
+        {},
+        {'language_code': 'de'},
+        {'smartquotes_locales': [('en', '<>{}')]},
+        {},
+        ]
+
+    def publish(self, index):
+        overrides = {'_disable_config': True,
+                     'warning_stream': '',
+                     'smart_quotes': True,
+                     **self.settings[index]}
+        return core.publish_string(self.sources[index],
+                                   writer_name='pseudoxml',
+                                   settings_overrides=overrides)
+
+    def test_threads(self):
+        expected = [self.publish(i) for i in range(len(self.sources))]
+        results = []
+        errors = []
+
+        def worker():
+            try:
+                for i in range(60):
+                    index = i % len(self.sources)
+                    results.append((index, self.publish(index)))
+            except Exception as error:
+                errors.append(error)
+
+        # switch threads often to provoke interference
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 240)
+        for index, output in results:
+            self.assertEqual(output, expected[index])
+        # directive-defined roles are local to the document
+        self.assertIn(b'<strong>', expected[0])
+        self.assertNotIn(b'<strong>', expected[1])
+        self.assertIn(b'<quoted> and {quoted}', expected[2])
+        self.assertIn(b'<topic classes="contents"', expected[3])
+
+
+class RendererTests(unittest.TestCase):
+
+    settings_overrides = {'_disable_config': True,
+                          'warning_stream': ''}
+
+    def test_output(self):
+        renderer = core.Renderer(writer_name='html5',
+                                 settings_overrides=self.settings_overrides)
+        for source in (test_document, '.. default-role:: strong\n\n`a`',
+                       '`a`', test_document):
+            parts = renderer.publish_parts(source)
+            self.assertEqual(
+                parts, core.publish_parts(
+                           source, writer_name='html5',
+                           settings_overrides=self.settings_overrides))
+        self.assertEqual(
+            renderer.publish_string(test_document),
+            core.publish_string(test_document,
+                                settings_overrides=self.settings_overrides,
+                                writer_name='html5'))
+
+    def test_components_reused(self):
+        renderer = core.Renderer(settings_overrides=self.settings_overrides)
+        components = renderer._idle[:]
+        parser = components[0][1]
+        renderer.publish_string('test')
+        statemachine = parser.statemachine
+        renderer.publish_string('*test*')
+        self.assertEqual(renderer._idle, components)
+        self.assertIs(parser.statemachine, statemachine)
+
+    def test_settings_not_modified(self):
+        renderer = core.Renderer(settings_overrides=self.settings_overrides)
+        renderer.publish_string('test', source_path='test.txt')
+        self.assertIsNone(renderer.settings._source)
+        self.assertNotIn('_timing', renderer.settings.__dict__)
+
+    def test_dependencies_not_shared(self):
+        include_path = os.path.join(DATA_ROOT, 'include.txt')
+        renderer = core.Renderer(settings_overrides=self.settings_overrides)
+        writer = renderer._idle[0][2]
+        renderer.publish_string(f'.. include:: {include_path}\n')
+        self.assertEqual(writer.document.settings.record_dependencies.list,
+                         [docutils.utils.relative_path(None, include_path)])
+        renderer.publish_string('test')
+        self.assertEqual(writer.document.settings.record_dependencies.list,
+                         [])
+        self.assertEqual(renderer.settings.record_dependencies.list, [])
+
+    def test_dependencies_recorded(self):
+        include_path = os.path.join(DATA_ROOT, 'include.txt')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            record_path = os.path.join(tmpdir, 'dependencies.txt')
+            dependencies = docutils.utils.DependencyList(record_path)
+            renderer = core.Renderer(settings_overrides={
+                                         **self.settings_overrides,
+                                         'record_dependencies': dependencies})
+            renderer.publish_string(f'.. include:: {include_path}\n')
+            renderer.publish_string('test')
+            dependencies.close()
+            with open(record_path, encoding='utf-8') as f:
+                self.assertEqual(
+                    f.read(),
+                    docutils.utils.relative_path(None, include_path) + '\n')
+
+    def test_threads(self):
+        sources = [test_document, *ConcurrentPublishingTests.sources]
+        renderer = core.Renderer(writer_name='html5',
+                                 settings_overrides=self.settings_overrides)
+        expected = [renderer.publish_string(source) for source in sources]
+        results = []
+        errors = []
+
+        def worker():
+            try:
+                for i in range(40):
+                    index = i % len(sources)
+                    results.append(
+                        (index, renderer.publish_string(sources[index])))
+            except Exception as error:
+                errors.append(error)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 160)
+        for index, output in results:
+            self.assertEqual(output, expected[index])
+
+    def test_exception(self):
+        renderer = core.Renderer(settings_overrides={
+                                     **self.settings_overrides,
+                                     'halt_level': 2})
+        with self.assertRaises(docutils.utils.SystemMessage):
+            renderer.publish_string('`unclosed')
+        self.assertEqual(renderer._idle, [])  # components discarded
+        self.assertEqual(renderer.publish_string('test'),
+                         core.publish_string(
+                             'test',
+                             settings_overrides=self.settings_overrides))
+
+
 if __name__ == '__main__':
     unittest.main()
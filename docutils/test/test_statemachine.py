@@ -279,6 +279,33 @@ def test_make_transitions(self):
                                     self.state.__class__.__name__),
                            'nop3': (dummy, self.state.nop3, 'bogus')}))
 
+    def test_combined_pattern(self):
+        self.state.patterns = {'line': r'([=-])\1* *$',
+                               'named': r'(?P<char>[=-])(?P=char)(?P=char)x',
+                               'verbose': re.compile(r'(\w) # comment',
+                                                     re.VERBOSE),
+                               'other': re.compile(r'\.Z', re.IGNORECASE)}
+        self.state.line = self.state.named = self.state.nop
+        self.state.verbose = self.state.other = self.state.nop
+        names, transitions = self.state.make_transitions(
+                                 ['line', 'named', 'verbose', 'other'])
+        self.state.add_transitions(names, transitions)
+        pattern, group_names = self.state.combined_pattern(names)
+        for line, name in (('====', 'line'), ('---x', 'named'),
+                           ('-=-x', None), ('word', 'verbose'),
+                           ('.z', 'other'), ('', None)):
+            match = pattern.match(line)
+            if match:
+                self.assertEqual(group_names[match.lastindex], name)
+            else:
+                self.assertIsNone(name)
+        # no combination for less than two transitions
+        self.assertIsNone(self.state.combined_pattern(['line']))
+        # the cache is reset when transitions change
+        self.state.remove_transition('line')
+        pattern, group_names = self.state.combined_pattern(['named', 'other'])
+        self.assertEqual(group_names[pattern.match('.z').lastindex], 'other')
+
 
 class MiscTests(unittest.TestCase):
 
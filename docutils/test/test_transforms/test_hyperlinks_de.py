@@ -32,12 +32,12 @@ def setUp(self):
         """
         The "info" system-messages for directive fallbacks are only generated
         once (the name -> directive mapping is cached in
-        ``docutils.parsers.rst.directives._directives``), so we need to reset
-        the cache before running this test.
+        ``docutils.parsers.rst.directives._language_directives``), so we
+        need to reset the cache before running this test.
 
         See also https://sourceforge.net/p/docutils/feature-requests/71/
         """
-        directives._directives.clear()
+        directives._language_directives.clear()
         get_language.cache.clear()
 
     def test_transforms(self):
@@ -18,7 +18,7 @@
     sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 import docutils
-from docutils import core, nodes, writers
+from docutils import core, nodes, utils, writers
 
 
 stop_traversal_input = '''
@@ -79,5 +79,113 @@ def test_stop_traversal(self):
             writer=AttentiveWriter())
 
 
+class RecordingVisitor(nodes.SparseNodeVisitor):
+    """Record the visits and departures, raise exceptions from `plan`."""
+
+    def __init__(self, document, plan):
+        super().__init__(document)
+        self.plan = plan
+        self.log = []
+
+    def unknown_visit(self, node):
+        self.record('visit', node)
+
+    def unknown_departure(self, node):
+        self.record('depart', node)
+
+    def record(self, action, node):
+        name = node['names'][0]
+        self.log.append(f'{action} {name}')
+        if (action, name) in self.plan:
+            raise self.plan[action, name]
+
+
+class TraversalTests(unittest.TestCase):
+
+    def setUp(self):
+        # a(b(c, d), e(f), g)
+        self.document = utils.new_document('test')
+        self.tree = nodes.Element(names=['a'])
+        b = nodes.Element('', nodes.Element(names=['c']),
+                          nodes.Element(names=['d']), names=['b'])
+        e = nodes.Element('', nodes.Element(names=['f']), names=['e'])
+        self.tree += [b, e, nodes.Element(names=['g'])]
+
+    def walkabout(self, **plan):
+        plan = {tuple(key.split('_')): value for key, value in plan.items()}
+        visitor = RecordingVisitor(self.document, plan)
+        stop = self.tree.walkabout(visitor)
+        return ' '.join(line.replace('visit ', '+').replace('depart ', '-')
+                        for line in visitor.log), stop
+
+    def test_walkabout(self):
+        self.assertEqual(self.walkabout(),
+                         ('+a +b +c -c +d -d -b +e +f -f -e +g -g -a', False))
+
+    def test_skip_node(self):
+        self.assertEqual(self.walkabout(visit_b=nodes.SkipNode),
+                         ('+a +b +e +f -f -e +g -g -a', False))
+
+    def test_skip_children(self):
+        self.assertEqual(self.walkabout(visit_b=nodes.SkipChildren),
+                         ('+a +b -b +e +f -f -e +g -g -a', False))
+
+    def test_skip_siblings(self):
+        self.assertEqual(self.walkabout(visit_c=nodes.SkipSiblings),
+                         ('+a +b +c -b +e +f -f -e +g -g -a', False))
+        self.assertEqual(self.walkabout(depart_c=nodes.SkipSiblings),
+                         ('+a +b +c -c -b +e +f -f -e +g -g -a', False))
+
+    def test_skip_departure(self):
+        self.assertEqual(self.walkabout(visit_b=nodes.SkipDeparture),
+                         ('+a +b +c -c +d -d +e +f -f -e +g -g -a', False))
+
+    def test_stop_traversal(self):
+        self.assertEqual(self.walkabout(visit_c=nodes.StopTraversal),
+                         ('+a +b +c -c -b -a', True))
+        # from a departure: the parent's other children are skipped
+        self.assertEqual(self.walkabout(depart_f=nodes.StopTraversal),
+                         ('+a +b +c -c +d -d -b +e +f -f -e -a', True))
+
+    def test_walk(self):
+        visitor = RecordingVisitor(self.document,
+                                   {('visit', 'c'): nodes.SkipSiblings,
+                                    ('visit', 'e'): nodes.SkipNode,
+                                    ('visit', 'g'): nodes.StopTraversal})
+        self.assertTrue(self.tree.walk(visitor))
+        self.assertEqual(visitor.log, ['visit a', 'visit b', 'visit c',
+                                       'visit e', 'visit g'])
+
+    def test_deeply_nested(self):
+        # no recursion limit
+        element = root = nodes.Element(names=['root'])
+        depth = sys.getrecursionlimit() + 10
+        for i in range(depth):
+            element.children.append(nodes.Element(names=[str(i)]))
+            element = element.children[-1]
+        visitor = RecordingVisitor(self.document, {})
+        root.walkabout(visitor)
+        self.assertEqual(len(visitor.log), 2 * (depth + 1))
+        self.assertEqual(visitor.log[-1], 'depart root')
+
+    def test_dispatch_override(self):
+        # an overridden `dispatch_visit()` is called for every node
+        class Visitor(nodes.SparseNodeVisitor):
+            visited = []
+
+            def dispatch_visit(self, node):
+                self.visited.append(node['names'][0])
+                return super().dispatch_visit(node)
+
+            def unknown_visit(self, node):
+                pass
+
+            def unknown_departure(self, node):
+                pass
+
+        self.tree.walkabout(Visitor(self.document))
+        self.assertEqual(Visitor.visited, list('abcdefg'))
+
+
 if __name__ == '__main__':
     unittest.main()
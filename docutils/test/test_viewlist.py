@@ -17,7 +17,7 @@
     # so we import the local `docutils` package.
     sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from docutils import statemachine
+from docutils import statemachine, utils
 
 
 class ViewListTests(unittest.TestCase):
@@ -72,9 +72,10 @@ def test_special_class_methods(self):
         aa = self.a * 2
         self.assertEqual(aa, self.a_list * 2)
         self.assertEqual(aa.items, self.a.items * 2)
+        items = self.a.items + self.b.items
         self.a += self.b
         self.assertEqual(self.a, self.a_list + self.b_list)
-        # self.assertEqual(self.a.items, self.a.items + self.b.items)
+        self.assertEqual(self.a.items, items)
 
     def test_get_slice(self):
         a = self.a[1:-1]
@@ -180,6 +181,61 @@ def test_sort(self):
         c.sort()
         self.assertEqual(self.c, c)
 
+    def test_shared_storage(self):
+        # slices share the parent's storage until one of them is changed
+        a = statemachine.ViewList(self.a_list, 'a')
+        s = a[1:-1]
+        self.assertIs(s._data, a._data)
+        s.trim_start(1)
+        s.trim_end(1)
+        self.assertIs(s._data, a._data)
+        self.assertEqual(s, self.a_list[2:-2])
+        # changing the child changes the parent
+        s[0] = 'x'
+        self.assertIsNot(s._data, a._data)
+        self.assertEqual(a[2], 'x')
+        # changing the parent does not affect active child lists
+        t = a[:3]
+        a[0] = 'y'
+        self.assertEqual(t, ['a', 'b', 'x'])
+        self.assertEqual(a[:3], ['y', 'b', 'x'])
+
+    def test_compact_items(self):
+        ab = self.a + self.b
+        self.assertEqual(len(ab._spans.starts), 2)
+        s = ab[3:-1]
+        self.assertEqual(len(s._spans.starts), 2)
+        self.assertEqual(s.info(0), ('a', 3))
+        self.assertEqual(s.info(-1), ('b', 3))
+        del s[1]
+        self.assertEqual(len(s._spans.starts), 3)
+        self.assertEqual(s.items, [('a', 3), ('a', 5), ('a', 6),
+                                   ('b', 0), ('b', 1), ('b', 2), ('b', 3)])
+        # items given explicitly may have non-integer offsets
+        d = statemachine.ViewList(['x', 'y'], items=[('d', None), ('d', 1)])
+        self.assertEqual(d.items, [('d', None), ('d', 1)])
+
+    def test_modify_items(self):
+        a = statemachine.ViewList(self.a[:])
+        items = a.items
+        items[1] = ('x', 0)
+        self.assertEqual(a.info(1), ('x', 0))
+        self.assertEqual(a.items[:3], [('a', 0), ('x', 0), ('a', 2)])
+        del items[-1]
+        items.append(('y', 5))
+        self.assertEqual(a.info(-1), ('y', 5))
+        items.insert(0, ('z', 1))
+        del items[1]
+        self.assertEqual(a.info(0), ('z', 1))
+        items[2:4] = [('w', 0), ('w', 1)]
+        self.assertEqual(list(a.items),
+                         [('z', 1), ('x', 0), ('w', 0), ('w', 1)]
+                         + [('a', i) for i in range(4, len(self.a_list) - 1)]
+                         + [('y', 5)])
+        self.assertEqual(len(a.items), len(a))
+        with self.assertRaises(IndexError):
+            items[len(a)] = ('x', 0)
+
 
 class StringList(unittest.TestCase):
 
@@ -215,6 +271,18 @@ def test_get_indented(self):
         self.assertEqual(block.get_indented(),
                          ([s[6:] for s in block], 6, 1))
 
+    def test_get_2D_block(self):
+        block = statemachine.StringList(['| a   | b |',
+                                         '| t\u0306ab | c |'], 'b')
+        cell = block.get_2D_block(0, 1, 2, 6)
+        self.assertEqual(['a', 't\u0306ab'], cell)
+        self.assertEqual([('b', 0), ('b', 1)], cell.items)
+        # precomputed column indices
+        ci = [None, utils.column_indices(block[1])]
+        self.assertEqual(cell, block.get_2D_block(0, 1, 2, 6,
+                                                  column_indices=ci))
+        self.assertEqual(['b', 'c'], block.get_2D_block(0, 7, 2, 10))
+
 
 if __name__ == '__main__':
     unittest.main()
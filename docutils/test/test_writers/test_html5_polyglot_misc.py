@@ -11,14 +11,17 @@
 import os
 from pathlib import Path
 import sys
+import tempfile
 import unittest
+from unittest.mock import patch
 
 if __name__ == '__main__':
     # prepend the "docutils root" to the Python library path
     # so we import the local `docutils` package.
     sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-from docutils import core
+from docutils import core, io
+from docutils.writers import _html_base
 
 # TEST_ROOT is ./test/ from the docutils root
 TEST_ROOT = os.path.abspath(os.path.join(__file__, '..', '..'))
@@ -242,5 +245,50 @@ def test_math_output_mathjax_no_math(self):
         self.assertNotIn('MathJax', head)
 
 
+class StreamOutputTestCase(unittest.TestCase):
+    """Test the stream_output setting (identical output in chunks)."""
+
+    source = os.path.join(TEST_ROOT, 'functional', 'input',
+                          'standalone_rst_html5.txt')
+
+    def publish(self, writer_name, **settings):
+        settings.update(_disable_config=True, report_level=5)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            destination = os.path.join(tmpdir, 'out.html')
+            publisher = core.Publisher(destination_class=io.FileOutput)
+            publisher.set_components('standalone', 'restructuredtext',
+                                     writer_name)
+            publisher.process_programmatic_settings(None, settings, None)
+            publisher.set_source(source_path=self.source)
+            publisher.set_destination(destination_path=destination)
+            output = publisher.publish()
+            with open(destination, 'rb') as f:
+                return f.read(), output, publisher.writer.parts
+
+    def test_identical_output(self):
+        # flush the body to the spool as often as possible
+        with patch.object(_html_base.HTMLTranslator, 'spool_threshold', 1):
+            for writer_name in ('html4css1', 'html5_polyglot', 's5_html'):
+                for encoding in ('utf-8', 'utf-16'):
+                    expected, output, parts = self.publish(
+                        writer_name, output_encoding=encoding)
+                    self.assertTrue(parts['body'])
+                    streamed, output, parts = self.publish(
+                        writer_name, output_encoding=encoding,
+                        stream_output=True)
+                    self.assertEqual(streamed, expected)
+                    self.assertIsNone(output)
+                    self.assertIsNone(parts['body'])
+                    self.assertIsNone(parts['whole'])
+                    self.assertTrue(parts['head'])
+
+    def test_string_output(self):
+        # stream_output is ignored when writing to a string
+        parts = core.publish_parts('test', writer_name='html5_polyglot',
+                                   settings_overrides={'_disable_config': True,
+                                                       'stream_output': True})
+        self.assertEqual(parts['body'], '<p>test</p>\n')
+
+
 if __name__ == '__main__':
     unittest.main()
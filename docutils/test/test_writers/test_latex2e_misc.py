@@ -18,7 +18,8 @@
 
 import unittest
 
-from docutils import core
+from docutils import core, frontend, utils
+from docutils.writers import latex2e
 
 contents_test_input = """\
 .. contents:: TOC
@@ -103,5 +104,50 @@ def test_future_warnings(self):
                                 settings_overrides=settings)
 
 
+class EncodeTestCase(unittest.TestCase):
+
+    def translator(self, **settings_overrides):
+        settings = frontend.get_default_settings(latex2e.Writer)
+        settings.update({'use_latex_citations': False,
+                         'legacy_column_widths': True,
+                         'tab_width': 8,
+                         **settings_overrides}, frontend.OptionParser())
+        document = utils.new_document('test data', settings)
+        return latex2e.LaTeXTranslator(document)
+
+    def test_encode(self):
+        translator = self.translator(font_encoding='OT1')
+        self.assertEqual(r'a\_b -{}-{}- \textbar{} \%',
+                         translator.encode('a_b --- | %'))
+        translator.literal = True
+        self.assertEqual(r'a\underline{~}b -{}-{}- | ,{},',
+                         translator.encode('a_b --- | ,,'))
+        self.assertIn('graphicx', translator.requirements)
+        translator.literal = False
+        translator.inside_citation_reference_label = True
+        self.assertEqual('a_b', translator.encode('a_b'))
+        translator.verbatim = True
+        self.assertEqual('a_b --- |', translator.encode('a_b --- |'))
+
+    def test_encode_table_cache(self):
+        translator = self.translator()
+        translator.encode('x')
+        translator.encode('y')
+        translator.alltt = True
+        translator.encode('z')
+        self.assertEqual(2, len(translator._encode_tables))
+
+    def test_encode_requirements(self):
+        translator = self.translator(output_encoding='utf-8')
+        self.assertEqual('\\ding{51} \u2002 \u2030',
+                         translator.encode('\u2713 \u2002 \u2030'))
+        self.assertIn('pifont', translator.requirements)
+        self.assertIn('_inputenc8194', translator.requirements)
+        translator = self.translator(output_encoding='latin-1')
+        self.assertEqual(r'\ding{51} \enskip \textperthousand{}',
+                         translator.encode('\u2713 \u2002 \u2030'))
+        self.assertNotIn('_inputenc8194', translator.requirements)
+
+
 if __name__ == '__main__':
     unittest.main()
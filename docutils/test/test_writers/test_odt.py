@@ -33,8 +33,11 @@
 from io import BytesIO
 from pathlib import Path
 import os
+import shutil
 import sys
+import tempfile
 import unittest
+from unittest.mock import patch
 import xml.etree.ElementTree as etree
 import zipfile
 
@@ -45,6 +48,7 @@
 
 import docutils
 import docutils.core
+from docutils.writers import odf_odt
 
 # FUNCTIONAL_ROOT is ./test/functional/ from the docutils root
 FUNCTIONAL_ROOT = os.path.abspath(os.path.join(__file__, '..', '..', 'functional'))
@@ -183,6 +187,91 @@ def test_odt_raw(self):
     # def test_odt_xxxx(self):
     #     self.process_test('odt_xxxx.txt', 'odt_xxxx.odt')
 
+
+class StylesheetTemplateTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.stylesheet = os.path.join(self.tmpdir.name, 'styles.odt')
+        shutil.copy(os.path.join(os.path.dirname(odf_odt.__file__),
+                                 'styles.odt'), self.stylesheet)
+        cache = patch.object(odf_odt.StylesheetTemplate, 'cache', {})
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def publish(self, language_code='en-US'):
+        return docutils.core.publish_string(
+            source='A paragraph.', writer_name='odf_odt',
+            settings_overrides={'_disable_config': True,
+                                'stylesheet': self.stylesheet,
+                                'language_code': language_code})
+
+    def read_zip(self, payload, filename):
+        with zipfile.ZipFile(BytesIO(payload)) as zfile:
+            return zfile.read(filename)
+
+    def test_cache(self):
+        with patch.object(odf_odt.StylesheetTemplate, '__init__',
+                          autospec=True,
+                          side_effect=odf_odt.StylesheetTemplate.__init__
+                          ) as init:
+            self.publish()
+            result = self.publish('de-AT')
+            self.assertEqual(1, init.call_count)
+        template = odf_odt.StylesheetTemplate.get(self.stylesheet)
+        # the cached style tree is not modified by the documents
+        self.assertEqual(etree.tostring(etree.fromstring(template.styles)),
+                         etree.tostring(template.dom_styles))
+        styles = self.read_zip(result, 'styles.xml')
+        self.assertIn(b':language="de"', styles)
+        self.assertIn(b':country="AT"', styles)
+        self.assertEqual(self.read_zip(result, 'settings.xml'),
+                         template.settings)
+
+    def test_changed_stylesheet(self):
+        self.publish()
+        template = odf_odt.StylesheetTemplate.get(self.stylesheet)
+        with zipfile.ZipFile(self.stylesheet, 'a') as zfile:
+            zfile.writestr('Pictures/dummy.png', b'dummy')
+        self.assertIsNot(template,
+                         odf_odt.StylesheetTemplate.get(self.stylesheet))
+        result = self.publish()
+        self.assertEqual(b'dummy',
+                         self.read_zip(result, 'Pictures/dummy.png'))
+
+
+class PackageTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        image = os.path.join(FUNCTIONAL_ROOT, '..', '..', 'docs', 'user',
+                             'rst', 'images', 'title.png')
+        for name in ('a.png', 'b.png'):
+            shutil.copy(image, os.path.join(self.tmpdir.name, name))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_images(self):
+        source = ''.join(f'.. image:: {self.tmpdir.name}/{name}\n\n'
+                         for name in ('a.png', 'b.png', 'a.png'))
+        result = docutils.core.publish_string(
+            source=source, writer_name='odf_odt',
+            settings_overrides={'_disable_config': True})
+        with zipfile.ZipFile(BytesIO(result)) as zfile:
+            pictures = [info for info in zfile.infolist()
+                        if info.filename.endswith('a.png')]
+            content = zfile.read('content.xml').decode()
+        # identical images are stored once, without compression
+        self.assertEqual(1, len(pictures))
+        self.assertEqual(zipfile.ZIP_STORED, pictures[0].compress_type)
+        self.assertEqual(3, content.count(pictures[0].filename))
+        self.assertNotIn('b.png', content)
+
+
 # -----------------------------------------------------------------
 
 
@@ -8,8 +8,10 @@
 Test for pseudo-XML writer.
 """
 
+import os.path
 from pathlib import Path
 import sys
+import tempfile
 import unittest
 
 if __name__ == '__main__':
@@ -17,8 +19,12 @@
     # so we import the local `docutils` package.
     sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from docutils import core, io
 from docutils.core import publish_string
 
+# TEST_ROOT is ./test/ from the docutils root
+TEST_ROOT = Path(__file__).resolve().parents[1]
+
 
 class WriterPublishTestCase(unittest.TestCase):
     maxDiff = None
@@ -56,6 +62,49 @@ def test_publish(self):
                     self.assertEqual(output, case_expected)
 
 
+class StreamOutputTestCase(unittest.TestCase):
+    """Test the stream_output setting (identical output in chunks)."""
+
+    source = TEST_ROOT / 'functional' / 'input' / 'data' / 'standard.txt'
+
+    def publish(self, **settings):
+        settings.update(_disable_config=True, report_level=5)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            destination = os.path.join(tmpdir, 'out.txt')
+            publisher = core.Publisher(destination_class=io.FileOutput)
+            publisher.set_components('standalone', 'restructuredtext',
+                                     'pseudoxml')
+            publisher.process_programmatic_settings(None, settings, None)
+            publisher.set_source(source_path=self.source.as_posix())
+            publisher.set_destination(destination_path=destination)
+            output = publisher.publish()
+            with open(destination, 'rb') as f:
+                return f.read(), output, publisher.writer.parts
+
+    def test_identical_output(self):
+        for encoding in ('utf-8', 'utf-16'):
+            for detailed in (False, True):
+                expected, output, parts = self.publish(
+                    output_encoding=encoding, detailed=detailed)
+                self.assertTrue(parts['whole'])
+                streamed, output, parts = self.publish(
+                    output_encoding=encoding, detailed=detailed,
+                    stream_output=True)
+                self.assertEqual(streamed, expected)
+                self.assertIsNone(output)
+                self.assertIsNone(parts['whole'])
+
+    def test_string_output(self):
+        # stream_output is ignored when writing to a string
+        output = publish_string('test', writer_name='pseudoxml',
+                                settings_overrides={'_disable_config': True,
+                                                    'stream_output': True},
+                                auto_encode=False)
+        self.assertEqual(output, '<document source="<string>">\n'
+                                 '    <paragraph>\n'
+                                 '        test\n')
+
+
 totest = {}
 totest_detailed = {}
 
@@ -21,7 +21,12 @@
 except Exception:
     pass
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr
 from fnmatch import fnmatch
+from io import StringIO
+import json
 import os
 import os.path
 import sys
@@ -91,9 +96,21 @@ class SettingsSpec(docutils.SettingsSpec):
           {'action': 'store_true', 'validator': frontend.validate_boolean}),
          ('Do not process files, show files that would be processed.',
           ['--dry-run'],
-          {'action': 'store_true', 'validator': frontend.validate_boolean}),))
+          {'action': 'store_true', 'validator': frontend.validate_boolean}),
+         ('Process up to <N> files in parallel ("0": one process per CPU). '
+          'Default: 1.',
+          ['--jobs', '-j'],
+          {'metavar': '<N>', 'default': 1,
+           'validator': frontend.validate_nonnegative_int}),
+         ('Process only files whose output is out of date.',
+          ['--incremental'],
+          {'action': 'store_true', 'validator': frontend.validate_boolean}),
+         ('Record dependencies for "--incremental" in <file>. '
+          'Default: ".buildhtml.json" in the first <directory>.',
+          ['--manifest'],
+          {'metavar': '<file>'}),))
 
-    relative_path_settings = ('prune',)
+    relative_path_settings = ('prune', 'manifest')
     config_section = 'buildhtml application'
     config_section_dependencies = ('applications',)
 
@@ -149,6 +166,19 @@ def __init__(self):
         # default html writer (may change to html5 some time):
         self.publishers['html'] = self.publishers['html4']
 
+        self.exit_status = 0
+        """Highest exit status of the processed files."""
+
+        self.executor = None
+        """Pool of worker processes (parallel mode)."""
+
+        self.queue = deque()
+        """Pending output in parallel mode: messages and `Future` objects
+        (in the order of processing)."""
+
+        self.manifest = {}
+        """Dependencies of the processed files (absolute paths)."""
+
     def setup_publishers(self):
         """
         Manage configurations for individual publishers.
@@ -216,26 +246,131 @@ def run(self, directory=None, recurse=1):
             self.directories = self.settings_spec._directories
         else:
             self.directories = [os.getcwd()]
-        for directory in self.directories:
-            for root, dirs, files in os.walk(directory):
-                # os.walk by default this recurses down the tree,
-                # influence by modifying dirs.
-                if not recurse:
-                    del dirs[:]
-                self.visit(root, files, dirs)
+        if self.initial_settings.incremental:
+            self.load_manifest()
+        jobs = self.initial_settings.jobs
+        if jobs != 1 and not self.initial_settings.dry_run:
+            self.executor = ProcessPoolExecutor(jobs or None,
+                                                initializer=_init_worker)
+        try:
+            for directory in self.directories:
+                for root, dirs, files in os.walk(directory):
+                    # os.walk by default this recurses down the tree,
+                    # influence by modifying dirs.
+                    if not recurse:
+                        del dirs[:]
+                    self.visit(root, files, dirs)
+            self.flush(wait=True)
+        finally:
+            if self.executor:
+                for item in self.queue:
+                    if not isinstance(item, str):
+                        item.cancel()
+                self.executor.shutdown()
+                self.executor = None
+            if (self.initial_settings.incremental
+                and not self.initial_settings.dry_run):
+                self.save_manifest()
+        return self.exit_status
+
+    def manifest_path(self):
+        return (self.initial_settings.manifest
+                or os.path.join(self.directories[0], '.buildhtml.json'))
+
+    def manifest_key(self):
+        """Return a string identifying the Docutils version and the
+        command line options that affect the output."""
+        options = {k: v for k, v in self.settings_spec.__dict__.items()
+                   if not k.startswith('_')
+                   and k not in ('dry_run', 'incremental', 'jobs', 'manifest',
+                                 'record_dependencies', 'silent')}
+        return '%s %r' % (docutils.__version__, sorted(options.items()))
+
+    def load_manifest(self):
+        """Read the dependencies recorded by a previous run."""
+        try:
+            with open(self.manifest_path(), encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('key') == self.manifest_key():
+            self.manifest = data.get('dependencies', {})
+
+    def save_manifest(self):
+        data = {'key': self.manifest_key(), 'dependencies': self.manifest}
+        try:
+            with open(self.manifest_path(), 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=0, sort_keys=True)
+        except OSError as err:
+            errout = docutils.io.ErrorOutput(
+                         encoding=self.initial_settings.error_encoding)
+            errout.write(f'Cannot save manifest: {err}\n')
+
+    def up_to_date(self, publisher, settings, directory):
+        """Return True if the output file is newer than the source file,
+        its recorded dependencies, and the applicable config files."""
+        source = os.path.abspath(settings._source)
+        if source not in self.manifest:
+            return False
+        paths = [source, *self.manifest[source]]
+        if not settings._disable_config:
+            paths += [path for path in (self.publishers[publisher]
+                                        .option_parser
+                                        .get_standard_config_files()
+                                        + [os.path.join(directory,
+                                                        'docutils.conf')])
+                      if os.path.exists(path)]
+        try:
+            target_mtime = os.stat(settings._destination).st_mtime_ns
+            return all(os.stat(path).st_mtime_ns <= target_mtime
+                       for path in paths)
+        except OSError:  # missing output or dependency
+            return False
+
+    def report(self, message, settings):
+        """Write `message` to stderr (in parallel mode: append to the queue).
+        """
+        if self.executor:
+            self.queue.append(message)
+            return
+        errout = docutils.io.ErrorOutput(encoding=settings.error_encoding)
+        errout.write(message)
+        sys.stderr.flush()
+
+    def flush(self, wait=False):
+        """Write the output of finished jobs in the order of processing.
+
+        Wait for all pending jobs if `wait` is true.
+        Raise `SystemExit` if a job was terminated by `SystemExit`.
+        """
+        errout = docutils.io.ErrorOutput(
+                     encoding=self.initial_settings.error_encoding)
+        while self.queue:
+            item = self.queue[0]
+            if isinstance(item, str):
+                output, status, exit_code = item, 0, None
+            elif wait or item.done():
+                output, status, exit_code, manifest = item.result()
+                self.manifest.update(manifest)
+            else:
+                break
+            self.queue.popleft()
+            errout.write(output)
+            sys.stderr.flush()
+            self.exit_status = max(self.exit_status, status)
+            if exit_code is not None:
+                sys.exit(exit_code)
 
     def visit(self, directory, names, subdirectories):
         settings = self.get_settings('', directory)
-        errout = docutils.io.ErrorOutput(encoding=settings.error_encoding)
         if settings.prune and (os.path.abspath(directory) in settings.prune):
-            errout.write('/// ...Skipping directory (pruned): %s\n' %
-                         directory)
-            sys.stderr.flush()
+            self.report('/// ...Skipping directory (pruned): %s\n'
+                        % directory, settings)
             del subdirectories[:]
             return
         if not self.initial_settings.silent:
-            errout.write('/// Processing directory: %s\n' % directory)
-            sys.stderr.flush()
+            self.report('/// Processing directory: %s\n' % directory,
+                        settings)
         # settings.ignore grows many duplicate entries as we recurse
         # if we add patterns in config files or on the command line.
         for pattern in utils.uniq(settings.ignore):
@@ -257,10 +392,22 @@ def process_txt(self, directory, name):
         pub_struct = self.publishers[publisher]
         settings._source = os.path.normpath(os.path.join(directory, name))
         settings._destination = settings._source[:-4] + '.html'
+        if (self.initial_settings.incremental
+            and self.up_to_date(publisher, settings, directory)):
+            return
+        if self.executor:
+            self.queue.append(self.executor.submit(_process_txt,
+                                                   directory, name))
+            self.flush()
+            return
         if not self.initial_settings.silent:
             errout.write('    ::: Processing: %s\n' % name)
             sys.stderr.flush()
         if not settings.dry_run:
+            source = os.path.abspath(settings._source)
+            self.manifest.pop(source, None)
+            record_dependencies = settings.record_dependencies
+            settings.record_dependencies = utils.DependencyList()
             try:
                 core.publish_file(source_path=settings._source,
                                   destination_path=settings._destination,
@@ -270,7 +417,45 @@ def process_txt(self, directory, name):
                                   settings=settings)
             except ApplicationError as err:
                 errout.write(f'        {type(err).__name__}: {err}\n')
+                self.exit_status = 1
+            else:
+                self.manifest[source] = [
+                    os.path.abspath(path)
+                    for path in settings.record_dependencies.list]
+            finally:
+                dependencies = settings.record_dependencies.list
+                settings.record_dependencies = record_dependencies
+                if record_dependencies is not None:
+                    record_dependencies.add(*dependencies)
+
+
+_worker_builder = None
+"""`Builder` instance of a worker process (parallel mode)."""
+
+
+def _init_worker():
+    global _worker_builder
+    _worker_builder = Builder()
+
+
+def _process_txt(directory, name):
+    """Process a file in a worker process.
+
+    Return the stderr output, the exit status, the exit code
+    (or None) if processing was terminated by `SystemExit`,
+    and the new manifest entries.
+    """
+    stderr = StringIO()
+    exit_code = None
+    _worker_builder.manifest = {}
+    with redirect_stderr(stderr):
+        try:
+            _worker_builder.process_txt(directory, name)
+        except SystemExit as err:
+            exit_code = err.code
+    return (stderr.getvalue(), _worker_builder.exit_status, exit_code,
+            _worker_builder.manifest)
 
 
 if __name__ == "__main__":
-    Builder().run()
+    sys.exit(Builder().run())
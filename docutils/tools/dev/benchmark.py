@@ -0,0 +1,766 @@
+#!/usr/bin/env python3
+
+# $Id$
+# Copyright: This script has been placed in the public domain.
+
+"""
+Benchmark the Docutils processing pipeline.
+
+For every writer, process a corpus of reStructuredText documents and
+measure the time spent in the three phases of `core.Publisher.publish()`:
+
+:parse:     read and decode the source, parse it into a document tree,
+:transform: apply the transforms,
+:write:     translate the document tree and encode the output.
+
+Report the fastest of ``--repeat`` runs, the throughput in source lines
+per second, the peak memory allocated while processing one document,
+and the memory used by its document tree after the transforms
+(measured with `tracemalloc` in a separate run).
+
+Results can be saved as a JSON baseline and compared to a previous
+baseline::
+
+    benchmark.py --save baseline.json
+    ... (modify Docutils)
+    benchmark.py --compare baseline.json
+
+The exit status is 1 if a value exceeds the baseline by more than
+``--threshold`` percent.
+
+Use ``--profile`` to print the functions that consume most time.
+
+Use ``--doctree-formats`` to compare the size and the store/load times
+of the serialized document trees (pickle, binary doctree, and XML).
+
+Use ``--read`` to time reading and decoding a large input file
+(the corpus repeated to at least 16 MiB).
+
+Use ``--latex-encode`` to time the escaping of text for LaTeX output
+(`LaTeXTranslator.encode()`) with the text of the corpus.
+
+Use ``--grid-tables`` to time the grid table parser with generated
+tables of growing size (the corpus is not used).  The time per cell
+should stay about constant.
+
+Use ``--csv-tables`` to time parsing generated "csv-table" directives
+with 8 columns and a growing number of rows (the corpus is not used).
+"""
+
+import argparse
+import cProfile
+import glob
+import json
+import os.path
+import pickle
+import platform
+import pstats
+import sys
+import tempfile
+import time
+import tracemalloc
+from xml.etree import ElementTree
+
+if __name__ == '__main__':
+    # prepend the "docutils root" to the Python library path
+    # so we import the local `docutils` package.
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                    '..', '..')))
+
+import docutils
+from docutils import core, io, nodes, statemachine
+from docutils.parsers.rst import tableparser
+from docutils.utils import binary_doctree
+
+DOCUTILS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                             '..', '..'))
+
+writers = ('html4', 'html5', 'latex2e', 'xetex', 'manpage', 'odt', 'xml',
+           'pseudoxml')
+"""Writers benchmarked by default."""
+
+phases = ('parse', 'transform', 'write')
+
+settings_overrides = {'_disable_config': True,
+                      'report_level': 5,
+                      'halt_level': 5,
+                      'warning_stream': io.NullOutput(),
+                      'traceback': True,
+                      'output_encoding': 'utf-8',
+                      }
+"""Settings for all benchmark runs."""
+
+
+# Corpus
+# ======
+
+def synthetic_document(sections=200):
+    """Return a reStructuredText document using common markup.
+
+    The size scales linearly with `sections`.
+    """
+    parts = ['=====================\n'
+             ' Synthetic Benchmark\n'
+             '=====================\n'
+             '\n'
+             ':Author: Docutils\n'
+             ':Version: 1.0\n'
+             '\n'
+             '.. contents::\n'
+             '\n'
+             '.. |sub| replace:: *substituted text*\n']
+    for i in range(sections):
+        parts.append(f"""
+Section {i}
+===========
+
+Paragraph with *emphasis*, **strong emphasis**, ``inline literals``,
+`interpreted text`, a |sub|, a footnote reference [#note{i}]_, a
+citation [CIT{i}]_, an `internal reference {i}`_, a link to
+`Section {i}`_ and https://docutils.sourceforge.io/ (standalone URI).
+
+.. _internal reference {i}:
+
+* Bullet list item with a ``literal``.
+* Second item
+
+  1. nested enumerated list
+  2. with *two* items
+
+term {i}
+  Definition list item.
+
+:field name: field body
+:other field: another field body
+
+::
+
+    literal block {i}
+    with two lines
+
++-----------+------------+
+| Grid      | Table      |
++===========+============+
+| cell {i:<4} | **strong** |
++-----------+------------+
+
+=====  =====
+Simple table
+------------
+A      B
+=====  =====
+{i:<5}  text
+=====  =====
+
+.. note:: An admonition with a paragraph.
+
+.. [#note{i}] Auto-numbered footnote {i}.
+.. [CIT{i}] Citation {i}.
+""")
+    return ''.join(parts)
+
+
+def targets_document(targets=10000):
+    """Return a glossary-like document with many internal targets.
+
+    All targets are siblings in one section: processing time should
+    scale linearly with `targets`.
+    """
+    parts = ['Glossary\n========\n']
+    for i in range(targets):
+        parts.append(f'\n.. _label{i}:\n\nterm {i}\n  Definition {i}.\n')
+    return ''.join(parts)
+
+
+def comment_document():
+    """Return a short reStructuredText document (about 1 KB).
+
+    Typical input of applications rendering many small documents
+    (comments, docstrings, ...).
+    """
+    return """\
+Thanks for the patch!  I tried it with the *current* development
+version and it works as advertised.  Two remarks:
+
+* The new option should be documented in ``docs/user/config.txt``.
+* Please add a test case, see `the test guide`_ for details.
+
+There is also a minor problem with the error message: it says
+"file not found" even if the file exists but cannot be read.  Maybe
+something like this would be clearer::
+
+    raise OSError(f'cannot read {path}')
+
+Otherwise, **looks good** to me.  See also https://example.org/issue/42
+for a related discussion.
+
+1. first item
+2. second item with a footnote reference [#]_
+
+.. [#] The footnote.
+
+.. _the test guide: https://docutils.sourceforge.io/docs/dev/testing.html
+"""
+
+
+def in_repo_documents(patterns):
+    """Return a list of (source path, text) for files matching `patterns`.
+
+    Patterns are relative to the Docutils root directory.
+    """
+    documents = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(os.path.join(DOCUTILS_ROOT, pattern),
+                                     recursive=True)):
+            with open(path, encoding='utf-8') as f:
+                documents.append((path, f.read()))
+    return documents
+
+
+corpora = {
+    'synthetic': lambda: [('<synthetic>', synthetic_document())],
+    'targets': lambda: [('<targets>', targets_document())],
+    'large': lambda: [('<large>', synthetic_document(2000))],
+    'comments': lambda: [(f'<comment {i}>', comment_document())
+                         for i in range(100)],
+    'docs': lambda: in_repo_documents(['docs/**/*.txt']),
+    'history': lambda: in_repo_documents(['HISTORY.txt']),
+    'functional': lambda: in_repo_documents(['test/functional/input/*.txt']),
+    }
+"""Document collections: functions returning lists of (path, text)."""
+
+default_corpora = ('synthetic', 'comments', 'docs', 'history', 'functional')
+"""Collections used without --corpus option (not the slow 'targets'
+and 'large')."""
+
+
+# Benchmark
+# =========
+
+def make_publisher(source_path, text, writer_name):
+    publisher = core.Publisher(source_class=io.StringInput,
+                               destination_class=io.StringOutput)
+    publisher.set_components('standalone', 'restructuredtext', writer_name)
+    publisher.process_programmatic_settings(None, settings_overrides, None)
+    publisher.set_source(text, source_path)
+    publisher.set_destination()
+    return publisher
+
+
+def process(source_path, text, writer_name):
+    """Publish `text` with `writer_name`.
+
+    Return the time spent in the processing phases.
+    """
+    publisher = make_publisher(source_path, text, writer_name)
+    times = {}
+    start = time.perf_counter()
+    publisher.document = publisher.read()
+    times['parse'] = time.perf_counter() - start
+    start = time.perf_counter()
+    publisher.apply_transforms()
+    times['transform'] = time.perf_counter() - start
+    start = time.perf_counter()
+    publisher.writer.write(publisher.document, publisher.destination)
+    publisher.writer.assemble_parts()
+    times['write'] = time.perf_counter() - start
+    return times
+
+
+def memory_use(source_path, text, writer_name):
+    """Return the memory used while publishing `text`.
+
+    Return a tuple: peak memory allocated during the whole processing
+    and memory allocated after the transforms (the document tree).
+    """
+    tracemalloc.start()
+    try:
+        publisher = make_publisher(source_path, text, writer_name)
+        start = tracemalloc.get_traced_memory()[0]
+        publisher.document = publisher.read()
+        publisher.apply_transforms()
+        doctree = tracemalloc.get_traced_memory()[0] - start
+        publisher.writer.write(publisher.document, publisher.destination)
+        publisher.writer.assemble_parts()
+        return tracemalloc.get_traced_memory()[1], doctree
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(documents, writer_name, repeat=3, memory=True):
+    """Return benchmark results for processing `documents`."""
+    best = dict.fromkeys(phases, float('inf'))
+    failed = set()
+    for i in range(repeat):
+        totals = dict.fromkeys(phases, 0.0)
+        for source_path, text in documents:
+            if source_path in failed:
+                continue
+            try:
+                times = process(source_path, text, writer_name)
+            except Exception as error:
+                print(f'{writer_name}: skipping {source_path} '
+                      f'({type(error).__name__}: {error})', file=sys.stderr)
+                failed.add(source_path)
+                continue
+            for phase in phases:
+                totals[phase] += times[phase]
+        for phase in phases:
+            best[phase] = min(best[phase], totals[phase])
+    result = dict(best)
+    result['total'] = sum(best.values())
+    lines = sum(text.count('\n') + 1 for source_path, text in documents
+                if source_path not in failed)
+    result['lines'] = lines
+    result['lines_per_second'] = lines / result['total'] if lines else 0
+    if memory:
+        usage = [memory_use(source_path, text, writer_name)
+                 for source_path, text in documents
+                 if source_path not in failed]
+        result['peak_memory'] = max((peak for peak, _ in usage), default=0)
+        result['doctree_memory'] = max((tree for _, tree in usage),
+                                       default=0)
+    return result
+
+
+def benchmark_renderer(documents, writer_name, repeat=3):
+    """Compare `core.publish_parts()` with a re-used `core.Renderer`.
+
+    Return the best time for processing `documents` with both methods.
+    """
+    overrides = {key: value for key, value in settings_overrides.items()
+                 if key != 'output_encoding'}
+    renderer = core.Renderer(writer_name=writer_name,
+                             settings_overrides=overrides)
+
+    def publish_parts(source_path, text):
+        core.publish_parts(text, source_path, writer_name=writer_name,
+                           settings_overrides=overrides)
+
+    def renderer_parts(source_path, text):
+        renderer.publish_parts(text, source_path)
+
+    result = {}
+    for name, function in (('publish_parts', publish_parts),
+                           ('renderer', renderer_parts)):
+        best = float('inf')
+        for i in range(repeat):
+            start = time.perf_counter()
+            for source_path, text in documents:
+                function(source_path, text)
+            best = min(best, time.perf_counter() - start)
+        result[name] = best
+    result['speedup'] = result['publish_parts'] / result['renderer']
+    return result
+
+
+def print_renderer_results(results, documents):
+    header = (f'{"writer":10} {"publish_parts":>13} {"renderer":>9} '
+              f'{"docs/s":>8} {"speedup":>8}')
+    print(header)
+    print('-' * len(header))
+    for writer_name, result in results.items():
+        print(f'{writer_name:10} {result["publish_parts"]:13.3f} '
+              f'{result["renderer"]:9.3f} '
+              f'{len(documents) / result["renderer"]:8.0f} '
+              f'{result["speedup"]:7.1f}x')
+
+
+def benchmark_doctree_formats(documents, repeat=3):
+    """Compare serialization formats for the transformed document trees.
+
+    Return size and best store and load time for `documents` per format.
+    There is no XML reader for document trees: the "load" time for XML
+    only covers parsing with `xml.etree.ElementTree` and is a lower bound.
+    """
+    doctrees = []
+    for source_path, text in documents:
+        publisher = make_publisher(source_path, text, 'null')
+        publisher.document = publisher.read()
+        publisher.apply_transforms()
+        doctrees.append(publisher.document)
+
+    def dump_xml(doctree):
+        return core.publish_from_doctree(
+            doctree, writer_name='xml',
+            settings_overrides=settings_overrides)
+
+    formats = {'pickle': (pickle.dumps, pickle.loads),
+               'binary': (binary_doctree.dumps, binary_doctree.loads),
+               'xml': (dump_xml, ElementTree.fromstring),
+               }
+    results = {}
+    for name, (dump, load) in formats.items():
+        result = results[name] = {'store': float('inf'),
+                                  'load': float('inf')}
+        for i in range(repeat):
+            start = time.perf_counter()
+            data = [dump(doctree) for doctree in doctrees]
+            result['store'] = min(result['store'],
+                                  time.perf_counter() - start)
+            start = time.perf_counter()
+            for item in data:
+                load(item)
+            result['load'] = min(result['load'], time.perf_counter() - start)
+        result['size'] = sum(len(item) for item in data)
+    return results
+
+
+def print_doctree_format_results(results):
+    header = f'{"format":10} {"store":>8} {"load":>8} {"size":>10}'
+    print(header)
+    print('-' * len(header))
+    for name, result in results.items():
+        print(f'{name:10} {result["store"]:8.3f} {result["load"]:8.3f} '
+              f'{result["size"]/1024:8.0f}kB')
+
+
+def benchmark_read(documents, repeat=3, size=2**24):
+    """Time reading a file of at least `size` bytes with `io.FileInput`.
+
+    Return the best time and the peak memory allocated (`tracemalloc`,
+    does not include the mapped file) for reading UTF-8 and UTF-8 with
+    a BOM, with and without mapping the file into memory.
+    """
+    text = '\n'.join(text for source_path, text in documents)
+    text *= size // len(text.encode('utf-8')) + 1
+    results = {}
+    default_threshold = io.FileInput.mmap_threshold
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for encoding in ('utf-8', 'utf-8-sig'):
+            path = os.path.join(tmpdir, encoding + '.txt')
+            with open(path, 'w', encoding=encoding, newline='') as f:
+                f.write(text)
+            for name, threshold in (('read', None),
+                                    ('mmap', default_threshold)):
+                io.FileInput.mmap_threshold = threshold
+                try:
+                    result = results[f'{encoding} {name}'] = {
+                        'time': float('inf')}
+                    for i in range(repeat):
+                        start = time.perf_counter()
+                        io.FileInput(source_path=path).read()
+                        result['time'] = min(result['time'],
+                                             time.perf_counter() - start)
+                    tracemalloc.start()
+                    io.FileInput(source_path=path).read()
+                    result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                finally:
+                    io.FileInput.mmap_threshold = default_threshold
+    return results
+
+
+def print_read_results(results):
+    header = f'{"input":16} {"time":>8} {"peak MiB":>9}'
+    print(header)
+    print('-' * len(header))
+    for name, result in results.items():
+        print(f'{name:16} {result["time"]:8.3f} '
+              f'{result["peak_memory"] / 2**20:9.1f}')
+
+
+def benchmark_latex_encode(documents, repeat=3):
+    """Time `LaTeXTranslator.encode()` with the text nodes of `documents`.
+
+    Return the best time for encoding all text as normal text, inline
+    literal, and (alltt and tt) literal blocks per LaTeX writer.
+    """
+    modes = {'text': {},
+             'literal': {'literal': True},
+             'alltt block': {'alltt': True},
+             'tt block': {'literal': True, 'insert_newline': True,
+                          'insert_non_breaking_blanks': True},
+             }
+    results = {}
+    for writer_name in ('latex2e', 'xetex'):
+        texts = []
+        for source_path, text in documents:
+            publisher = make_publisher(source_path, text, writer_name)
+            publisher.document = publisher.read()
+            publisher.apply_transforms()
+            texts += [str(node)
+                      for node in publisher.document.findall(nodes.Text)]
+        translator = publisher.writer.translator_class(publisher.document)
+        for mode, flags in modes.items():
+            vars(translator).update(flags)
+            best = float('inf')
+            for i in range(repeat):
+                start = time.perf_counter()
+                for text in texts:
+                    translator.encode(text)
+                best = min(best, time.perf_counter() - start)
+            results[f'{writer_name} {mode}'] = {
+                'time': best, 'characters': sum(map(len, texts))}
+            for flag in flags:
+                delattr(translator, flag)  # restore the class default
+    return results
+
+
+def print_latex_encode_results(results):
+    header = f'{"writer/mode":20} {"time":>8} {"Mchar/s":>8}'
+    print(header)
+    print('-' * len(header))
+    for name, result in results.items():
+        print(f'{name:20} {result["time"]:8.3f} '
+              f'{result["characters"] / result["time"] / 1e6:8.1f}')
+
+
+def grid_table(rows, columns, width=8):
+    """Return the lines of a grid table with `rows` x `columns` cells.
+
+    Every fifth row has a cell spanning two columns, every seventh row
+    a cell spanning two rows.
+    """
+    border = '+' + '+'.join(['-' * width] * columns) + '+'
+    lines = [border]
+    for row in range(rows):
+        cells = [f' {row}.{column}'.ljust(width) for column in range(columns)]
+        if row % 5 == 1 and columns > 1:
+            cells[:2] = [' spanning'.ljust(2 * width + 1)]
+        lines.append('|' + '|'.join(cells) + '|')
+        if row % 7 == 2 and columns > 1 and row + 1 < rows:
+            # the last column spans this and the next row
+            lines.append(border[:-width - 1] + ' ' * width + '|')
+        else:
+            lines.append(border)
+    return lines
+
+
+def benchmark_grid_tables(sizes=((100, 5), (1000, 5), (4000, 5),
+                                 (100, 40), (1000, 40), (4000, 40)),
+                          repeat=3):
+    """Time `tableparser.GridTableParser.parse()` with generated tables.
+
+    `sizes` is a sequence of (rows, columns) tuples.
+    Return the best time per table size.
+    """
+    results = {}
+    for rows, columns in sizes:
+        block = statemachine.StringList(grid_table(rows, columns))
+        best = float('inf')
+        for i in range(repeat):
+            start = time.perf_counter()
+            tableparser.GridTableParser().parse(block)
+            best = min(best, time.perf_counter() - start)
+        results[f'{rows}x{columns}'] = {'time': best,
+                                        'cells': rows * columns}
+    return results
+
+
+def print_table_results(results):
+    header = f'{"rows x cols":12} {"time":>8} {"µs/cell":>8}'
+    print(header)
+    print('-' * len(header))
+    for name, result in results.items():
+        print(f'{name:12} {result["time"]:8.3f} '
+              f'{result["time"] / result["cells"] * 1e6:8.1f}')
+
+
+def csv_table_document(rows, columns=8):
+    """Return a document with a "csv-table" of `rows` x `columns` cells.
+
+    The cells contain numbers, identifiers, words, and some inline markup.
+    """
+    values = ('{row}', '{row}.{column}', 'item_{row}_{column}',
+              'a few words', '*emphasis* {row}', '"quoted, text"',
+              '``literal``', '')
+    lines = ['.. csv-table:: Generated table',
+             '   :header-rows: 1', '']
+    for row in range(rows):
+        cells = (values[(row + column) % len(values)]
+                 for column in range(columns))
+        lines.append('   ' + ','.join(value.format(row=row, column=column)
+                                      for column, value in enumerate(cells)))
+    return '\n'.join(lines) + '\n'
+
+
+def benchmark_csv_tables(sizes=(1000, 10000), repeat=3):
+    """Time parsing a "csv-table" with 8 columns and `sizes` rows.
+
+    Return the best time per table size.
+    """
+    results = {}
+    for rows in sizes:
+        text = csv_table_document(rows)
+        best = float('inf')
+        for i in range(repeat):
+            publisher = make_publisher('<csv-table>', text, 'null')
+            start = time.perf_counter()
+            publisher.read()
+            best = min(best, time.perf_counter() - start)
+        results[f'{rows}x8'] = {'time': best, 'cells': rows * 8}
+    return results
+
+
+def compare(results, baseline, threshold=10):
+    """Compare `results` to `baseline`.
+
+    Return a list of regressions (values exceeding the baseline by more
+    than `threshold` percent).
+    """
+    regressions = []
+    for writer_name, result in results.items():
+        old = baseline.get(writer_name)
+        if not old:
+            continue
+        for key in (*phases, 'total', 'peak_memory', 'doctree_memory'):
+            if not old.get(key) or key not in result:
+                continue
+            change = (result[key] / old[key] - 1) * 100
+            if change > threshold:
+                regressions.append(f'{writer_name} {key}: '
+                                   f'{old[key]:.4g} -> {result[key]:.4g} '
+                                   f'({change:+.0f}%)')
+    return regressions
+
+
+def print_results(results, baseline=None):
+    header = (f'{"writer":10} {"parse":>8} {"transform":>9} {"write":>8} '
+              f'{"total":>8} {"lines/s":>8} {"peak MiB":>8} '
+              f'{"tree MiB":>8}')
+    print(header)
+    print('-' * len(header))
+    for writer_name, result in results.items():
+        line = (f'{writer_name:10} {result["parse"]:8.3f} '
+                f'{result["transform"]:9.3f} {result["write"]:8.3f} '
+                f'{result["total"]:8.3f} {result["lines_per_second"]:8.0f}')
+        if 'peak_memory' in result:
+            line += f' {result["peak_memory"] / 2**20:8.1f}'
+        if 'doctree_memory' in result:
+            line += f' {result["doctree_memory"] / 2**20:8.1f}'
+        old = (baseline or {}).get(writer_name)
+        if old and old.get('total'):
+            line += f'  ({(result["total"] / old["total"] - 1) * 100:+.0f}%)'
+        print(line)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark Docutils: time the parse, transform, and '
+        'write phases for every writer.')
+    parser.add_argument('--writer', '-w', action='append', choices=writers,
+                        dest='writers', metavar='<writer>',
+                        help='Writer to benchmark (may be used more than '
+                        'once).  Default: %s.' % ', '.join(writers))
+    parser.add_argument('--corpus', '-c', action='append', dest='corpora',
+                        metavar='<corpus>',
+                        help='Document collection (%s) or path of a '
+                        'reStructuredText file (may be used more than once). '
+                        'Default: %s.' % (', '.join(corpora),
+                                          ', '.join(default_corpora)))
+    parser.add_argument('--repeat', '-r', type=int, default=3,
+                        metavar='<n>',
+                        help='Number of timing runs.  Default: 3.')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='Do not measure the peak memory use.')
+    parser.add_argument('--save', metavar='<file>',
+                        help='Save results as JSON baseline in <file>.')
+    parser.add_argument('--compare', metavar='<file>',
+                        help='Compare results to the JSON baseline <file>.')
+    parser.add_argument('--threshold', type=float, default=10,
+                        metavar='<percent>',
+                        help='Report regressions exceeding the baseline by '
+                        'more than <percent>.  Default: 10.')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print the functions consuming most time.')
+    parser.add_argument('--renderer', action='store_true',
+                        help='Compare the throughput of publish_parts() '
+                        'and a re-used core.Renderer (use with small '
+                        'documents, e.g. "--corpus comments").')
+    parser.add_argument('--read', action='store_true',
+                        help='Time reading and decoding a large input file '
+                        '(the corpus repeated to at least 16 MiB).')
+    parser.add_argument('--latex-encode', action='store_true',
+                        help='Time the escaping of the corpus text for '
+                        'LaTeX output.')
+    parser.add_argument('--grid-tables', action='store_true',
+                        help='Time the grid table parser with generated '
+                        'tables of growing size.')
+    parser.add_argument('--csv-tables', action='store_true',
+                        help='Time parsing generated "csv-table" '
+                        'directives of growing size.')
+    parser.add_argument('--doctree-formats', action='store_true',
+                        help='Compare the size and the store/load time of '
+                        'pickled, binary, and XML document trees.')
+    args = parser.parse_args(args)
+
+    # modes with generated input
+    if args.grid_tables:
+        print_table_results(benchmark_grid_tables(repeat=args.repeat))
+        return 0
+
+    if args.csv_tables:
+        print_table_results(benchmark_csv_tables(repeat=args.repeat))
+        return 0
+
+    documents = []
+    for name in args.corpora or default_corpora:
+        if name in corpora:
+            documents += corpora[name]()
+        else:
+            documents += in_repo_documents([os.path.abspath(name)])
+    if not documents:
+        parser.error('empty corpus')
+    print(f'Docutils {docutils.__version__}, '
+          f'Python {platform.python_version()}: '
+          f'{len(documents)} documents, '
+          f'{sum(text.count(chr(10)) + 1 for _, text in documents)} lines')
+
+    if args.read:
+        print_read_results(benchmark_read(documents, args.repeat))
+        return 0
+
+    if args.latex_encode:
+        print_latex_encode_results(
+            benchmark_latex_encode(documents, args.repeat))
+        return 0
+
+    if args.doctree_formats:
+        print_doctree_format_results(
+            benchmark_doctree_formats(documents, args.repeat))
+        return 0
+
+    if args.renderer:
+        results = {writer_name: benchmark_renderer(documents, writer_name,
+                                                   args.repeat)
+                   for writer_name in args.writers or writers}
+        print_renderer_results(results, documents)
+        return 0
+
+    profiler = cProfile.Profile() if args.profile else None
+    results = {}
+    for writer_name in args.writers or writers:
+        if profiler:
+            profiler.enable()
+        results[writer_name] = benchmark(documents, writer_name, args.repeat,
+                                         args.memory and not profiler)
+        if profiler:
+            profiler.disable()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline)
+    if profiler:
+        print()
+        pstats.Stats(profiler).strip_dirs().sort_stats('tottime'
+                                                       ).print_stats(30)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'docutils': docutils.__version__,
+                       'python': platform.python_version(),
+                       'documents': [path for path, _ in documents],
+                       'results': results}, f, indent=2)
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('\nRegressions:')
+            print('\n'.join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -20,13 +20,20 @@
                         (separated by colons).  Default: ".svn:CVS"
 --silent                Work silently (no progress messages).  Independent of
                         "--quiet".
+--jobs=<N>, -j <N>      Process up to <N> files in parallel ("0": one process
+                        per CPU). Default: 1.
+--incremental           Process only files whose output is out of date.
+--manifest=<file>       Record dependencies for "--incremental" in <file>.
+                        Default: ".buildhtml.json" in the first <directory>.
 """
 
 import unittest
 import os
+import shutil
 from subprocess import Popen, PIPE, STDOUT
 import sys
 import tempfile
+import time
 
 
 buildhtml_path = os.path.abspath(os.path.join(
@@ -86,13 +93,7 @@ def setUp(self):
                 fd_s.close()
 
     def tearDown(self):
-        for i in range(len(self.tree) - 1, -1, -1):
-            s = os.path.join(self.root, self.tree[i])
-            if "." not in s:
-                os.rmdir(s)
-            else:
-                os.remove(s)
-        os.rmdir(self.root)
+        shutil.rmtree(self.root)
 
     def test_1(self):
         opts = ["--dry-run", self.root]
@@ -105,6 +106,46 @@ def test_local(self):
         self.assertEqual(len(dirs), 1)
         self.assertEqual(files, [])
 
+    def test_jobs(self):
+        # parallel processing reports files in the order of processing
+        dirs, files = process_and_return_filelist(["--dry-run", self.root])
+        self.assertEqual(process_and_return_filelist(["--jobs", "2",
+                                                      self.root]),
+                         (dirs, files))
+        for root, _dirs, names in os.walk(self.root):
+            for name in names:
+                if name.endswith('.txt'):
+                    self.assertTrue(os.path.exists(
+                        os.path.join(root, name[:-4] + '.html')))
+
+    def set_mtimes(self, mtime):
+        for root, _dirs, names in os.walk(self.root):
+            for name in names:
+                os.utime(os.path.join(root, name), (mtime, mtime))
+
+    def test_incremental(self):
+        opts = ["--incremental", self.root]
+        dirs, files = process_and_return_filelist(opts)
+        self.assertEqual(len(files), 8)
+        # no-op rebuild
+        dirs, files = process_and_return_filelist(opts)
+        self.assertEqual(files, [])
+        # changed source
+        now = time.time()
+        self.set_mtimes(now - 100)
+        source = os.path.join(self.root, "_tmp_test_tree/dir1/two.txt")
+        os.utime(source, (now - 50, now - 50))
+        dirs, files = process_and_return_filelist(opts)
+        self.assertEqual(files, ["two.txt"])
+        # changed config file
+        self.set_mtimes(now - 100)
+        config = os.path.join(self.root, "_tmp_test_tree/dir2/docutils.conf")
+        with open(config, "w", encoding='utf-8') as f:
+            f.write("[general]\n")
+        os.utime(config, (now - 50, now - 50))
+        dirs, files = process_and_return_filelist(opts)
+        self.assertEqual(sorted(files), ["one.txt", "two.txt"])
+
 
 if __name__ == '__main__':
     unittest.main()